@@ -28,11 +28,13 @@ import os.path
 import platform
 import sys
 import tkinter as tk
+import tkinter.filedialog
 import tkinter.font
 import tkinter.ttk as ttk
 
 import lbseed.variables as var
 import lbseed.pages as pages
+import lbseed.background as bg
 import lbseed.helper as hlp
 import lbseed.validate as val
 import lbseed.resolve as res
@@ -47,10 +49,12 @@ class Application(ttk.Frame,
                   pages.ListChClaimsPage, pages.SubscribedChsPage,
                   pages.ListPubChsPage, pages.ListPubClaimsPage,
                   pages.ControllingClaimsPage,
-                  pages.CommentsPage,
+                  pages.CommentsPage, pages.CommentSearchPage,
+                  pages.ChannelCommentsPage,
                   pages.ListClsPeersPage,
                   pages.ListChPeersPage, pages.ListChsPeersPage,
                   pages.ListSubsPeersPage, pages.SeedPage,
+                  pages.SeedPlanPage,
                   pages.DeleteClaimsPage, pages.DeleteChsPage,
                   pages.SupportListPage, pages.SupportUpdatePage,
                   pages.TrendPage, pages.SearchPage):
@@ -114,6 +118,15 @@ class Application(ttk.Frame,
         page_s_comments = ttk.Frame(self.note)
         self.note.add(page_s_comments, text="Comments")
 
+        note_sub_cmnt = ttk.Notebook(page_s_comments)
+        page_cmnt = ttk.Frame(note_sub_cmnt)
+        page_cmnt_search = ttk.Frame(note_sub_cmnt)
+        page_ch_cmnt = ttk.Frame(note_sub_cmnt)
+        note_sub_cmnt.add(page_cmnt, text="Claim comments")
+        note_sub_cmnt.add(page_cmnt_search, text="Search comments")
+        note_sub_cmnt.add(page_ch_cmnt, text="Channel comments")
+        note_sub_cmnt.pack(fill="both", expand=True)
+
         page_s_peers = ttk.Frame(self.note)
         self.note.add(page_s_peers, text="Peers")
 
@@ -123,11 +136,13 @@ class Application(ttk.Frame,
         page_chs_peers = ttk.Frame(self.note_sub_peers)
         page_subs_peers = ttk.Frame(self.note_sub_peers)
         page_seed_ratio = ttk.Frame(self.note_sub_peers)
+        page_seed_plan = ttk.Frame(self.note_sub_peers)
         self.note_sub_peers.add(page_cls_peers, text="Claim peers")
         self.note_sub_peers.add(page_ch_peers, text="Channel peers")
         self.note_sub_peers.add(page_chs_peers, text="Multiple channel peers")
         self.note_sub_peers.add(page_subs_peers, text="Subscription peers")
         self.note_sub_peers.add(page_seed_ratio, text="Seeding ratio")
+        self.note_sub_peers.add(page_seed_plan, text="Seed planner")
         self.note_sub_peers.pack(fill="both", expand=True)
         self.note_sub_peers.bind("<<NotebookTabChanged>>",
                                  self.update_peers_checkbox)
@@ -182,13 +197,16 @@ class Application(ttk.Frame,
 
         self.setup_page_list_down(page_list_down)
         self.setup_page_list_down_inv(page_list_down_inv)
+        self.list_d_claims_inv(cached=True)
         self.setup_page_ch_claims(page_ch_claims)
         self.setup_page_subscr_chs(page_subscr_chs)
         self.setup_page_pub_chs(page_pub_chs)
         self.setup_page_pub_claims(page_pub_claims)
         self.setup_page_controlling(page_ctr_claims)
 
-        self.setup_page_cmnt(page_s_comments)
+        self.setup_page_cmnt(page_cmnt)
+        self.setup_page_cmnt_search(page_cmnt_search)
+        self.setup_page_ch_cmnt(page_ch_cmnt)
 
         self.setup_page_cls_peers(page_cls_peers)
         self.setup_page_ch_peers(page_ch_peers)
@@ -196,6 +214,7 @@ class Application(ttk.Frame,
         self.setup_page_subs_peers(page_subs_peers)
         self.setup_page_seed(page_seed_ratio)
         self.setup_plot()
+        self.setup_page_seed_plan(page_seed_plan)
 
         self.setup_page_del(page_del)
         self.setup_page_delch(page_delch)
@@ -217,6 +236,73 @@ class Application(ttk.Frame,
         textbox.replace("1.0", tk.END, content)
         textbox["state"] = "disabled"
 
+    def task_error(self, textbox):
+        """Get a callback that writes the error of a task in the textbox."""
+        def error(err):
+            self.write_text(textbox, f"Error: {type(err).__name__}: {err}")
+            self.print_done(print_msg=True)
+
+        return error
+
+    def stream_text(self, textbox, rows, empty="No claims found",
+                    keep=None):
+        """Fill in the textbox with rows as they are produced.
+
+        The rows come from a generator that runs in a separate thread.
+        Each row has a 'line' and a 'summary'; the top of the textbox
+        always shows the latest summary, which may have several lines.
+        Rows whose 'line' is `None` only update the summary.
+        Starting a new stream in the same textbox cancels the previous one.
+        If `keep` is a dictionary, the 'info' of the rows is added
+        to its 'results', and 'done' is set when the stream finishes.
+        """
+        key = str(textbox)
+
+        if key in self.streams:
+            self.streams[key].cancel()
+
+        self.write_text(textbox, "(loading...)")
+        n_rows = [0]
+        n_head = [1]
+
+        def on_items(items):
+            textbox["state"] = "normal"
+
+            if n_rows[0] == 0:
+                textbox.delete("1.0", tk.END)
+                textbox.insert(tk.END, "\n" + 80 * "-")
+
+            lines = [item["line"] for item in items
+                     if item["line"] is not None]
+
+            if lines:
+                textbox.insert(tk.END, "\n" + "\n".join(lines))
+
+            summary = items[-1]["summary"]
+            textbox.replace("1.0", f"{n_head[0]}.end", summary)
+            n_head[0] = summary.count("\n") + 1
+            textbox["state"] = "disabled"
+
+            n_rows[0] += len(items)
+
+            if keep is not None:
+                keep["results"].extend(item["info"] for item in items
+                                       if item.get("info"))
+
+        def on_done():
+            if n_rows[0] == 0:
+                self.write_text(textbox, empty)
+
+            if keep is not None:
+                keep["done"] = True
+
+            self.print_done(print_msg=True)
+
+        self.streams[key] = bg.run_stream(self, rows,
+                                          on_items=on_items,
+                                          on_done=on_done)
+        return self.streams[key]
+
     def list_lbrynet_settings(self):
         """Get the settings of the current lbrynet daemon."""
         if not hlp.server_exists(server=self.server_var.get()):
@@ -453,9 +539,47 @@ class Application(ttk.Frame,
 
         self.print_done(print_msg=True)
 
-    def list_d_claims_inv(self):
-        """Print the invalid downloaded claims in the textbox."""
-        self.list_d_claims(invalid=True)
+    def list_d_claims_inv(self, cached=False):
+        """Print the invalid downloaded claims in the textbox.
+
+        The claims are searched online in a separate thread;
+        with `cached=True` the last result is shown instead.
+        """
+        if not cached and not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        options = {"blocks": self.check_lst_blks.get(),
+                   "cid": self.check_lst_cid.get(),
+                   "blobs": self.check_lst_blobs.get(),
+                   "size": self.check_lst_size.get(),
+                   "show_channel": self.check_lst_show_ch.get(),
+                   "show_out": self.rad_lst_name.get(),
+                   "channel": self.entry_chan.get(),
+                   "reverse": self.check_lst_reverse.get(),
+                   "threads": self.spin_lst_threads.get(),
+                   "hours": self.spin_lst_inv_hours.get(),
+                   "cached": cached,
+                   "server": self.server_var.get()}
+
+        def done(output):
+            if not output["lines"]:
+                output["lines"] = "No claims found"
+
+            content = output["summary"] + "\n"
+            content += 80 * "-" + "\n"
+            content += output["lines"]
+
+            self.write_text(self.textbox_list_d_inv, content)
+            self.print_done(print_msg=not cached)
+
+        if cached:
+            done(actions.i_list_d_invalid(**options))
+            return True
+
+        self.write_text(self.textbox_list_d_inv, "(searching claims...)")
+        bg.run_task(self, lambda: actions.i_list_d_invalid(**options),
+                    on_done=done,
+                    on_error=self.task_error(self.textbox_list_d_inv))
 
     def resolve_sg_ch(self, print_msg=True):
         """Resolve the channel to make sure it exists."""
@@ -506,11 +630,36 @@ class Application(ttk.Frame,
 
         return resolved_ch
 
-    def list_ch_claims(self):
-        """Print the channel claims in the textbox."""
+    def ch_claims_options(self):
+        """Options of the listing of channel claims, from the widgets."""
+        return {"number": self.spin_chl_num.get(),
+                "create": self.chck_chl_create.get(),
+                "height": self.chck_chl_height.get(),
+                "release": self.chck_chl_rels.get(),
+                "claim_id": self.chck_chl_cid.get(),
+                "typ": self.chck_chl_type.get(),
+                "sizes": self.chck_chl_sizes.get(),
+                "supports": self.chck_chl_supp.get(),
+                "fees": self.chck_chl_fees.get(),
+                "title": self.chck_chl_title.get(),
+                "sanitize": True,
+                "start": self.spin_chl_start.get(),
+                "end": self.spin_chl_end.get(),
+                "reverse": self.chck_chl_reverse.get(),
+                "server": self.server_var.get()}
+
+    def list_ch_claims(self, refresh=True):
+        """Print the channel claims in the textbox.
+
+        The claims come from the local index of the channel;
+        with `refresh=False` the index is not updated online first.
+        """
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
+        if "," in self.entry_chl_chan.get():
+            return self.list_chs_claims(refresh=refresh)
+
         resolved_ch = self.resolve_sg_ch(print_msg=True)
 
         if not resolved_ch["claim"]:
@@ -520,27 +669,23 @@ class Application(ttk.Frame,
 
         output = \
             actions.i_list_ch_claims(ch_name_str,
-                                     number=self.spin_chl_num.get(),
-                                     create=self.chck_chl_create.get(),
-                                     height=self.chck_chl_height.get(),
-                                     release=self.chck_chl_rels.get(),
-                                     claim_id=self.chck_chl_cid.get(),
-                                     typ=self.chck_chl_type.get(),
                                      ch_name=self.chck_chl_chname.get(),
-                                     sizes=self.chck_chl_sizes.get(),
-                                     supports=self.chck_chl_supp.get(),
-                                     fees=self.chck_chl_fees.get(),
-                                     title=self.chck_chl_title.get(),
-                                     sanitize=True,
-                                     start=1, end=0,
-                                     reverse=self.chck_chl_reverse.get(),
-                                     server=self.server_var.get())
+                                     refresh=refresh,
+                                     **self.ch_claims_options())
 
+        self.show_ch_claims(output, header=resolved_ch["summary"])
+
+    def show_ch_claims(self, output, header=None):
+        """Print the claims of a channel listing in the textbox."""
         if not output["lines"]:
             output["lines"] = "No claims found"
 
-        content = resolved_ch["summary"] + "\n"
-        content += 80 * "-" + "\n"
+        content = ""
+
+        if header:
+            content += header + "\n"
+            content += 80 * "-" + "\n"
+
         content += output["summary"] + "\n"
         content += 80 * "-" + "\n"
         content += output["lines"]
@@ -548,6 +693,91 @@ class Application(ttk.Frame,
         self.write_text(self.textbox_ch_list, content)
         self.print_done(print_msg=True)
 
+    def list_chs_claims(self, refresh=True):
+        """Print the claims of several channels merged by release time."""
+        validated_chs = []
+
+        for channel in self.entry_chl_chan.get().split(","):
+            channel = channel.strip()
+
+            if not channel:
+                continue
+
+            if not channel.startswith("@"):
+                channel = "@" + channel
+
+            validated_chs.append({"claim_input": channel,
+                                  "number": None})
+
+        resolved_chs = res.i_resolve_chs(validated_chs,
+                                         print_msg=False,
+                                         server=self.server_var.get())
+
+        channels = []
+        missing = []
+
+        for resolved_ch in resolved_chs:
+            if resolved_ch["claim"]:
+                uri = resolved_ch["claim"]["canonical_url"]
+                channels.append(uri.split("lbry://")[1])
+            else:
+                missing.append(resolved_ch["claim_input"])
+
+        self.show_chs_claims(channels, missing, refresh=refresh)
+
+    def show_chs_claims(self, channels, missing, refresh=True):
+        """Print the claims of the channels merged by release time."""
+        if not channels:
+            self.lab_ch_claims_status.set("No channel found")
+            self.print_done(print_msg=True)
+            return False
+
+        self.lab_ch_claims_status.set(f"Channels: {len(channels)}")
+
+        output = \
+            actions.i_list_chs_claims(channels, refresh=refresh,
+                                      **self.ch_claims_options())
+
+        if not output["lines"]:
+            output["lines"] = "No claims found"
+
+        content = output["summary"] + "\n"
+
+        if missing:
+            content += "Channels not found: " + ", ".join(missing) + "\n"
+
+        content += 80 * "-" + "\n"
+        content += output["lines"]
+
+        self.write_text(self.textbox_ch_list, content)
+        self.print_done(print_msg=True)
+
+    def list_ch_claims_local(self):
+        """Print a window of the channel claims from the local index.
+
+        Nothing is requested from the daemon; the channels are found
+        among the indices that were saved before.
+        """
+        text = self.entry_chl_chan.get()
+        found = actions.i_local_chs(text)
+
+        if "," in text:
+            return self.show_chs_claims(found["channels"], found["missing"],
+                                        refresh=False)
+
+        if not found["channels"]:
+            print(f"There is no local index of the channel: {text}")
+            self.print_done(print_msg=True)
+            return False
+
+        output = \
+            actions.i_list_ch_claims(found["channels"][0],
+                                     ch_name=self.chck_chl_chname.get(),
+                                     refresh=False,
+                                     **self.ch_claims_options())
+
+        self.show_ch_claims(output)
+
     def list_subscr_chs(self):
         """Print the subscribed channels in the textbox."""
         if not hlp.server_exists(server=self.server_var.get()):
@@ -578,53 +808,50 @@ class Application(ttk.Frame,
                                    shared=self.rad_subs_shared.get(),
                                    show=self.rad_subs_show.get(),
                                    threads=self.spin_subs_threads.get(),
+                                   rate=self.spin_subs_rate.get(),
                                    claim_id=self.check_subs_claim_id.get(),
-                                   title=self.check_subs_title.get())
+                                   title=self.check_subs_title.get(),
+                                   server=self.server_var.get())
 
         self.write_text(self.textbox_ch_subs_list, content)
         self.print_done(print_msg=True)
 
-    def list_pub_chs(self, print_msg=True):
+    def list_pub_chs(self):
         """Print the channels defined in the wallet in the textbox."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
-        output = actions.i_list_pub_chs(is_spent=self.chck_ch_spent.get(),
-                                        updates=self.chck_ch_upd.get(),
-                                        claim_id=self.chck_ch_cid.get(),
-                                        addresses=self.chck_ch_addr.get(),
-                                        accounts=self.chck_ch_acc.get(),
-                                        amounts=self.chck_ch_amount.get(),
-                                        reverse=self.chck_pub_rev.get(),
-                                        server=self.server_var.get())
-
-        summary = output["summary"]
-
-        if summary:
-            content = summary + "\n" + output["content"]
-        else:
-            content = output["content"]
-
-        self.write_text(self.textbox_p_chs, content)
-        self.print_done(print_msg=print_msg)
+        rows = actions.i_list_pub_chs(is_spent=self.chck_ch_spent.get(),
+                                      updates=self.chck_ch_upd.get(),
+                                      claim_id=self.chck_ch_cid.get(),
+                                      addresses=self.chck_ch_addr.get(),
+                                      accounts=self.chck_ch_acc.get(),
+                                      amounts=self.chck_ch_amount.get(),
+                                      reverse=self.chck_pub_rev.get(),
+                                      number=self.spin_pub_num.get(),
+                                      server=self.server_var.get())
 
-        return output["channels"]
+        self.stream_text(self.textbox_p_chs, rows, empty="No channels found")
 
     def fill_ch_list(self, print_msg=True):
-        """Print the claims defined in the wallet in the textbox."""
+        """Fill the list of channels to select the published claims."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
-        resolved_chs = self.list_pub_chs(print_msg=False)
+        server = self.server_var.get()
 
-        combo_values = ["All", "Anonymous"]
+        def done(resolved_chs):
+            combo_values = ["All", "Anonymous"]
 
-        for resolved_ch in resolved_chs:
-            ch_name = resolved_ch["canonical_url"].split("lbry://")[1]
-            combo_values.append(ch_name)
+            for resolved_ch in resolved_chs:
+                ch_name = resolved_ch["canonical_url"].split("lbry://")[1]
+                combo_values.append(ch_name)
 
-        self.combo_pub_ch["values"] = combo_values
-        self.print_done(print_msg=print_msg)
+            self.combo_pub_ch["values"] = combo_values
+            self.print_done(print_msg=print_msg)
+
+        bg.run_task(self, lambda: actions.i_get_pub_chs(server=server),
+                    on_done=done)
 
     def list_pub_claims(self):
         """Print the claims defined in the wallet in the textbox."""
@@ -633,29 +860,25 @@ class Application(ttk.Frame,
 
         self.fill_ch_list(print_msg=False)
 
-        output = actions.i_list_pub_claims(is_spent=self.chck_ch_spent.get(),
-                                           select=self.chck_pub_ch.get(),
-                                           updates=self.chck_ch_upd.get(),
-                                           claim_id=self.chck_ch_cid.get(),
-                                           addresses=self.chck_ch_addr.get(),
-                                           typ=self.chck_pub_types.get(),
-                                           amounts=self.chck_ch_amount.get(),
-                                           title=self.chck_pub_title.get(),
-                                           reverse=self.chck_pub_rev.get(),
-                                           server=self.server_var.get())
-
-        summary = output["summary"]
-
-        if summary:
-            content = summary + "\n" + output["content"]
-        else:
-            content = output["content"]
+        rows = actions.i_list_pub_claims(is_spent=self.chck_ch_spent.get(),
+                                         select=self.chck_pub_ch.get(),
+                                         updates=self.chck_ch_upd.get(),
+                                         claim_id=self.chck_ch_cid.get(),
+                                         addresses=self.chck_ch_addr.get(),
+                                         typ=self.chck_pub_types.get(),
+                                         amounts=self.chck_ch_amount.get(),
+                                         title=self.chck_pub_title.get(),
+                                         reverse=self.chck_pub_rev.get(),
+                                         number=self.spin_pub_num.get(),
+                                         server=self.server_var.get())
 
-        self.write_text(self.textbox_p_claims, content)
-        self.print_done(print_msg=True)
+        self.stream_text(self.textbox_p_claims, rows)
 
     def controlling_claims(self):
         """Print the information of the controlling claims."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
         content = \
             actions.i_ctrl_claims(show_contr=self.check_c_contr.get(),
                                   show_non_contr=self.check_c_non_contr.get(),
@@ -666,17 +889,29 @@ class Application(ttk.Frame,
                                   show_competing=self.check_c_compete.get(),
                                   show_reposts=self.check_c_reposts.get(),
                                   compact=self.check_c_compact.get(),
+                                  full=self.check_c_full.get(),
                                   server=self.server_var.get())
 
         self.write_text(self.textbox_controlling, content)
         self.print_done(print_msg=True)
 
+    def controlling_changes(self):
+        """Print the changes in the bids found in the last run."""
+        content = actions.i_ctrl_changes()
+
+        self.write_text(self.textbox_controlling, content)
+        self.print_done(print_msg=True)
+
     def default_comm_server(self):
         """Set up default comment server."""
         self.cmnt_server.set(self.cmnt_server_def.get())
 
     def list_comments(self):
-        """Print the existing comments below a claim."""
+        """Print the existing comments below a claim.
+
+        The comments at the top level are requested page by page
+        in a thread, and the list is filled in as the pages arrive.
+        """
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
@@ -689,30 +924,147 @@ class Application(ttk.Frame,
             self.print_done(print_msg=True)
             return {"error_no_claim": True}
 
-        result = actions.i_list_comments(active_claim,
-                                         comm_server=self.cmnt_server.get(),
-                                         server=self.server_var.get())
+        key = str(self.lstbox_cmnt)
 
-        self.comment_claim = result["claim"]
-        self.comments = result["comments"]
+        if key in self.streams:
+            self.streams[key].cancel()
+
+        self.comment_claim = active_claim
+        self.cmnt_rows = []
+        self.cmnt_total = 0
         self.comment_id = None
+        self.lstbox_cmnt.delete(0, tk.END)
+
+        loaded = active_claim["canonical_url"].split("lbry://")[1]
+        loaded = '"' + hlp.sanitize_text(loaded) + '"'
+        self.lab_rep_status.set(f"Status: loading comments, {loaded}")
+
+        def on_items(rows):
+            first = not self.cmnt_rows
+            self.cmnt_total = rows[-1]["total"]
+            self.cmnt_rows.extend((row["id"], row["depth"], row["replies"])
+                                  for row in rows)
+            self.lstbox_cmnt.insert(tk.END, *[row["line"] for row in rows])
+            self.show_cmnt_summary()
+
+            if first:
+                self.lstbox_cmnt.selection_clear(0, tk.END)
+                self.lstbox_cmnt.selection_set(0)
+                self.lstbox_cmnt.see(0)
+                self.lstbox_cmnt.focus()
+                self.show_comment(print_msg=False)
+
+        def on_done():
+            self.show_cmnt_summary()
+            self.lab_rep_status.set(f"Status: claim loaded, {loaded}")
+
+            if not self.cmnt_rows:
+                self.show_comment(print_msg=False)
+
+            self.print_done(print_msg=True)
+
+        self.cmnt_cache = actions.i_comment_cache(active_claim)
+        rows = actions.i_list_comments(self.cmnt_cache,
+                                       comm_server=self.cmnt_server.get())
+        self.streams[key] = bg.run_stream(self, rows,
+                                          on_items=on_items,
+                                          on_done=on_done)
+
+        return {"claim": self.comment_claim}
+
+    def redraw_comments(self, expand=None):
+        """List the comments again from the cache, without requests.
+
+        The comments that were expanded stay expanded,
+        and the comment `expand` is expanded too.
+        """
+        rows = self.cmnt_rows
+        expanded = {rows[n][0] for n in range(len(rows) - 1)
+                    if rows[n + 1][1] > rows[n][1]}
 
-        self.cmnt_list.set(result["lines"])
-        self.lab_cmnt_num["text"] = result["summary"]
+        if expand:
+            expanded.add(expand)
 
+        rows = actions.i_local_comments(self.cmnt_cache, expanded=expanded)
+
+        self.cmnt_rows = [(row["id"], row["depth"], row["replies"])
+                          for row in rows]
+        self.cmnt_total = rows[0]["total"] if rows else 0
+        self.cmnt_list.set([row["line"] for row in rows])
+        self.show_cmnt_summary()
+
+        index = min(self.cmnt_index.get(), len(rows) - 1)
         self.lstbox_cmnt.selection_clear(0, tk.END)
-        self.lstbox_cmnt.selection_set(0)
-        self.lstbox_cmnt.see(0)
-        self.lstbox_cmnt.focus()
 
-        loaded = active_claim["canonical_url"].split("lbry://")[1]
-        loaded = '"' + hlp.sanitize_text(loaded) + '"'
+        if index >= 0:
+            self.lstbox_cmnt.selection_set(index)
+            self.lstbox_cmnt.see(index)
 
-        self.lab_rep_status.set(f"Status: claim loaded, {loaded}")
         self.show_comment(print_msg=False)
-        self.print_done(print_msg=True)
 
-        return {"claim": self.comment_claim}
+    def show_cmnt_summary(self):
+        summary = actions.comments_summary(self.cmnt_rows,
+                                           total=self.cmnt_total)
+        self.lab_cmnt_num["text"] = summary
+
+    def toggle_replies(self, nested=False):
+        """Show the replies to the selected comment, or hide them.
+
+        The replies are only requested from the comment server
+        when the comment is expanded; with `nested` also the replies
+        to the replies are requested, at every level.
+        """
+        idxs = self.lstbox_cmnt.curselection()
+
+        if not self.comment_claim or len(idxs) != 1:
+            print("Select a comment first")
+            return False
+
+        index = int(idxs[0])
+        row = self.cmnt_rows[index]
+        comment_id, depth, n_replies = row
+        end = index + 1
+
+        while (end < len(self.cmnt_rows)
+               and self.cmnt_rows[end][1] > depth):
+            end += 1
+
+        if end > index + 1:
+            # Already expanded, so collapse it
+            del self.cmnt_rows[index + 1:end]
+            self.lstbox_cmnt.delete(index + 1, end - 1)
+            return True
+
+        if not n_replies:
+            print("This comment has no replies")
+            return False
+
+        claim = self.comment_claim
+        cache = self.cmnt_cache
+        options = {"depth": depth + 1,
+                   "nested": nested,
+                   "comm_server": self.cmnt_server.get()}
+
+        def replies():
+            return list(actions.i_list_replies(cache, comment_id,
+                                               **options))
+
+        def done(rows):
+            positions = [n for n, r in enumerate(self.cmnt_rows)
+                         if r[0] == comment_id]
+
+            if claim is not self.comment_claim or not positions:
+                return
+
+            position = positions[0] + 1
+            self.cmnt_rows[position:position] = \
+                [(r["id"], r["depth"], r["replies"]) for r in rows]
+            self.lstbox_cmnt.insert(position, *[r["line"] for r in rows])
+            self.show_cmnt_summary()
+            self.print_done(print_msg=True)
+
+        bg.run_task(self, replies, on_done=done,
+                    on_error=lambda err: self.print_done(print_msg=True))
 
     def show_comment(self, print_msg=True):
         """Show full comment depending on the selected element on the list."""
@@ -723,11 +1075,13 @@ class Application(ttk.Frame,
 
         idxs = self.lstbox_cmnt.curselection()
 
-        if len(idxs) == 1:
+        if len(idxs) >= 1:
+            # With several comments selected the first one is shown
             self.cmnt_index.set(int(idxs[0]))
             self.lstbox_cmnt.see(self.cmnt_index.get())
 
-            cmnt_data = self.comments[self.cmnt_index.get()]
+            comment_id = self.cmnt_rows[self.cmnt_index.get()][0]
+            cmnt_data = actions.i_get_comment(self.cmnt_cache, comment_id)
             cmnt_data["index"] = self.cmnt_index.get()
             cmnt_data["claim"] = self.comment_claim
             self.comment_id = cmnt_data["comment_id"]
@@ -777,7 +1131,7 @@ class Application(ttk.Frame,
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
-        resolved_chs = self.list_pub_chs(print_msg=False)
+        resolved_chs = actions.i_get_pub_chs(server=self.server_var.get())
 
         combo_values = []
 
@@ -833,12 +1187,16 @@ class Application(ttk.Frame,
         if self.cmb_rep_author.get() in ("(None)"):
             self.cmb_rep_author.set(None)
 
+        if self.rad_rep_targets.get() in ("selected", "search"):
+            return self.act_comments_batch()
+
         cmnt_in = {"claim": self.comment_claim,
                    "new_comment": self.textbox_cmnt_rep.get("1.0", tk.END),
                    "author": self.cmb_rep_author.get(),
                    "comment_id": self.comment_id}
 
         output = actions.i_act_comment(cmnt_in,
+                                       cache=self.cmnt_cache,
                                        action=self.rad_rep_opt.get(),
                                        cmnt_reply=self.rad_rep_curr.get(),
                                        comm_server=self.cmnt_server.get(),
@@ -847,19 +1205,144 @@ class Application(ttk.Frame,
         self.lab_rep_status.set(output["status"])
         self.print_done(print_msg=True)
 
-        # Refresh the list of comments after 0.85 s
-        self.after(850, self.list_comments)
+        if output["cached"]:
+            # Our comment is already in the cache, so no request is needed
+            self.redraw_comments(expand=self.comment_id)
+        else:
+            # Refresh the list of comments after 0.85 s
+            self.after(850, self.list_comments)
+
         self.rad_rep_opt.set("create")
         self.activate_rep(show=False)  # Already shown by list_comments
 
+    def act_comments_batch(self):
+        """Perform the action on many comments at once, in a thread.
+
+        The comments are those selected in the list,
+        or those found in the last search.
+        """
+        if self.rad_rep_targets.get() in ("selected"):
+            if not self.comment_claim:
+                print("(no claim loaded)")
+                return False
+
+            claim_id = self.comment_claim["claim_id"]
+            targets = [(claim_id, self.cmnt_rows[int(n)][0])
+                       for n in self.lstbox_cmnt.curselection()]
+        else:
+            targets = list(self.cmnt_search_targets)
+
+        if not targets:
+            print("There are no comments selected, or found by the search")
+            return False
+
+        cache = self.cmnt_cache
+        options = {"cache": cache,
+                   "action": self.rad_rep_opt.get(),
+                   "new_comment": self.textbox_cmnt_rep.get("1.0", tk.END),
+                   "author": self.cmb_rep_author.get(),
+                   "threads": self.spin_batch_threads.get(),
+                   "rate": self.spin_batch_rate.get(),
+                   "comm_server": self.cmnt_server.get(),
+                   "server": self.server_var.get()}
+
+        def done(output):
+            if output["cached"] and cache is self.cmnt_cache:
+                self.redraw_comments()
+
+            self.lab_rep_status.set(output["status"])
+            self.write_text(self.textbox_cmnt, output["content"])
+            self.write_text(self.textbox_cmnt2, output["content"])
+            self.print_done(print_msg=True)
+
+        def error(err):
+            self.lab_rep_status.set(f"Status: {type(err).__name__}: {err}")
+            self.print_done(print_msg=True)
+
+        self.lab_rep_status.set(f"Status: {options['action']} "
+                                f"on {len(targets)} comments...")
+        bg.run_task(self, lambda: actions.i_act_comments(targets, **options),
+                    on_done=done, on_error=error)
+
+    def list_ch_comments(self):
+        """Print the comments of the claims of a channel in one feed."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        channel = self.entry_chcm_chan.get().strip()
+
+        if not channel:
+            print("Write the name of a channel")
+            return False
+
+        if not channel.startswith("@"):
+            channel = "@" + channel
+            self.entry_chcm_chan.set(channel)
+
+        resolved_ch = res.i_resolve_chs([{"claim_input": channel,
+                                          "number": None}],
+                                        print_msg=False,
+                                        server=self.server_var.get())[0]
+
+        if not resolved_ch["claim"]:
+            print(f"Channel not found: {channel}")
+            return False
+
+        ch_name = resolved_ch["claim"]["canonical_url"].split("lbry://")[1]
+
+        options = {"number": self.spin_chcm_num.get(),
+                   "threads": self.spin_chcm_threads.get(),
+                   "limit": self.spin_chcm_limit.get(),
+                   "cache": self.cmnt_cache,
+                   "comm_server": self.cmnt_server.get(),
+                   "server": self.server_var.get()}
+
+        def done(output):
+            self.write_text(self.textbox_ch_cmnt, output["content"])
+            self.print_done(print_msg=True)
+
+        self.write_text(self.textbox_ch_cmnt, "(loading comments...)")
+        bg.run_task(self,
+                    lambda: actions.i_channel_comments(ch_name, **options),
+                    on_done=done,
+                    on_error=self.task_error(self.textbox_ch_cmnt))
+
+    def search_comments(self):
+        """Search the comments of the claims that were loaded before."""
+        output = \
+            actions.i_search_comments(text=self.entry_csearch_text.get(),
+                                      author=self.entry_csearch_author.get(),
+                                      since=self.entry_csearch_since.get(),
+                                      until=self.entry_csearch_until.get(),
+                                      limit=self.spin_csearch_num.get())
+
+        self.cmnt_search_targets = output["comments"]
+        self.write_text(self.textbox_cmnt_search, output["content"])
+        self.print_done(print_msg=True)
+
+    def keep_peers(self, kind, key, number=0):
+        """Start keeping the searches of a peer listing, to export them."""
+        self.peer_listings[kind] = {"key": key,
+                                    "number": number,
+                                    "results": [],
+                                    "done": False}
+        return self.peer_listings[kind]
+
+    def set_peer_cache(self):
+        """Configure the cache of peer searches shared by the peer pages."""
+        actions.set_peer_cache(minutes=self.spin_peer_cache_min.get(),
+                               size=self.spin_peer_cache_size.get())
+
     def list_m_peers(self):
         """Print the peers of the claims in the textbox."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
+        self.set_peer_cache()
+
         resolved_claims = self.resolve_claims(print_msg=False)
 
-        output = \
+        rows = \
             actions.i_list_m_peers(resolved_claims,
                                    threads=self.spin_cls_peers_threads.get(),
                                    claim_id=self.chck_cls_peers_cid.get(),
@@ -869,18 +1352,18 @@ class Application(ttk.Frame,
                                    sanitize=True,
                                    server=self.server_var.get())
 
-        content = output["summary"] + "\n"
-        content += 80 * "-" + "\n"
-        content += output["lines"]
-
-        self.write_text(self.textbox_cls_peers_out, content)
-        self.print_done(print_msg=True)
+        key = ",".join(sorted(r["claim"]["claim_id"]
+                              for r in resolved_claims if r["claim"]))
+        keep = self.keep_peers("claim_peers", key)
+        self.stream_text(self.textbox_cls_peers_out, rows, keep=keep)
 
     def list_ch_peers(self):
         """Print the peers of the claims of a channel."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
+        self.set_peer_cache()
+
         resolved_ch = self.resolve_sg_ch(print_msg=True)
 
         if not resolved_ch["claim"]:
@@ -888,7 +1371,7 @@ class Application(ttk.Frame,
 
         ch_name = resolved_ch["claim"]["canonical_url"].split("lbry://")[1]
 
-        output = \
+        rows = \
             actions.i_list_ch_peers(ch_name,
                                     number=self.spin_ch_peers_num.get(),
                                     threads=self.spin_cls_peers_threads.get(),
@@ -899,88 +1382,190 @@ class Application(ttk.Frame,
                                     sanitize=True,
                                     server=self.server_var.get())
 
-        if not output["lines"]:
-            output["lines"] = "No claims found"
-
-        content = resolved_ch["summary"] + "\n"
-        content += 80 * "-" + "\n"
-        content += output["summary"] + "\n"
-        content += 80 * "-" + "\n"
-        content += output["lines"]
+        head = resolved_ch["summary"] + "\n" + 80 * "-" + "\n"
+        rows = (dict(row, summary=head + row["summary"]) for row in rows)
 
-        self.write_text(self.textbox_ch_peers, content)
-        self.print_done(print_msg=True)
+        keep = self.keep_peers("ch_peers", ch_name,
+                               number=self.spin_ch_peers_num.get())
+        self.stream_text(self.textbox_ch_peers, rows, keep=keep)
 
     def list_chs_peers(self):
         """Print the peers from the channels listed in the textbox."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
+        self.set_peer_cache()
+
         resolved_chs = self.resolve_chs(print_msg=False)
 
-        output = \
+        rows = \
             actions.i_list_chs_peers(resolved_chs,
-                                     ch_threads=self.spin_chs_ch_threads.get(),
-                                     cl_threads=self.spin_chs_cl_threads.get(),
+                                     threads=self.spin_chs_threads.get(),
                                      server=self.server_var.get())
 
-        content = output["summary"] + "\n"
-        content += 80 * "-" + "\n"
-        content += output["lines"]
-
-        self.write_text(self.textbox_chs_peers_out, content)
-        self.print_done(print_msg=True)
+        key = ",".join(f"{r['claim_input']}_{r['number']}"
+                       for r in resolved_chs if r["claim"])
+        keep = self.keep_peers("chs_peers", key)
+        self.stream_text(self.textbox_chs_peers_out, rows,
+                         empty="No channels found", keep=keep)
 
     def list_ch_subs_peers(self):
         """Print peers from our list of subscribed channels."""
         if not hlp.server_exists(server=self.server_var.get()):
             return False
 
+        self.set_peer_cache()
+
         if self.spin_ch_peers_num.get() <= 0:
             self.spin_ch_peers_num.set(1)
             print("Number of claims set to: 1")
 
-        output = \
+        rows = \
             actions.i_list_subs_peers(number=self.spin_ch_peers_num.get(),
                                       shared=self.rad_subs_pr_shared.get(),
                                       show=self.rad_subs_pr_show.get(),
-                                      ch_thrs=self.spin_subs_ch_threads.get(),
-                                      c_thrs=self.spin_subs_cl_threads.get(),
+                                      threads=self.spin_subs_pr_threads.get(),
+                                      record=self.check_subs_record.get(),
+                                      sample=self.spin_subs_sample.get(),
                                       server=self.server_var.get())
 
-        content = output["summary"] + "\n"
-        content += 80 * "-" + "\n"
-        content += output["lines"]
+        key = (f"{self.rad_subs_pr_shared.get()}_"
+               f"{self.rad_subs_pr_show.get()}_"
+               f"{self.spin_subs_sample.get()}")
+        keep = self.keep_peers("subs_peers", key,
+                               number=self.spin_ch_peers_num.get())
+        self.stream_text(self.textbox_subs_peers, rows,
+                         empty="No channels found", keep=keep)
+
+        if getattr(self, "subs_timer", None):
+            self.after_cancel(self.subs_timer)
+            self.subs_timer = None
+
+        if self.check_subs_record.get():
+            minutes = max(1, self.spin_subs_interval.get())
+            self.subs_timer = self.after(minutes * 60000,
+                                         self.sample_subs_peers)
+            print(f"Next recording of peers in {minutes} minutes")
+
+    def sample_subs_peers(self):
+        """List the peers again, if the recording is still selected."""
+        self.subs_timer = None
+
+        if self.check_subs_record.get():
+            self.list_ch_subs_peers()
+
+    def show_peer_trends(self):
+        """Print the trends of the peers from the recorded history."""
+        days = self.spin_subs_trend_days.get()
+
+        def done(content):
+            self.write_text(self.textbox_subs_peers, content)
+            self.print_done(print_msg=True)
 
-        self.write_text(self.textbox_subs_peers, content)
-        self.print_done(print_msg=True)
+        self.write_text(self.textbox_subs_peers, "(loading...)")
+        bg.run_task(self, lambda: actions.i_peer_trends(days=days),
+                    on_done=done,
+                    on_error=self.task_error(self.textbox_subs_peers))
 
     def seeding_ratio(self):
-        """Print estimated seeding ratio from the log files."""
-        frame = None
+        """Print estimated seeding ratio from the log files.
 
-        if self.check_seed_plot.get():
-            if not hasattr(self, "top_plot"):
-                # This is normally not called because the plot toplevel
-                # is already set up by `SeedPage.setup_page_seed`
-                frame = self.setup_plot()
-                frame.deiconify()
-            elif hasattr(self, "top_plot"):
-                if self.top_plot.children:
-                    # We remove the content before reusing the toplevel
-                    frame = self.remove_plot()
-                else:
-                    # The toplevel is empty, so we just use it
-                    frame = self.top_plot
-                frame.deiconify()
+        The logs are read, and the plot data is computed, in a thread;
+        only the drawing of the plot runs in the interface.
+        """
+        options = {"plot_hst_var": self.check_seed_plot.get(),
+                   "bucket": self.rad_seed_bucket.get(),
+                   "number": self.spin_seed_buckets.get(),
+                   "claims": self.check_seed_claims.get(),
+                   "points": self.plot_points(),
+                   "server": self.server_var.get()}
 
-        content = \
-            actions.i_seeding_ratio(frame=frame,
-                                    plot_hst_var=self.check_seed_plot.get(),
+        def done(output):
+            self.write_text(self.textbox_seed, output["content"])
+
+            if output["plot"] is not None:
+                self.draw_plot(output["plot"])
+
+            self.print_done(print_msg=True)
+
+        self.write_text(self.textbox_seed, "(reading the logs...)")
+        bg.run_task(self, lambda: actions.i_seeding_ratio(**options),
+                    on_done=done,
+                    on_error=self.task_error(self.textbox_seed))
+
+    def toggle_monitor(self):
+        """Start or stop the live monitor of the uploads."""
+        if getattr(self, "monitor", None):
+            self.after_cancel(self.monitor_timer)
+            self.monitor.stop()
+            self.monitor = None
+            self.monitor_text.set("Live monitor stopped")
+            return True
+
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        self.monitor = actions.i_start_monitor(server=self.server_var.get())
+
+        if self.monitor:
+            self.refresh_monitor()
+
+    def refresh_monitor(self):
+        """Show the totals of the live monitor every two seconds."""
+        self.monitor_text.set(self.monitor.text())
+        self.monitor_timer = self.after(2000, self.refresh_monitor)
+
+    def plan_seeding(self):
+        """Rank candidate streams, and choose those worth seeding."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        options = {"source": self.rad_plan_source.get(),
+                   "text": self.entry_plan_text.get(),
+                   "number": self.spin_plan_num.get(),
+                   "budget": self.spin_plan_budget.get(),
+                   "threads": self.spin_plan_threads.get(),
+                   "server": self.server_var.get()}
+
+        if options["source"] != "subs" and not options["text"].strip():
+            print("Write the channels, or the text to search, in the entry")
+            return False
+
+        self.seed_plan = []
+
+        def done(output):
+            self.seed_plan = output["claims"]
+            self.write_text(self.textbox_seed_plan, output["content"])
+            self.print_done(print_msg=True)
+
+        self.write_text(self.textbox_seed_plan, "(searching peers...)")
+        bg.run_task(self, lambda: actions.i_plan_seeding(**options),
+                    on_done=done,
+                    on_error=self.task_error(self.textbox_seed_plan))
+
+    def download_plan(self):
+        """Download the streams chosen by the seed planner."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        claims = getattr(self, "seed_plan", [])
+
+        if not claims:
+            print("There is no plan; press 'Plan seeding' first")
+            return False
+
+        ddir = hlp.get_download_dir(ddir=self.entry_d_dir.get(),
                                     server=self.server_var.get())
+        self.entry_d_dir.set(ddir)
 
-        self.write_text(self.textbox_seed, content)
-        self.print_done(print_msg=True)
+        options = {"ddir": ddir,
+                   "own_dir": self.check_d_own_dir.get(),
+                   "save_file": self.check_d_save.get(),
+                   "server": self.server_var.get()}
+
+        bg.run_task(self, lambda: actions.i_download_plan(claims, **options),
+                    on_done=lambda output: self.print_done(print_msg=True),
+                    on_error=lambda err: self.print_done(print_msg=True))
 
     def delete_claims(self):
         """Delete the claims in the textbox."""
@@ -1190,6 +1775,113 @@ class Application(ttk.Frame,
         self.write_text(self.textbox_search, content)
         self.print_done(print_msg=True)
 
+    def listing_options(self, kind):
+        """Collect the options of a listing page, to get its records.
+
+        The peer listings use the searches that were shown in their page.
+        """
+        if kind in actions.PEER_KINDS:
+            listing = self.peer_listings.get(kind)
+
+            if not listing or not listing["done"]:
+                print("List the peers first, and wait until "
+                      "the listing finishes")
+                return False
+
+            return {"channel": listing["key"],
+                    "number": listing["number"],
+                    "results": listing["results"]}
+
+        channel = None
+
+        if kind == "ch_claims":
+            resolved_ch = self.resolve_sg_ch(print_msg=False)
+
+            if not resolved_ch["claim"]:
+                return False
+
+            channel = \
+                resolved_ch["claim"]["canonical_url"].split("lbry://")[1]
+        elif kind == "downloaded":
+            channel = self.entry_chan.get()
+
+        if kind == "ch_claims":
+            number = self.spin_chl_num.get()
+        else:
+            number = self.spin_subs_claim_num.get()
+
+        return {"channel": channel,
+                "number": number,
+                "shared": self.rad_subs_shared.get() == "shared",
+                "threads": self.spin_subs_threads.get(),
+                "rate": self.spin_subs_rate.get(),
+                "text": self.sr_entry.get(),
+                "tags": self.sr_entry_tags.get(),
+                "claim_type": self.rad_sr_claim.get(),
+                "page": self.spin_sr_page.get(),
+                "server": self.server_var.get()}
+
+    def export_listing(self, kind):
+        """Export a listing to a file chosen by the user."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        options = self.listing_options(kind)
+
+        if not options:
+            return False
+
+        fmt = self.rad_export_fmt.get()
+
+        path = tk.filedialog.asksaveasfilename(parent=self,
+                                               defaultextension="." + fmt,
+                                               initialfile=f"{kind}.{fmt}")
+        if not path:
+            return False
+
+        def export():
+            return actions.i_export(kind, path, fmt=fmt, **options)
+
+        def done(n_rows):
+            if n_rows is not False:
+                print(f"Exported {n_rows} rows to: {path}")
+            self.print_done(print_msg=True)
+
+        print(f"Exporting to: {path}")
+        bg.run_task(self, export, on_done=done,
+                    on_error=lambda err: self.print_done(print_msg=True))
+
+    def snapshot_listing(self, kind):
+        """Save a snapshot of a listing, and print what changed."""
+        if not hlp.server_exists(server=self.server_var.get()):
+            return False
+
+        options = self.listing_options(kind)
+
+        if not options:
+            return False
+
+        textbox = {"downloaded": self.textbox_list_d,
+                   "ch_claims": self.textbox_ch_list,
+                   "subscriptions": self.textbox_ch_subs_list,
+                   "supports": self.textbox_supports,
+                   "claim_peers": self.textbox_cls_peers_out,
+                   "ch_peers": self.textbox_ch_peers,
+                   "chs_peers": self.textbox_chs_peers_out,
+                   "subs_peers": self.textbox_subs_peers,
+                   "search": self.textbox_search}[kind]
+
+        def snapshot():
+            return actions.i_snapshot_diff(kind, **options)
+
+        def done(content):
+            self.write_text(textbox, content)
+            self.print_done(print_msg=True)
+
+        self.write_text(textbox, "(loading...)")
+        bg.run_task(self, snapshot, on_done=done,
+                    on_error=self.task_error(textbox))
+
 
 def main(argv=None):
     root = tk.Tk()
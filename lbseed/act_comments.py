@@ -24,107 +24,242 @@
 # DEALINGS IN THE SOFTWARE.                                                   #
 # --------------------------------------------------------------------------- #
 """Methods to list claims with the interface."""
-import tempfile
+import calendar
+import heapq
 import time
 
 import lbrytools as lbryt
 import lbrytools.funcs as funcs
 
+import lbseed.ch_index as cix
+import lbseed.comment_cache as cmc
+import lbseed.comment_index as cmi
+import lbseed.comments as cmt
+import lbseed.throttle as thr
 
-def get_r_list(comments, cmnt_info=None, indent=0, sanitize=False):
-    """Put all comments in a flat list so we can get the comments quickly."""
-    if not cmnt_info:
-        cmnt_info = []
 
-    n_base = len(comments)
+def comment_line(comment, num, n_base, indent=0, sanitize=False):
+    """Get the line of a comment to show in the list of comments."""
     indentation = indent * " "
 
-    for num, comment in enumerate(comments, start=1):
-        ch = comment.get("channel_url", "lbry://_Unknown_#000")
-        ch = ch.lstrip("lbry://").split("#")
-        ch_name = ch[0] + "#" + ch[1][0:3]
+    ch = comment.get("channel_url", "lbry://_Unknown_#000")
+    ch = ch.lstrip("lbry://").split("#")
+    ch_name = ch[0] + "#" + ch[1][0:3]
 
-        if sanitize:
-            ch_name = lbryt.sanitize_text(ch_name)
+    if sanitize:
+        ch_name = lbryt.sanitize_text(ch_name)
 
-        comm_id = comment["comment_id"]
-        comm = comment["comment"]
+    comm_id = comment["comment_id"]
+    comm = comment["comment"]
 
-        if sanitize:
-            comm = lbryt.sanitize_text(comm)
+    if sanitize:
+        comm = lbryt.sanitize_text(comm)
 
-        comm = comm.splitlines()
-        if len(comm) > 0:
-            comm = comm[0]
-        else:
-            comm = ""
+    comm = comm.splitlines()
+    if len(comm) > 0:
+        comm = comm[0]
+    else:
+        comm = ""
 
-        if len(comm) > 80:
-            cmmnt = f'"{comm:.80s}..."'
-        else:
-            cmmnt = f'"{comm}"'
-
-        line = (f"{indentation}"
-                f"{num:2d}/{n_base:2d}; {ch_name:30s}; {cmmnt}; "
-                f"{comm_id}")
-        cmnt_info.append({"line": line,
-                          "data": comment})
-
-        if ("replies" in comment and "sub_replies" in comment
-                and comment["sub_replies"]):
-            get_r_list(comment["sub_replies"], indent=indent+2,
-                       sanitize=sanitize, cmnt_info=cmnt_info)
-
-    return cmnt_info
-
-
-def i_list_comments(resolved_claim,
-                    comm_server="https://comments.odysee.com/api/v2",
-                    server="http://localhost:5279"):
-    """Get all comments from a specific claim."""
-    cid = resolved_claim["claim_id"]
-
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        output = lbryt.list_comments(uri=None, cid=cid, name=None,
-                                     sub_replies=True,
-                                     hidden=False, visible=False,
-                                     full=False,
-                                     file=fp.name, fdate=False,
-                                     page=1, page_size=999,
-                                     sanitize=True,
-                                     comm_server=comm_server,
-                                     server=server)
-        fp.seek(0)
-        content = fp.read()
-
-    lines = []
-    comments = []
-
-    if output:
-        cmnt_info = []
-        cmnt_info = get_r_list(output["root_comments"],
-                               cmnt_info=cmnt_info, indent=0, sanitize=True)
-
-        lines = [info["line"] for info in cmnt_info]
-        comments = [info["data"] for info in cmnt_info]
+    if len(comm) > 80:
+        cmmnt = f'"{comm:.80s}..."'
     else:
-        output["root_comments"] = []
-        output["replies"] = []
+        cmmnt = f'"{comm}"'
+
+    line = (f"{indentation}"
+            f"{num:2d}/{n_base:2d}; {ch_name:30s}; {cmmnt}; "
+            f"{comm_id}")
+
+    n_replies = comment.get("replies", 0)
+
+    if n_replies:
+        line += f"; +{n_replies} replies"
+
+    return line
+
+
+def flatten_comments(roots, children=None, depth=0, store=None,
+                     sanitize=True):
+    """Put the comments of a tree in a flat list of rows.
+
+    `roots` is an iterable of `(comment, total)` pairs,
+    and `children(comment)` returns another such iterable
+    with the replies of a comment; without it only `roots` are listed.
+    It uses a stack of iterators instead of recursion,
+    so deep threads don't reach the recursion limit,
+    and the levels are consumed lazily, one page at a time.
+
+    Each comment is added to `store`, and the row only has the 'line'
+    to show, the comment 'id', its 'depth', the number of 'replies',
+    and the 'total' number of comments at its level.
+    """
+    stack = [[iter(roots), depth, 0]]
+
+    while stack:
+        level = stack[-1]
+
+        try:
+            comment, total = next(level[0])
+        except StopIteration:
+            stack.pop()
+            continue
+
+        level[2] += 1
+        line = comment_line(comment, level[2], total or level[2],
+                            indent=2 * level[1], sanitize=sanitize)
+        if store is not None:
+            store.add(comment)
+
+        n_replies = comment.get("replies", 0)
+
+        yield {"line": line,
+               "id": comment["comment_id"],
+               "depth": level[1],
+               "replies": n_replies,
+               "total": total}
+
+        if children and n_replies:
+            stack.append([iter(children(comment)), level[1] + 1, 0])
+
+
+def i_comment_cache(resolved_claim):
+    """Get an empty cache for the comments of a claim.
+
+    It is filled by `i_list_comments`, and kept by the interface
+    to show the comments, and the replies, of the claim.
+    """
+    name = resolved_claim["canonical_url"].split("lbry://")[-1]
+    return cmc.CommentCache(resolved_claim["claim_id"], name=name)
+
+
+def save_cache(cache):
+    """Save the cache of a claim, and add its comments to the search index."""
+    cache.save()
+    cmi.index_claim(cache.claim_id, cache.comments(), name=cache.name)
+
+
+def server_level(cache, parent_id=None, page_size=50,
+                 comm_server="https://comments.odysee.com/api/v2"):
+    """Request a level of comments, page by page.
+
+    Once the last page arrived, the level is recorded as loaded
+    in the cache; the comments themselves are added while they are listed.
+    """
+    state = {}
+    started = time.time()
+    yield from cmt.iter_comments(cache.claim_id, parent_id=parent_id,
+                                 page_size=page_size,
+                                 state=state,
+                                 comm_server=comm_server)
+
+    if state.get("complete"):
+        cache.fetched(parent_id, started)
+
 
-    sep = ";"
-    n_cmnts = str(len(comments))
-    n_root_cmnts = str(len(output["root_comments"]))
-    n_reps = str(len(output["replies"]))
+def i_list_comments(cache, page_size=50,
+                    comm_server="https://comments.odysee.com/api/v2"):
+    """Get the comments at the top level of the claim of the cache.
+
+    It is a generator, so the list can be filled in
+    while the comments arrive.
+    The thread is kept in a local cache; if the cache has the whole
+    thread, only the newer comments are requested, and the list comes
+    from the cache. Otherwise the comments at the top level
+    are listed page by page, and added to the cache.
+    The replies are listed later with `i_list_replies`.
+    """
+    cache.load()
 
-    summary = (f"Total comments: {n_cmnts}{sep} "
-               f"root comments: {n_root_cmnts}{sep} "
-               f"replies: {n_reps}")
+    if cache.complete:
+        n_new = cache.refresh(page_size=page_size,
+                              comm_server=comm_server)
+        save_cache(cache)
+        print(f"New comments: {n_new}")
+        yield from flatten_comments(cache.level())
+        return
+
+    roots = server_level(cache, page_size=page_size,
+                         comm_server=comm_server)
+    yield from flatten_comments(roots, store=cache)
+    save_cache(cache)
+
+
+def i_list_replies(cache, comment_id, depth=1,
+                   nested=False, page_size=50,
+                   comm_server="https://comments.odysee.com/api/v2"):
+    """Get the replies to a comment.
 
-    return {"claim": resolved_claim,
-            "lines": lines,
-            "comments": comments,
-            "content": content,
-            "summary": summary}
+    If `nested` is `True` the replies to the replies are also listed,
+    at every level, otherwise only the direct replies.
+    They come from the cache if it has the whole thread,
+    otherwise they are requested page by page, and added to the cache.
+    """
+    if cache.complete:
+        def children(comment):
+            return cache.level(comment["comment_id"])
+
+        replies = cache.level(comment_id)
+        yield from flatten_comments(replies,
+                                    children=children if nested else None,
+                                    depth=depth)
+        return
+
+    def children(comment):
+        return server_level(cache, parent_id=comment["comment_id"],
+                            page_size=page_size,
+                            comm_server=comm_server)
+
+    replies = server_level(cache, parent_id=comment_id,
+                           page_size=page_size,
+                           comm_server=comm_server)
+    yield from flatten_comments(replies,
+                                children=children if nested else None,
+                                depth=depth, store=cache)
+    save_cache(cache)
+
+
+def i_local_comments(cache, expanded=None):
+    """List again the comments that are in the cache, without requests.
+
+    The replies of the comments in `expanded` are also listed.
+    """
+    expanded = expanded or set()
+
+    def children(comment):
+        if comment["comment_id"] in expanded:
+            return cache.level(comment["comment_id"])
+
+        return []
+
+    return list(flatten_comments(cache.level(), children=children))
+
+
+def i_get_comment(cache, comment_id):
+    """Get the full comment of a row of the list, or `None`."""
+    return cache.get(comment_id)
+
+
+def comments_summary(rows, total=None, sep=";"):
+    """Summary of the comments that are loaded in the list.
+
+    Each row is `(comment_id, depth, replies)`,
+    and `total` is the number of comments at the top level.
+    """
+    n_root = 0
+    n_reps = 0
+
+    for comment_id, depth, replies in rows:
+        if depth == 0:
+            n_root += 1
+            n_reps += replies
+
+    if total:
+        n_root = total
+
+    return (f"Total comments: {n_root + n_reps}{sep} "
+            f"root comments: {n_root}{sep} "
+            f"replies: {n_reps}{sep} "
+            f"loaded: {len(rows)}")
 
 
 def i_show_comment(cmnt_data, sanitize=True):
@@ -214,12 +349,17 @@ def i_show_no_comment(claim, sanitize=True):
 
 
 def i_act_comment(cmnt_in,
+                  cache=None,
                   action="create",
                   cmnt_reply="reply",
                   wallet_id="default_wallet",
                   comm_server="https://comments.odysee.com/api/v2",
                   server="http://localhost:5279"):
-    """Perform an action on the comment."""
+    """Perform an action on the comment.
+
+    If the `cache` of the claim is given, the action is also applied
+    to it, and 'cached' is `True` in the output.
+    """
     cid = cmnt_in["claim"]["claim_id"]
 
     new_comment = cmnt_in["new_comment"]
@@ -266,7 +406,365 @@ def i_act_comment(cmnt_in,
     else:
         text = f"Status: success; {operation}"
 
+    cached = False
+
+    if result and cache and cache.claim_id == cid:
+        cached = cache_action(cache, result, action,
+                              comment={"comment_id": comment_id,
+                                       "claim_id": cid,
+                                       "parent_id": parent_id,
+                                       "comment": new_comment,
+                                       "channel_url": author_uri})
+
     output = {"result": result,
-              "status": text}
+              "status": text,
+              "cached": cached}
 
     return output
+
+
+def cache_action(cache, result, action="create", comment=None,
+                 save=True):
+    """Apply our own action on a comment to the cache of its claim.
+
+    This way the list can be updated without requesting
+    the thread again.
+    The `result` of the comment server is used if it has the comment,
+    otherwise the `comment` that was sent.
+    It returns `False` if the cache couldn't be updated.
+    """
+    if not isinstance(result, dict) or "comment_id" not in result:
+        result = {}
+
+    if action in ("abandon"):
+        cache.remove(result.get("comment_id", comment["comment_id"]))
+    elif action in ("edit"):
+        old = cache.get(result.get("comment_id", comment["comment_id"]))
+
+        if not old:
+            return False
+
+        old.update(result or {"comment": comment["comment"]})
+        cache.add(old)
+    elif action in ("create"):
+        if "comment_id" not in result:
+            return False
+
+        now = int(time.time())
+        author = comment["channel_url"] or "_Unknown_#000"
+        new = {"claim_id": comment["claim_id"],
+               "parent_id": comment["parent_id"],
+               "comment": comment["comment"],
+               "channel_url": "lbry://" + author,
+               "channel_name": author.split("#")[0],
+               "channel_id": "",
+               "timestamp": now,
+               "signing_ts": now}
+        new.update(result)
+        cache.add(new)
+
+    if save:
+        save_cache(cache)
+
+    return True
+
+
+def i_act_comments(targets,
+                   cache=None,
+                   action="abandon",
+                   new_comment="",
+                   author=None,
+                   threads=4,
+                   rate=2.0,
+                   wallet_id="default_wallet",
+                   comm_server="https://comments.odysee.com/api/v2",
+                   server="http://localhost:5279"):
+    """Perform the same action on many comments.
+
+    `targets` is a list of `(claim_id, comment_id)`;
+    with 'create' the same reply is written to every comment.
+    The comments are signed and sent with at most `threads` calls
+    in flight, and at most `rate` new calls per second,
+    so that the comment server doesn't refuse them.
+    The caches of the claims are updated at the end;
+    `cache` is the one that is open in the interface.
+
+    It doesn't use the interface, so it can run in a thread;
+    it returns the 'content' with the status of every comment,
+    the 'status' line, and 'cached', which is `True` if `cache`
+    was changed.
+    """
+    caches = {}
+
+    for claim_id, comment_id in targets:
+        if claim_id in caches:
+            continue
+
+        if cache and cache.claim_id == claim_id:
+            caches[claim_id] = cache
+        else:
+            other = cmc.CommentCache(claim_id)
+            caches[claim_id] = other if other.load() else None
+
+    def info(claim_id, comment_id):
+        claim_cache = caches[claim_id]
+        comment = claim_cache.get(comment_id) if claim_cache else None
+        return comment or {"comment_id": comment_id}
+
+    comments = [info(claim_id, comment_id)
+                for claim_id, comment_id in targets]
+
+    def act(index):
+        claim_id, comment_id = targets[index]
+        cmnt_in = {"claim": {"claim_id": claim_id},
+                   "new_comment": new_comment,
+                   "author": author,
+                   "comment_id": comment_id}
+
+        return i_act_comment(cmnt_in,
+                             action=action,
+                             cmnt_reply="reply",
+                             wallet_id=wallet_id,
+                             comm_server=comm_server,
+                             server=server)
+
+    limiter = thr.AdaptiveLimiter(initial=min(2, threads),
+                                  maximum=threads)
+    bucket = thr.TokenBucket(rate=rate, burst=1)
+    outputs = [None] * len(targets)
+
+    for index, _, output in thr.fan_out(act, range(len(targets)),
+                                        limiter=limiter, bucket=bucket):
+        outputs[index] = output
+
+    changed = set()
+    n_ok = 0
+    out = []
+
+    for num, (target, comment, output) in enumerate(zip(targets, comments,
+                                                        outputs),
+                                                    start=1):
+        claim_id, comment_id = target
+        ok = bool(output and output["result"])
+        n_ok += ok
+
+        if ok and caches[claim_id]:
+            sent = {"comment_id": comment_id,
+                    "claim_id": claim_id,
+                    "parent_id": comment_id,
+                    "comment": new_comment,
+                    "channel_url": author}
+
+            if cache_action(caches[claim_id], output["result"], action,
+                            comment=sent, save=False):
+                changed.add(claim_id)
+
+        ch_name = comment.get("channel_name", "_Unknown_")
+        text = (comment.get("comment", "").splitlines() or [""])[0]
+        ch_name = lbryt.sanitize_text(ch_name)
+        text = lbryt.sanitize_text(text)
+
+        if len(text) > 60:
+            text = f"{text:.60s}..."
+
+        status = "success" if ok else "failure"
+        out.append(f"{num:4d}/{len(targets):4d}; {status:7s}; "
+                   f'{ch_name:30s}; "{text}"; {comment_id}')
+
+    for claim_id in changed:
+        save_cache(caches[claim_id])
+
+    status = (f"Status: {action} on {len(targets)} comments; "
+              f"success: {n_ok}; failure: {len(targets) - n_ok}")
+
+    content = "\n".join([status, limiter.summary(), 80 * "-"] + out)
+
+    return {"content": content,
+            "status": status,
+            "cached": bool(cache) and cache.claim_id in changed}
+
+
+def i_channel_comments(channel,
+                       number=50,
+                       threads=8,
+                       limit=200,
+                       refresh=True,
+                       page_size=50,
+                       sanitize=True,
+                       cache=None,
+                       comm_server="https://comments.odysee.com/api/v2",
+                       server="http://localhost:5279"):
+    """Show the comments of the newest claims of a channel in one feed.
+
+    The claims come from the local index of the channel,
+    updated first unless `refresh=False`; if `number` is 0
+    all claims are used.
+    The comment threads of the claims are refreshed in parallel,
+    with at most `threads` claims at the same time,
+    and each thread is kept in its cache, so later refreshes
+    only request the newer comments.
+    The newest `limit` comments of all claims are merged by time.
+    If the claim of the open `cache` is in the feed, that cache is used,
+    so its file is not written by two caches.
+
+    It doesn't use the interface, so it can run in a thread.
+    """
+    if refresh:
+        index, stats = cix.update_index(channel, threads=threads,
+                                        server=server)
+    else:
+        index = cix.load_index(channel)
+
+    n_claims, window = cix.index_window(index, number=number)
+    claims = [claim for num, claim in window]
+
+    if not claims:
+        return {"content": f"No claims found for {channel}"}
+
+    def update(claim):
+        if cache and cache.claim_id == claim["claim_id"]:
+            current = cache
+        else:
+            current = cmc.CommentCache(claim["claim_id"],
+                                       name=(f"{claim['name']}#"
+                                             f"{claim['claim_id']}"))
+            current.load()
+
+        n_new = current.refresh(page_size=page_size,
+                                comm_server=comm_server)
+        save_cache(current)
+        return current, n_new
+
+    # A claim with a long thread takes longer without the server being
+    # slower, so the latency can't guide the limit; it is kept fixed
+    n_threads = min(threads, len(claims))
+    limiter = thr.AdaptiveLimiter(initial=n_threads, minimum=n_threads,
+                                  maximum=n_threads)
+    caches = {}
+
+    for _, claim, result in thr.fan_out(update, claims, limiter=limiter):
+        if result:
+            caches[claim["claim_id"]] = result
+
+    counts = []
+    feeds = []
+
+    for claim in claims:
+        if claim["claim_id"] not in caches:
+            counts.append((-1, 0, claim))
+            continue
+
+        cache, n_new = caches[claim["claim_id"]]
+        comments = cache.comments()
+        comments.sort(key=lambda comment: comment.get("timestamp", 0),
+                      reverse=True)
+        feeds.append([(comment, claim) for comment in comments[:limit]])
+        counts.append((len(comments), n_new, claim))
+
+    merged = heapq.merge(*feeds,
+                         key=lambda item: -item[0].get("timestamp", 0))
+    merged = list(item for _, item in zip(range(limit), merged))
+
+    n_comments = sum(count for count, _, _ in counts if count > 0)
+    n_new = sum(new for _, new, _ in counts)
+    n_failed = sum(1 for count, _, _ in counts if count < 0)
+
+    out = [f"Channel: {channel}; claims: {len(claims)}; "
+           f"comments: {n_comments}; new: {n_new}; "
+           f"failed claims: {n_failed}",
+           limiter.summary(),
+           80 * "-"]
+
+    counts.sort(key=lambda item: item[0], reverse=True)
+
+    for count, new, claim in counts:
+        if count == 0:
+            continue
+
+        name = lbryt.sanitize_text(claim["name"]) if sanitize \
+            else claim["name"]
+        n_text = "failed" if count < 0 else f"{count:5d} (new: {new})"
+        out.append(f"{n_text:18s}; {name}")
+
+    out.append(80 * "-")
+
+    for num, (comment, claim) in enumerate(merged, start=1):
+        cmt_time = time.strftime(funcs.TFMT,
+                                 time.gmtime(comment.get("timestamp", 0)))
+        author = comment.get("channel_name", "_Unknown_")
+        text = (comment.get("comment", "").splitlines() or [""])[0]
+        name = claim["name"]
+
+        if sanitize:
+            author = lbryt.sanitize_text(author)
+            text = lbryt.sanitize_text(text)
+            name = lbryt.sanitize_text(name)
+
+        if len(text) > 60:
+            text = f"{text:.60s}..."
+
+        out.append(f"{num:4d}/{len(merged):4d}; {cmt_time}; {author:30s}; "
+                   f'"{text}"; {name}')
+
+    return {"content": "\n".join(out)}
+
+
+def parse_day(text):
+    """Convert a date 'YYYY-MM-DD' in UTC to a Unix time, or `None`."""
+    if not text.strip():
+        return None
+
+    try:
+        return calendar.timegm(time.strptime(text.strip(), "%Y-%m-%d"))
+    except ValueError:
+        print(f"Invalid date, use YYYY-MM-DD: {text}")
+        return False
+
+
+def i_search_comments(text="", author="", since="", until="",
+                      limit=200, sanitize=True):
+    """Search the comments of all claims that were loaded before.
+
+    The search uses the local index, so it doesn't make requests.
+    `since` and `until` are dates 'YYYY-MM-DD', and `until`
+    is included.
+    """
+    start = parse_day(since)
+    end = parse_day(until)
+
+    if start is False or end is False:
+        return {"content": "Invalid date; use the format YYYY-MM-DD",
+                "comments": []}
+
+    if end:
+        end += 24 * 3600
+
+    t0 = time.perf_counter()
+    found, total = cmi.search(text=text, author=author,
+                              since=start, until=end, limit=limit)
+    elapsed = (time.perf_counter() - t0) * 1000
+
+    out = [f"Comments found: {total}; shown: {len(found)}; "
+           f"search time: {elapsed:.1f} ms",
+           80 * "-"]
+
+    for num, result in enumerate(found, start=1):
+        cmt_time = time.strftime(funcs.TFMT, time.gmtime(result["timestamp"]))
+        author_name = result["channel_name"] or "_Unknown_"
+        comment = (result["comment"].splitlines() or [""])[0]
+        claim_name = result["claim_name"] or result["claim_id"]
+
+        if sanitize:
+            author_name = lbryt.sanitize_text(author_name)
+            comment = lbryt.sanitize_text(comment)
+            claim_name = lbryt.sanitize_text(claim_name)
+
+        if len(comment) > 80:
+            comment = f"{comment:.80s}..."
+
+        out.append(f"{num:4d}/{total:4d}; {cmt_time}; {author_name:30s}; "
+                   f'"{comment}"; {claim_name}; {result["comment_id"]}')
+
+    return {"content": "\n".join(out),
+            "comments": [(result["claim_id"], result["comment_id"])
+                         for result in found]}
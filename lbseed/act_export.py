@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to export the listings of the interface to files.
+
+The listings are built again from the daemon, as flat records,
+instead of parsing the text that is shown in the textboxes.
+The peer listings are built from the searches that were shown,
+as searching the peers again would give different results.
+"""
+import hashlib
+import itertools
+
+import lbseed.channels as chs
+import lbseed.export as exp
+import lbseed.records as rec
+import lbseed.snapshots as snp
+import lbseed.throttle as thr
+from lbseed.daemon import iter_pages
+
+# Listings of peers: of claims, of a channel, of several channels,
+# and of the subscribed channels
+PEER_KINDS = ("claim_peers", "ch_peers", "chs_peers", "subs_peers")
+
+
+def rec_downloaded(channel=None, state=None,
+                   server="http://localhost:5279"):
+    """Records of the locally downloaded claims."""
+    if channel and not channel.startswith("@"):
+        channel = "@" + channel
+
+    for item, total in iter_pages("file_list", {}, page_size=100,
+                                  state=state,
+                                  server=server):
+        if channel and item.get("channel_name") != channel:
+            continue
+
+        yield rec.file_record(item)
+
+
+def rec_ch_claims(channel, number=0, state=None,
+                  server="http://localhost:5279"):
+    """Records of the claims of a channel, newest first."""
+    for claim, total in iter_pages("claim_search",
+                                   {"channel": channel,
+                                    "order_by": ["release_time"]},
+                                   limit=number,
+                                   state=state,
+                                   server=server):
+        yield rec.claim_record(claim)
+
+
+def rec_subs(number=4, shared=True, threads=32, rate=20, state=None,
+             server="http://localhost:5279"):
+    """Records of the latest claims of the subscribed channels."""
+    state = {} if state is None else state
+    subs = chs.get_ch_subs(shared=shared, server=server)
+
+    if not subs:
+        return
+
+    state["complete"] = True
+
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+    bucket = thr.TokenBucket(rate)
+    uris = [sub["uri"] for sub in subs]
+
+    def latest(uri):
+        return chs.ch_latest_claims(uri, number=number, server=server)
+
+    for num, uri, result in thr.fan_out(latest, uris,
+                                        limiter=limiter, bucket=bucket):
+        if not result or not result["valid"]:
+            state["complete"] = False
+            continue
+
+        for claim in result["claims"]:
+            record = rec.claim_record(claim)
+            record["subscription"] = uri
+            yield record
+
+
+def rec_supports(state=None, server="http://localhost:5279"):
+    """Records of our supports."""
+    for item, total in iter_pages("support_list", {}, state=state,
+                                  server=server):
+        yield rec.support_record(item)
+
+
+def rec_peers(results, state=None):
+    """Records of the peers shown in a peer listing.
+
+    `results` are the 'info' of the searches of the listing,
+    see `act_peers.stream_claims_peers`; claims that are not streams
+    are skipped, and failed searches make the listing incomplete.
+    """
+    if results is None:
+        return
+
+    failed = False
+
+    for info in results:
+        if info.get("failed"):
+            failed = True
+        elif info.get("stream"):
+            yield rec.peer_record(info)
+
+    if state is not None:
+        state["complete"] = not failed
+
+
+def rec_search(text="lbry", tags=None, claim_type=None, page=0,
+               state=None,
+               server="http://localhost:5279"):
+    """Records of the claims found by a search, up to 1000 claims."""
+    params = {"order_by": ["release_time"]}
+
+    if text:
+        params["text"] = text
+
+    if tags:
+        params["any_tags"] = [tag.strip() for tag in tags.split(",")]
+
+    if claim_type == "livestream":
+        params["claim_type"] = "stream"
+        params["has_no_source"] = True
+    elif claim_type:
+        params["claim_type"] = claim_type
+
+    claims = iter_pages("claim_search", params,
+                        limit=page * 50 if page > 0 else 1000,
+                        state=state,
+                        server=server)
+
+    if page > 0:
+        claims = itertools.islice(claims, (page - 1) * 50, None)
+
+    for claim, total in claims:
+        yield rec.claim_record(claim)
+
+
+def listing_records(kind,
+                    channel=None, number=0,
+                    shared=True, threads=32, rate=20,
+                    text="lbry", tags=None, claim_type=None, page=0,
+                    results=None, state=None,
+                    server="http://localhost:5279"):
+    """Get the records and the columns of a listing.
+
+    The `kind` is one of 'downloaded', 'ch_claims', 'subscriptions',
+    'supports', 'search', or one of the `PEER_KINDS`;
+    the peer listings take the `results` shown in their page.
+    If a `state` dictionary is given, its 'complete' key is set
+    to `True` once all the records were produced without an error.
+    """
+    if kind == "downloaded":
+        records = rec_downloaded(channel=channel, state=state,
+                                 server=server)
+        columns = rec.FILE_COLUMNS
+    elif kind == "ch_claims":
+        records = rec_ch_claims(channel, number=number, state=state,
+                                server=server)
+        columns = rec.CLAIM_COLUMNS
+    elif kind == "subscriptions":
+        records = rec_subs(number=max(number, 1), shared=shared,
+                           threads=threads, rate=rate, state=state,
+                           server=server)
+        columns = rec.SUB_COLUMNS
+    elif kind == "supports":
+        records = rec_supports(state=state, server=server)
+        columns = rec.SUPPORT_COLUMNS
+    elif kind in PEER_KINDS:
+        records = rec_peers(results, state=state)
+        columns = rec.PEER_COLUMNS
+    elif kind == "search":
+        records = rec_search(text=text, tags=tags, claim_type=claim_type,
+                             page=page, state=state,
+                             server=server)
+        columns = rec.CLAIM_COLUMNS
+    else:
+        print(f"Unknown listing: {kind}")
+        return None, None
+
+    return records, columns
+
+
+def listing_key(kind, channel=None, number=0, shared=True,
+                text="lbry", tags=None, claim_type=None, page=0,
+                **kwargs):
+    """Name that identifies the options of a listing, for its snapshots."""
+    if kind in ("downloaded", "ch_claims") + PEER_KINDS:
+        key = channel or "all"
+    elif kind == "subscriptions":
+        key = "shared" if shared else "local"
+    elif kind == "search":
+        key = f"{text}_{tags or ''}_{claim_type}_{page}"
+    else:
+        key = "all"
+
+    if kind in ("ch_claims", "subscriptions") + PEER_KINDS and number:
+        key += f"_{number}"
+
+    # Long lists of claims or channels are shortened with a hash
+    if len(key) > 80:
+        key = key[:40] + "_" + hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    return key
+
+
+def i_export(kind, path, fmt="csv", **kwargs):
+    """Export a listing to a file.
+
+    The options are those of `listing_records`.
+    It returns the number of rows written, or `False` on error.
+    """
+    records, columns = listing_records(kind, **kwargs)
+
+    if not columns:
+        return False
+
+    return exp.export_records(records, columns, path, fmt=fmt)
+
+
+def i_snapshot_diff(kind, keep=30, **kwargs):
+    """Save a snapshot of a listing and show the changes since the last one.
+
+    The options are those of `listing_records`.
+    If the listing can't be requested in full, nothing is saved,
+    so a failed request doesn't look like removed items.
+    """
+    state = {}
+    records, columns = listing_records(kind, state=state, **kwargs)
+
+    if not columns:
+        return "Unknown listing"
+
+    new = snp.build_snapshot(kind, records, columns)
+
+    if not state.get("complete"):
+        return ("The listing could not be requested in full; "
+                "the snapshot was not saved")
+
+    key = listing_key(kind, **kwargs)
+    old = snp.last_snapshot(kind, key)
+    snp.save_snapshot(new, key, keep=keep)
+
+    diff = snp.diff_snapshots(old, new) if old else None
+
+    return snp.diff_text(old, new, diff)
@@ -24,9 +24,20 @@
 # DEALINGS IN THE SOFTWARE.                                                   #
 # --------------------------------------------------------------------------- #
 """Methods to list claims with the interface."""
+import heapq
+import itertools
 import tempfile
+import time
 
 import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+import lbseed.ch_index as cix
+import lbseed.channels as chs
+import lbseed.controlling as ctrl
+import lbseed.daemon as dmn
+import lbseed.invalid as inv
+import lbseed.throttle as thr
 
 
 def i_list_d_claims(blocks=False, cid=False, blobs=True, size=True,
@@ -35,9 +46,21 @@ def i_list_d_claims(blocks=False, cid=False, blobs=True, size=True,
                     invalid=False,
                     reverse=False,
                     threads=32,
+                    hours=24,
                     sanitize=True,
                     server="http://localhost:5279"):
     """Print all downloaded claims to a temporary file and read that file."""
+    if invalid:
+        return i_list_d_invalid(blocks=blocks, cid=cid, blobs=blobs,
+                                size=size,
+                                show_channel=show_channel,
+                                show_out=show_out, channel=channel,
+                                reverse=reverse,
+                                threads=threads,
+                                hours=hours,
+                                sanitize=sanitize,
+                                server=server)
+
     if show_out in ("name"):
         name = True
         title = False
@@ -75,6 +98,39 @@ def i_list_d_claims(blocks=False, cid=False, blobs=True, size=True,
             "lines": lines}
 
 
+def i_list_d_invalid(blocks=False, cid=False, blobs=True, size=True,
+                     show_channel=False,
+                     show_out="name", channel=None,
+                     reverse=False,
+                     threads=32,
+                     hours=24,
+                     cached=False,
+                     sanitize=True,
+                     server="http://localhost:5279"):
+    """List the downloaded claims that can't be found online any more.
+
+    With `cached=True` the last result is shown without searching online.
+    """
+    if channel and not channel.startswith("@"):
+        channel = "@" + channel
+
+    if cached:
+        record = inv.load_record()
+    else:
+        record = inv.scan_invalid(channel=channel, hours=hours,
+                                  threads=threads,
+                                  server=server)
+
+    return inv.invalid_lines(record, channel=channel,
+                             blocks=blocks, cid=cid, blobs=blobs,
+                             size=size,
+                             show_channel=show_channel,
+                             show_out=show_out,
+                             reverse=reverse,
+                             sanitize=sanitize,
+                             sep=";")
+
+
 def i_list_ch_claims(channel,
                      number=0,
                      create=False, height=False, release=True,
@@ -84,35 +140,155 @@ def i_list_ch_claims(channel,
                      start=1, end=0,
                      reverse=False,
                      last_height=99_000_900,
+                     threads=32,
+                     refresh=True,
                      server="http://localhost:5279"):
-    """Print all or a certain number of claims for a specified channel."""
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        claims_info = \
-            lbryt.list_ch_claims(channel,
-                                 number=number,
-                                 create=create,
-                                 height=height,
-                                 release=release,
-                                 claim_id=claim_id,
-                                 typ=typ,
-                                 ch_name=ch_name,
-                                 sizes=sizes,
-                                 supports=supports,
-                                 fees=fees,
-                                 title=title,
-                                 sanitize=sanitize,
-                                 start=start, end=end,
-                                 reverse=reverse,
-                                 last_height=last_height,
-                                 file=fp.name, fdate=False, sep=";",
-                                 server=server)
-        fp.seek(0)
-        lines = fp.read()
+    """Print all or a certain number of claims for a specified channel.
 
-    summary = claims_info["summary"]
+    The claims are taken from the local index of the channel,
+    which is first updated with the claims above its last height,
+    unless `refresh=False`.
+    """
+    stats = None
+
+    if refresh:
+        index, stats = cix.update_index(channel, threads=threads,
+                                        server=server)
+    else:
+        index = cix.load_index(channel)
+
+    n_claims, window = cix.index_window(index, number=number,
+                                        start=start, end=end,
+                                        reverse=reverse,
+                                        last_height=last_height)
+
+    lines = []
+
+    for num, claim in window:
+        lines.append(cix.index_line(num, n_claims, claim,
+                                    create=create, height=height,
+                                    release=release,
+                                    claim_id=claim_id, typ=typ,
+                                    ch_name=ch_name,
+                                    sizes=sizes, supports=supports,
+                                    fees=fees,
+                                    title=title, sanitize=sanitize,
+                                    sep=";"))
+
+    summary = cix.index_summary(index, len(window), stats=stats, sep=";")
 
     return {"summary": summary,
-            "lines": lines}
+            "lines": "\n".join(lines)}
+
+
+def i_local_chs(text):
+    """Find the channels written in the text among the saved indices.
+
+    The channels are separated by commas.
+    It returns the names of the indices found,
+    and the channels that have no index.
+    """
+    channels = []
+    missing = []
+
+    for channel in text.split(","):
+        channel = channel.strip()
+
+        if not channel:
+            continue
+
+        found = cix.find_channel(channel)
+
+        if found:
+            channels.append(found)
+        else:
+            missing.append(channel)
+
+    return {"channels": channels,
+            "missing": missing}
+
+
+def i_list_chs_claims(channels,
+                      number=0,
+                      create=False, height=False, release=True,
+                      claim_id=False, typ=True,
+                      sizes=True, supports=False, fees=True,
+                      title=False, sanitize=True,
+                      start=1, end=0,
+                      reverse=False,
+                      threads=32,
+                      refresh=True,
+                      server="http://localhost:5279"):
+    """Print the claims of several channels merged by release time.
+
+    The indices of the channels are updated in parallel,
+    and the claims of each channel, already sorted, are merged.
+    The `number` of claims is taken from each channel,
+    and `start` and `end` apply to the merged list.
+    Every search of all channels, the pages of their claims
+    and the searches by ID, shares one limit of `threads`;
+    the channels themselves are walked all at once.
+    """
+    n_walks = min(threads, len(channels))
+    limiter = thr.AdaptiveLimiter(initial=n_walks, minimum=n_walks,
+                                  maximum=n_walks)
+    shared = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+
+    def update(channel):
+        if refresh:
+            return cix.update_index(channel, limiter=shared, server=server)
+        return cix.load_index(channel), None
+
+    indices = {}
+
+    for num, channel, result in thr.fan_out(update, channels,
+                                            limiter=limiter):
+        indices[channel] = result[0] if result else cix.load_index(channel)
+
+    windows = []
+    subtotals = []
+
+    for channel in channels:
+        index = indices[channel]
+        n_claims, window = cix.index_window(index, number=number)
+        claims = [claim for num, claim in window]
+        windows.append(claims)
+
+        size = sum(claim["size"] for claim in claims)
+        subtotals.append(f"{channel}: {len(claims)} claims; "
+                         f"size: {size / (1024**3):.4f} GB")
+
+    merged = list(heapq.merge(*windows,
+                              key=lambda claim: claim["release_time"]))
+    n_claims = len(merged)
+
+    numbered = list(enumerate(merged, start=1))
+    numbered = numbered[max(start - 1, 0):end if end > 0 else None]
+
+    if reverse:
+        numbered.reverse()
+
+    lines = []
+
+    for num, claim in numbered:
+        lines.append(cix.index_line(num, n_claims, claim,
+                                    create=create, height=height,
+                                    release=release,
+                                    claim_id=claim_id, typ=typ,
+                                    ch_name=True,
+                                    sizes=sizes, supports=supports,
+                                    fees=fees,
+                                    title=title, sanitize=sanitize,
+                                    sep=";"))
+
+    size = sum(claim["size"] for claim in merged)
+    summary = (f"Channels: {len(channels)}; "
+               f"claims: {n_claims}; shown: {len(numbered)}; "
+               f"total size: {size / (1024**3):.4f} GB\n")
+    summary += "\n".join(subtotals)
+
+    return {"summary": summary,
+            "lines": "\n".join(lines)}
 
 
 def i_list_ch_subs(action="subscriptions",
@@ -120,10 +296,18 @@ def i_list_ch_subs(action="subscriptions",
                    shared="shared",
                    show="show_all", filtering="valid",
                    notifications=True,
-                   threads=32,
+                   threads=32, rate=20,
                    claim_id=False, title=False,
                    server="http://localhost:5279"):
     """Print all subscribed channels to a temporary file and read that file."""
+    if action in ("latest_claims"):
+        return i_list_ch_subs_latest(number=number,
+                                     shared=shared, show=show,
+                                     threads=threads, rate=rate,
+                                     claim_id=claim_id, title=title,
+                                     sanitize=True,
+                                     server=server)
+
     if shared in ("shared"):
         database = True
     elif shared in ("local"):
@@ -140,65 +324,230 @@ def i_list_ch_subs(action="subscriptions",
         valid = False
 
     with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        if action in ("subscriptions"):
-            lbryt.list_ch_subs(shared=database,
-                               show_all=show_all, filtering="valid",
-                               valid=valid, notifications=True,
-                               threads=threads,
-                               claim_id=claim_id,
-                               file=fp.name, fdate=False, sep=";",
-                               server=server)
-        elif action in ("latest_claims"):
-            lbryt.list_ch_subs_latest(number=number, override=False,
-                                      claim_id=claim_id,
-                                      typ=True, title=title,
-                                      sanitize=True,
-                                      shared=database,
-                                      show_all=show_all, filtering="valid",
-                                      valid=valid, notifications=True,
-                                      threads=threads,
-                                      start=1, end=0,
-                                      file=fp.name, fdate=False, sep=";",
-                                      server=server)
+        lbryt.list_ch_subs(shared=database,
+                           show_all=show_all, filtering="valid",
+                           valid=valid, notifications=True,
+                           threads=threads,
+                           claim_id=claim_id,
+                           file=fp.name, fdate=False, sep=";",
+                           server=server)
         fp.seek(0)
         content = fp.read()
 
     return content
 
 
+def i_list_ch_subs_latest(number=4,
+                          shared="shared",
+                          show="show_all",
+                          threads=32, rate=20,
+                          claim_id=False, title=False,
+                          sanitize=True,
+                          server="http://localhost:5279"):
+    """Print the latest claims of all subscribed channels.
+
+    The channels are searched in parallel; the number of searches
+    in flight adapts to the response of the daemon up to `threads`,
+    and no more than `rate` searches start per second.
+    """
+    subscriptions = chs.get_ch_subs(shared=shared in ("shared"),
+                                    server=server)
+
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+    bucket = thr.TokenBucket(rate=rate)
+
+    def search(sub):
+        return chs.ch_latest_claims(sub["uri"], number=number,
+                                    server=server)
+
+    results = [None] * len(subscriptions)
+
+    for index, sub, result in thr.fan_out(search, subscriptions,
+                                          limiter=limiter, bucket=bucket):
+        if not result:
+            result = {"channel": sub["uri"], "valid": False, "claims": []}
+
+        results[index] = result
+
+    sep = ";"
+    out = []
+    n_subs = len(subscriptions)
+
+    for num, (sub, result) in enumerate(zip(subscriptions, results),
+                                        start=1):
+        if show in ("show_valid") and not result["valid"]:
+            continue
+        if show in ("show_invalid") and result["valid"]:
+            continue
+
+        channel = sub["uri"].split("lbry://")[-1]
+
+        if sanitize:
+            channel = lbryt.sanitize_text(channel)
+
+        if not result["valid"]:
+            channel = "[" + channel + "]"
+
+        out.append(f"Channel {num}/{n_subs}{sep} {channel}{sep} "
+                   f"notifications: {sub['notifications']}")
+
+        n_claims = len(result["claims"])
+
+        for k, claim in enumerate(result["claims"], start=1):
+            out.append("  " + chs.claim_line(k, n_claims, claim,
+                                             claim_id=claim_id,
+                                             typ=True, title=title,
+                                             sanitize=sanitize,
+                                             sep=sep))
+
+    out = [limiter.summary(sep=sep), 80 * "-"] + out
+
+    return "\n".join(out)
+
+
+def i_get_pub_chs(wallet_id="default_wallet",
+                  server="http://localhost:5279"):
+    """Get all created channels in the wallet, resolved."""
+    channels = []
+
+    for channel, total in dmn.iter_pages("channel_list",
+                                         {"wallet_id": wallet_id,
+                                          "resolve": True},
+                                         server=server):
+        channel.setdefault("canonical_url",
+                           channel.get("permanent_url",
+                                       "lbry://" + channel["name"]))
+        channels.append(channel)
+
+    return channels
+
+
+def pub_line(num, item,
+             updates=False, claim_id=False, addresses=False,
+             accounts=False, typ=False, amounts=True,
+             title=False, sanitize=True, sep=";"):
+    """Build a single line of information for a created claim."""
+    out = f"{num:4d}{sep} "
+
+    if updates:
+        stamp = time.strftime(funcs.TFMT,
+                              time.gmtime(item.get("timestamp") or 0))
+        out += f"{stamp}{sep} "
+
+    if claim_id:
+        out += f"{item['claim_id']}{sep} "
+
+    if addresses:
+        out += f"{item.get('address', ''):34s}{sep} "
+
+    if accounts:
+        out += f"{item.get('account', ''):34s}{sep} "
+
+    if typ:
+        out += f"{chs.claim_type(item):20s}{sep} "
+
+    if amounts:
+        base = float(item.get("amount", 0))
+        out += f"{base:14.8f}{sep} "
+
+        if "meta" in item and "effective_amount" in item["meta"]:
+            total_amount = float(item["meta"]["effective_amount"])
+            out += f"{total_amount:14.8f}{sep} "
+
+    if title:
+        name = item.get("value", {}).get("title", item["name"])
+    else:
+        name = item["name"]
+
+    if "meta" in item and "claims_in_channel" in item["meta"]:
+        name += f"{sep} claims: {item['meta']['claims_in_channel']}"
+
+    if sanitize:
+        name = lbryt.sanitize_text(name)
+
+    return out + name
+
+
+def _walk_pub(method, params, number=0, reverse=True, keep=None,
+              server="http://localhost:5279"):
+    """Walk the pages of claims, newest first, or oldest first.
+
+    If `keep` is given only the claims for which it is true are used,
+    and as we don't know how many there are, the total is `None`.
+    If `number` is larger than 0 only the newest claims are used,
+    so oldest first they are collected before they are reversed;
+    otherwise the pages are requested from the last one.
+    """
+    if reverse or number > 0:
+        items = dmn.iter_pages(method, params,
+                               limit=0 if keep else number,
+                               server=server)
+    else:
+        items = dmn.iter_pages_reversed(method, params, server=server)
+
+    if keep:
+        items = ((item, None) for item, total in items if keep(item))
+
+        if number > 0:
+            items = itertools.islice(items, number)
+
+    if reverse or number <= 0:
+        yield from items
+    else:
+        yield from reversed(list(items))
+
+
 def i_list_pub_chs(wallet_id="default_wallet", is_spent=False,
                    updates=False, claim_id=False, addresses=True,
                    accounts=False, amounts=True,
                    reverse=False,
+                   number=0,
                    server="http://localhost:5279"):
-    """Print all created channels in the wallet."""
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        output = lbryt.list_channels(wallet_id=wallet_id,
-                                     is_spent=is_spent,
-                                     updates=updates, claim_id=claim_id,
-                                     addresses=addresses,
-                                     accounts=accounts, amounts=amounts,
-                                     reverse=reverse, sanitize=True,
-                                     file=fp.name, fdate=False, sep=";",
-                                     server=server)
-        fp.seek(0)
-        content = fp.read()
-
-    n_claims = output["summary"]["n_claims"]
-    t_base_amount = output["summary"]["base_amount"]
-    total_amount = output["summary"]["total_amount"]
-
-    out = [f"Total claims in channels: {n_claims}",
-           f"Total base stake on all channels: {t_base_amount:14.8f}",
-           f"Total stake on all channels:      {total_amount:14.8f}",
-           80 * "-"]
-    summary = "\n".join(out)
+    """Yield the created channels in the wallet, one line at a time.
 
-    output = {"summary": summary,
-              "content": content,
-              "channels": output["channels"]}
-
-    return output
+    The pages are requested from the daemon as they are needed,
+    so the first lines arrive before the whole list is known.
+    Each element contains the line and the summary up to that line.
+    If `number` is larger than 0 only the newest channels are shown.
+    """
+    params = {"wallet_id": wallet_id,
+              "is_spent": is_spent,
+              "resolve": amounts}
+
+    n_claims = 0
+    t_base_amount = 0
+    total_amount = 0
+
+    for num, (channel, total) in enumerate(_walk_pub("channel_list", params,
+                                                     number=number,
+                                                     reverse=reverse,
+                                                     server=server),
+                                           start=1):
+        total = total or num
+
+        if number > 0:
+            total = min(total, number)
+
+        meta = channel.get("meta", {})
+        n_claims += int(meta.get("claims_in_channel", 0))
+        t_base_amount += float(channel.get("amount", 0))
+        total_amount += float(meta.get("effective_amount",
+                                       channel.get("amount", 0)))
+
+        summary = (f"Channels: {num}/{total}; "
+                   f"total claims in channels: {n_claims}; "
+                   f"base stake: {t_base_amount:.8f}; "
+                   f"total stake: {total_amount:.8f}")
+
+        line = pub_line(num, channel,
+                        updates=updates, claim_id=claim_id,
+                        addresses=addresses, accounts=accounts,
+                        typ=False, amounts=amounts,
+                        title=False, sanitize=True)
+
+        yield {"line": line,
+               "summary": summary,
+               "claim": channel}
 
 
 def i_list_pub_claims(wallet_id="default_wallet", is_spent=False,
@@ -207,84 +556,76 @@ def i_list_pub_claims(wallet_id="default_wallet", is_spent=False,
                       typ=False, amounts=True,
                       title=False,
                       reverse=False,
+                      number=0,
                       server="http://localhost:5279"):
-    """Print created claims in the wallet."""
-    if select in ("All", "Anonymous"):
-        if select in "All":
-            channel = None
-            channel_id = None
-            anon = False
-        elif select in "Anonymous":
-            channel = None
-            channel_id = None
-            anon = True
-    else:
-        channel = select
-        channel_id = None
-        anon = False
+    """Yield the created claims in the wallet, one line at a time.
 
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        output = lbryt.list_claims(wallet_id=wallet_id,
-                                   is_spent=is_spent,
-                                   channel=channel, channel_id=channel_id,
-                                   anon=anon,
-                                   updates=updates, claim_id=claim_id,
-                                   addresses=addresses,
-                                   typ=typ, amounts=amounts, ch_name=False,
-                                   title=title,
-                                   reverse=reverse, sanitize=True,
-                                   file=fp.name, fdate=False, sep=";",
-                                   server=server)
-        fp.seek(0)
-        content = fp.read()
+    The pages are requested from the daemon as they are needed,
+    so the first lines arrive before the whole list is known.
+    Each element contains the line and the summary up to that line.
+    If `number` is larger than 0 only the newest claims are shown.
+    """
+    params = {"wallet_id": wallet_id,
+              "is_spent": is_spent,
+              "resolve": amounts,
+              "claim_type": ["stream", "repost", "collection"]}
 
-    n_chs = output["summary"]["n_channels"]
-    t_n_claims = output["summary"]["n_ch_claims"]
-    t_GB = output["summary"]["chs_size"]
-    t_hr = output["summary"]["chs_hr"]
-    t_mi = output["summary"]["chs_min"]
-    t_sec = output["summary"]["chs_sec"]
-    t_days = output["summary"]["chs_days"]
-    t_n_anon_claims = output["summary"]["n_anon_claims"]
-    t_anon_GB = output["summary"]["anon_size"]
-    t_anon_hr = output["summary"]["anon_hr"]
-    t_anon_mi = output["summary"]["anon_min"]
-    t_anon_sec = output["summary"]["anon_sec"]
-    t_anon_days = output["summary"]["anon_days"]
-
-    out1 = [f"Total unique channels: {n_chs}",
-            f"Total claims in channels: {t_n_claims}",
-            f"Total download size: {t_GB:.4f} GiB",
-            f"Total duration: {t_hr} h {t_mi} min {t_sec} s, "
-            f"or {t_days:.4f} days"]
-
-    out2 = [f"Anonymous unique claims: {t_n_anon_claims}",
-            f"Total download size of anonymous claims: {t_anon_GB:.4f} GiB",
-            "Total duration of anonymous claims: "
-            f"{t_anon_hr} h {t_anon_mi} min {t_anon_sec} s, "
-            f"or {t_anon_days:.4f} days"]
+    anon = select == "Anonymous"
+    ch_name = None
 
-    out = []
+    if select and select not in ("All", "Anonymous"):
+        ch_name, _, ch_id = select.replace(":", "#").partition("#")
 
-    if t_n_claims > 0:
-        out += out1
+    def in_selection(claim):
+        signing = claim.get("signing_channel")
 
-        if t_n_anon_claims > 0:
-            out += [40 * "-"]
+        if anon:
+            return not signing
+        if ch_name:
+            return (signing is not None
+                    and signing.get("name") == ch_name
+                    and signing.get("claim_id", "").startswith(ch_id))
+        return True
 
-    if t_n_anon_claims > 0:
-        out += out2
+    claims = _walk_pub("claim_list", params,
+                       number=number,
+                       reverse=reverse,
+                       keep=in_selection if anon or ch_name else None,
+                       server=server)
 
-    if out:
-        out += [80 * "-"]
+    t_size = 0
+    t_duration = 0
 
-    summary = "\n".join(out)
+    for num, (claim, total) in enumerate(claims, start=1):
+        if total and number > 0:
+            total = min(total, number)
 
-    output = {"summary": summary,
-              "content": content,
-              "ch_claims": output["ch_claims"]}
+        value = claim.get("value", {})
+        t_size += int(value.get("source", {}).get("size", 0))
+        t_duration += int(value.get("video", {}).get("duration", 0)
+                          or value.get("audio", {}).get("duration", 0))
 
-    return output
+        t_GB = t_size / (1024**3)
+        hrs, rest = divmod(t_duration, 3600)
+        mins, secs = divmod(rest, 60)
+        days = t_duration / (24 * 3600)
+
+        counter = f"{num}/{total}" if total else f"{num}"
+
+        summary = (f"Claims: {counter}; "
+                   f"size: {t_GB:.4f} GiB; "
+                   f"duration: {hrs} h {mins} min {secs} s, "
+                   f"or {days:.4f} days")
+
+        line = pub_line(num, claim,
+                        updates=updates, claim_id=claim_id,
+                        addresses=addresses, accounts=False,
+                        typ=typ, amounts=amounts,
+                        title=title, sanitize=True)
+
+        yield {"line": line,
+               "summary": summary,
+               "claim": claim}
 
 
 def i_ctrl_claims(show_contr=False,
@@ -296,24 +637,42 @@ def i_ctrl_claims(show_contr=False,
                   show_competing=True,
                   show_reposts=True,
                   compact=False,
+                  full=False,
+                  threads=32,
                   server="http://localhost:5279"):
     """List the claims that we have and share a name with others.
 
     See if we have the controlling claim with the highest bid.
+    The competition for each name is stored locally, so only the names
+    whose claims or supports changed are searched again,
+    unless `full` is `True`.
     """
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        lbryt.claims_bids(show_controlling=show_contr,
-                          show_non_controlling=show_non_contr,
-                          skip_repost=skip_repost,
-                          channels_only=channels_only,
-                          show_claim_id=show_claim_id,
-                          show_repost_status=show_repost_st,
-                          show_competing=show_competing,
-                          show_reposts=show_reposts,
-                          compact=compact,
-                          file=fp.name, fdate=False, sep=";",
-                          server=server)
-        fp.seek(0)
-        content = fp.read()
+    output = ctrl.update_competition(full=full, threads=threads,
+                                     server=server)
 
-    return content
+    lines = ctrl.claim_bid_lines(output["claims"], output["names"],
+                                 show_controlling=show_contr,
+                                 show_non_controlling=show_non_contr,
+                                 skip_repost=skip_repost,
+                                 channels_only=channels_only,
+                                 show_claim_id=show_claim_id,
+                                 show_repost_status=show_repost_st,
+                                 show_competing=show_competing,
+                                 show_reposts=show_reposts,
+                                 compact=compact)
+
+    n_changes = len(output["changes"]["lines"])
+
+    summary = (f"Names: {len(output['names'])}; "
+               f"searched again: {output['n_searched']}; "
+               f"changes since last run: {n_changes}")
+
+    if not lines:
+        lines = ["No claims found"]
+
+    return "\n".join([summary, 80 * "-"] + lines)
+
+
+def i_ctrl_changes():
+    """Show what changed in the competition for our names in the last run."""
+    return ctrl.changes_text(ctrl.stored_changes())
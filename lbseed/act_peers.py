@@ -23,10 +23,185 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
 # DEALINGS IN THE SOFTWARE.                                                   #
 # --------------------------------------------------------------------------- #
-"""Methods to find peers for claims with the interface."""
-import tempfile
+"""Methods to find peers for claims with the interface.
+
+The peers are searched with `lbseed.peers`, so the results
+are shared by all pages through the peer cache.
+"""
+import os
+import time
 
 import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+import lbseed.blob_index as bix
+import lbseed.channels as chs
+import lbseed.monitor as mon
+import lbseed.peer_history as phs
+import lbseed.peers as prs
+import lbseed.sampling as smp
+import lbseed.seeding as sdg
+import lbseed.throttle as thr
+
+
+def set_peer_cache(minutes=30, size=5000):
+    """Configure the time to keep peer results, and their maximum number."""
+    prs.CACHE.configure(ttl=minutes * 60, size=size)
+
+
+def search_claims(claims, threads=32, limiter=None,
+                  timeout=prs.TIMEOUT,
+                  server="http://localhost:5279"):
+    """Search the peers of the claims in parallel.
+
+    It is a generator that yields `(index, info)` for each claim
+    as soon as its search finishes.
+    The searches in flight are controlled by the `limiter`,
+    which adapts to the latency and to the searches that time out;
+    if it is not given, one with a maximum of `threads` is used.
+    """
+    if not limiter:
+        limiter = thr.AdaptiveLimiter(initial=min(4, threads),
+                                      maximum=threads)
+
+    def search(claim):
+        return prs.claim_peers(claim, timeout=timeout, server=server)
+
+    for num, claim, info in thr.fan_out(search, claims, limiter=limiter):
+        yield num, info or {"claim": claim,
+                            "stream": True,
+                            "failed": True}
+
+
+def peer_line(num, n_claims, info,
+              claim_id=False, typ=True, title=False,
+              pars=False, sanitize=True, sep=";"):
+    """Build the information of the peers of a single claim."""
+    claim = info["claim"]
+    rels_time = time.strftime(funcs.TFMT,
+                              time.gmtime(chs.claim_time(claim)))
+
+    if title:
+        name = claim.get("value", {}).get("title", claim["name"])
+    else:
+        name = claim["name"]
+
+    if sanitize:
+        name = lbryt.sanitize_text(name)
+
+    if not info.get("stream"):
+        peers = "not a stream"
+        local = ""
+    elif info.get("failed"):
+        peers = "search failed"
+        local = ""
+    else:
+        peers = f"peers: {info['n_peers']:3d}"
+        local = "local: yes" if info.get("local") else "local: no "
+
+    if pars:
+        out = [f'{num:4d}/{n_claims:4d}{sep} "{name}"',
+               f"      release: {rels_time}"]
+        if claim_id:
+            out.append(f"      claim_id: {claim['claim_id']}")
+        if typ:
+            out.append(f"      type: {chs.claim_type(claim)}")
+        out.append(f"      {peers}{sep} {local}".rstrip("; "))
+        return "\n".join(out)
+
+    out = f"{num:4d}/{n_claims:4d}{sep} {rels_time}{sep} "
+
+    if claim_id:
+        out += f"{claim['claim_id']}{sep} "
+
+    if typ:
+        out += f"{chs.claim_type(claim):20s}{sep} "
+
+    out += f"{peers}{sep} "
+
+    if local:
+        out += f"{local}{sep} "
+
+    return out + f'"{name}"'
+
+
+def stats_text(stats, searched=None, total=None, sep=";"):
+    """Summary of the peer searches of several streams."""
+    streams = stats["streams"]
+    ratio = stats["with_peers"] / streams * 100 if streams else 0.0
+    average = stats["peers"] / streams if streams else 0.0
+
+    out = ""
+
+    if total is not None:
+        out = f"Searched: {searched}/{total}{sep} "
+
+    out += (f"Streams: {streams}{sep} "
+            f"with peers: {stats['with_peers']} ({ratio:.1f}%){sep} "
+            f"without peers: {stats['no_peers']}")
+
+    if stats["failed"]:
+        out += f"{sep} failed: {stats['failed']}"
+
+    return (out + "\n"
+            f"Total peers: {stats['peers']}{sep} "
+            f"average: {average:.2f} peers per stream{sep} "
+            f"streams in local node: {stats['local']}\n"
+            f"Search time: {stats['search_time']:.2f} s{sep} "
+            f"results from cache: {stats['cached']}")
+
+
+def ch_line(num, n_channels, channel, stats, total=None, sep=";"):
+    """Build the peer information of a single channel.
+
+    If only a sample of its streams was searched,
+    `total` is the number of streams it was taken from.
+    """
+    if stats is None:
+        return (f"{num:4d}/{n_channels:4d}{sep} [{channel}]{sep} "
+                "not found")
+
+    streams = stats["streams"]
+    average = stats["peers"] / streams if streams else 0.0
+
+    of = f"/{total:3d}" if total is not None else ""
+
+    return (f"{num:4d}/{n_channels:4d}{sep} {channel}{sep} "
+            f"streams: {streams:3d}{of}{sep} "
+            f"no peers: {stats['no_peers']:3d}{sep} "
+            f"peers: {stats['peers']:4d}{sep} "
+            f"average: {average:6.2f}{sep} "
+            f"local: {stats['local']:3d}")
+
+
+def stream_claims_peers(claims, threads=32,
+                        claim_id=False, typ=True, title=False,
+                        pars=False, sanitize=True,
+                        server="http://localhost:5279"):
+    """Search the peers of the claims, yielding each result as it is found.
+
+    Each row has the 'line' of the claim, and the 'summary'
+    of all the claims searched so far, including the number
+    of searches in flight chosen by the limiter and the throughput.
+    The 'info' of the search is included, so the listing
+    can be exported later without searching again.
+    """
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+    stats = prs.new_stats()
+    n_claims = len(claims)
+
+    for searched, (num, info) in enumerate(search_claims(claims,
+                                                         limiter=limiter,
+                                                         server=server),
+                                           start=1):
+        prs.add_stats(stats, info)
+
+        yield {"line": peer_line(num + 1, n_claims, info,
+                                 claim_id=claim_id, typ=typ, title=title,
+                                 pars=pars, sanitize=sanitize),
+               "summary": (stats_text(stats, searched, n_claims) + "\n"
+                           + limiter.summary()),
+               "info": info}
 
 
 def i_list_m_peers(resolved_claims,
@@ -34,8 +209,8 @@ def i_list_m_peers(resolved_claims,
                    claim_id=False, typ=True, title=False,
                    pars=False, sanitize=True,
                    server="http://localhost:5279"):
-    """Print peers for claims into a temporary file and read that file."""
-    in_claims = []
+    """Search the peers of several claims, yielding rows as they finish."""
+    claims = []
 
     n_claims = len(resolved_claims)
 
@@ -45,11 +220,9 @@ def i_list_m_peers(resolved_claims,
 
         if not claim:
             info = claim_input[:]
-            in_claims.append({"resolved": False,
-                              "original": info})
         else:
             info = claim["canonical_url"]
-            in_claims.append(claim)
+            claims.append(claim)
 
         print(f"Claim {num}/{n_claims}, {info}")
 
@@ -58,56 +231,196 @@ def i_list_m_peers(resolved_claims,
 
         print()
 
-    if not in_claims:
-        return {"summary": "Invalid list of claims",
-                "lines": "At least one claim must exist"}
+    if not claims:
+        yield {"line": "At least one claim must exist",
+               "summary": "Invalid list of claims"}
+        return
 
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        peers_info = lbryt.list_m_peers(claims=in_claims,
-                                        resolve=False,
-                                        threads=threads, inline=not pars,
-                                        print_msg=False,
-                                        claim_id=claim_id, typ=typ,
-                                        title=title,
-                                        sanitize=sanitize,
-                                        file=fp.name, fdate=False, sep=";",
-                                        server=server)
-        fp.seek(0)
-        lines = fp.read()
-
-    summary = peers_info["summary"]
-
-    return {"summary": summary,
-            "lines": lines}
+    yield from stream_claims_peers(claims, threads=threads,
+                                   claim_id=claim_id, typ=typ, title=title,
+                                   pars=pars, sanitize=sanitize,
+                                   server=server)
 
 
 def i_list_ch_peers(channel, number=2, threads=32,
                     claim_id=False, typ=True, title=False,
                     pars=False, sanitize=True,
                     server="http://localhost:5279"):
-    """Print peers for claims into a temporary file and read that file."""
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        peers_info = lbryt.list_ch_peers(channel=channel, number=number,
-                                         threads=threads, inline=not pars,
-                                         print_msg=False,
-                                         claim_id=claim_id, typ=typ,
-                                         title=title,
-                                         sanitize=sanitize,
-                                         file=fp.name, fdate=False, sep=";",
-                                         server=server)
-        fp.seek(0)
-        lines = fp.read()
-
-    summary = peers_info["summary"]
-
-    return {"summary": summary,
-            "lines": lines}
-
-
-def i_list_chs_peers(resolved_chs,
-                     ch_threads=8, cl_threads=32,
+    """Search the peers of the newest streams of a channel.
+
+    It is a generator of rows, as `stream_claims_peers`.
+    """
+    claims = prs.ch_streams(channel, number=number, server=server)
+
+    if not claims:
+        return
+
+    yield from stream_claims_peers(claims, threads=threads,
+                                   claim_id=claim_id, typ=typ, title=title,
+                                   pars=pars, sanitize=sanitize,
+                                   server=server)
+
+
+def estimate_text(sizes, values, sample, sep=";"):
+    """Estimates of all streams from the peers of a stratified sample."""
+    strata = list(zip(sizes, values))
+    total = sum(size for size, vals in strata if vals)
+
+    coverage = smp.stratified_estimate([(size, [1 if v else 0
+                                                for v in vals])
+                                        for size, vals in strata])
+    average = smp.stratified_estimate(strata)
+
+    if not coverage:
+        return f"Sample of {sample} streams per channel{sep} no results yet"
+
+    if coverage[1] is None:
+        c_error = a_error = " (no interval from a single stream)"
+    else:
+        c_error = f" +/- {coverage[1] * 100:.1f}%"
+        a_error = f" +/- {average[1]:.2f}"
+
+    return (f"Sample of {sample} streams per channel, "
+            f"estimates for {total} streams: "
+            f"coverage {coverage[0] * 100:.1f}%{c_error}{sep} "
+            f"average {average[0]:.2f}{a_error} peers"
+            f"{sep} without peers: "
+            f"{round((1 - coverage[0]) * total)}")
+
+
+def stream_chs_peers(channels, threads=32,
+                     valid_only=False, invalid_only=False, record=False,
+                     sample=0, seed=None, sep=";",
+                     server="http://localhost:5279"):
+    """Search the peers of the newest streams of several channels.
+
+    Each channel is a pair `[channel, number]`; a `number` of `None`
+    marks a channel that could not be resolved, which is listed
+    as not found without searching it.
+    First the streams of all channels are found, and then the peers
+    of all streams are searched together, so the summary is updated
+    after every stream, and the line of a channel is yielded
+    as soon as all its streams are searched.
+    Rows without a 'line' only update the 'summary'.
+    The rows of each stream include the 'info' of its search.
+
+    A single limiter controls the requests in flight in both steps,
+    so `threads` is the total budget of requests, not a number
+    per channel; the limiter lowers the concurrency when the searches
+    become slow or time out, and the summary shows the level it chose
+    and the throughput reached.
+
+    With `valid_only` only the channels that were found are listed,
+    and with `invalid_only` only those that were not found.
+
+    If `record` is `True` the peers of every stream are added
+    to the history of peers at the end, see `peer_history`.
+
+    If `sample` is larger than 0 only that many streams, chosen
+    at random, are searched in each channel, and the summary shows
+    the coverage and the average peers of all streams estimated
+    from the sample, with 95% confidence intervals.
+    """
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+
+    def streams(item):
+        if item[1] is None:
+            return False
+        return prs.ch_streams(item[0], number=item[1], server=server)
+
+    ch_claims = [None] * len(channels)
+
+    for num, item, claims in thr.fan_out(streams, channels,
+                                         limiter=limiter):
+        ch_claims[num] = claims if claims is not False else None
+
+    if valid_only or invalid_only:
+        kept = [(ch, claims) for ch, claims in zip(channels, ch_claims)
+                if (claims is not None) == valid_only]
+        channels = [ch for ch, claims in kept]
+        ch_claims = [claims for ch, claims in kept]
+
+    sizes = [len(claims) if claims else 0 for claims in ch_claims]
+
+    if sample > 0:
+        ch_claims = [claims if claims is None else chosen
+                     for claims, chosen in
+                     zip(ch_claims,
+                         smp.stratified_sample((claims or []
+                                                for claims in ch_claims),
+                                               sample, seed=seed))]
+
+    n_channels = len(channels)
+    found = sum(1 for claims in ch_claims if claims is not None)
+    pending = [len(claims) if claims is not None else 0
+               for claims in ch_claims]
+    ch_stats = [prs.new_stats() for channel in channels]
+    ch_values = [[] for channel in channels]
+    stats = prs.new_stats()
+    n_done = [0]
+
+    items = [(n, claim) for n, claims in enumerate(ch_claims)
+             if claims for claim in claims]
+
+    def summary(searched):
+        out = (f"Channels: {n_channels}{sep} found: {found}{sep} "
+               f"completed: {n_done[0]}\n"
+               + stats_text(stats, searched, len(items), sep=sep) + "\n")
+
+        if sample > 0:
+            out += estimate_text(sizes, ch_values, sample, sep=sep) + "\n"
+
+        return out + limiter.summary(sep=sep)
+
+    for n, claims in enumerate(ch_claims):
+        if not pending[n]:
+            n_done[0] += 1
+            yield {"line": ch_line(n + 1, n_channels, channels[n][0],
+                                   None if claims is None else ch_stats[n],
+                                   sep=sep),
+                   "summary": summary(0)}
+
+    claims = [claim for n, claim in items]
+    samples = []
+
+    for searched, (num, info) in enumerate(search_claims(claims,
+                                                         limiter=limiter,
+                                                         server=server),
+                                           start=1):
+        n = items[num][0]
+        samples.append((channels[n][0], info))
+
+        if info.get("stream") and not info.get("failed"):
+            ch_values[n].append(info["n_peers"])
+        prs.add_stats(stats, info)
+        prs.add_stats(ch_stats[n], info)
+        pending[n] -= 1
+
+        line = None
+
+        if not pending[n]:
+            n_done[0] += 1
+            line = ch_line(n + 1, n_channels, channels[n][0], ch_stats[n],
+                           total=sizes[n] if sample > 0 else None,
+                           sep=sep)
+
+        yield {"line": line,
+               "summary": summary(searched),
+               "info": info}
+
+    if record:
+        n_samples = phs.record_samples(samples)
+        yield {"line": None,
+               "summary": (summary(len(items)) + "\n"
+                           + f"Peer samples recorded: {n_samples}")}
+
+
+def i_list_chs_peers(resolved_chs, threads=32,
                      server="http://localhost:5279"):
-    """Print peers for claims into a temporary file and read that file."""
+    """Search the peers of the newest streams of several channels.
+
+    It is a generator of rows, as `stream_chs_peers`.
+    """
     in_channels = []
 
     n_channels = len(resolved_chs)
@@ -130,74 +443,132 @@ def i_list_chs_peers(resolved_chs,
 
         if not claim:
             print("Not a valid channel, no peers will be found")
-            channel = "[" + claim_input + "]"
+            in_channels.append([claim_input, None])
+            continue
 
-        in_channels.append([channel, number])
+        in_channels.append([channel, number or 2])
 
     if not in_channels:
-        return {"summary": "Invalid list of channels",
-                "lines": "At least one channel must exist"}
-
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        ch_peers_info = lbryt.list_chs_peers(channels=in_channels,
-                                             number=None, shuffle=False,
-                                             ch_threads=ch_threads,
-                                             claim_threads=cl_threads,
-                                             file=fp.name, fdate=False,
-                                             sep=";",
-                                             server=server)
-        fp.seek(0)
-        lines = fp.read()
-
-        summary = ch_peers_info["summary"]
+        yield {"line": "At least one channel must exist",
+               "summary": "Invalid list of channels"}
+        return
 
-    return {"summary": summary,
-            "lines": lines}
+    yield from stream_chs_peers(in_channels, threads=threads,
+                                server=server)
 
 
 def i_list_subs_peers(number=2,
                       shared="shared", show="show_all",
-                      ch_thrs=32, c_thrs=16,
+                      threads=32, record=False, sample=0,
                       server="http://localhost:5279"):
-    """Print peers for claims from subscribed channels."""
-    if shared in ("shared"):
-        database = True
-    elif shared in ("local"):
-        database = False
-
-    if show in ("show_valid"):
-        valid = True
-    elif show in ("show_all"):
-        valid = False
-
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        ch_peers_info = lbryt.list_ch_subs_peers(number=number, shuffle=False,
-                                                 start=1, end=0,
-                                                 shared=database, valid=valid,
-                                                 ch_threads=ch_thrs,
-                                                 claim_threads=c_thrs,
-                                                 file=fp.name, fdate=False,
-                                                 sep=";",
-                                                 server=server)
-        fp.seek(0)
-        lines = fp.read()
-
-        summary = ch_peers_info["summary"]
-
-    return {"summary": summary,
-            "lines": lines}
-
-
-def i_seeding_ratio(frame=None, plot_hst_var=True,
-                    server="http://localhost:5279"):
-    """List seeding ratio estimate."""
-    with tempfile.NamedTemporaryFile(mode="w+") as fp:
-        lbryt.print_blobs_ratio(data_dir=None,
-                                plot_hst=plot_hst_var,
-                                file=fp.name, fdate=False, sep=";",
-                                tk_frame=frame,
+    """Search the peers of the newest streams of the subscribed channels.
+
+    If `sample` is larger than 0, only that many of the `number`
+    newest streams of each channel are searched, chosen at random,
+    and the totals of all of them are estimated.
+    It is a generator of rows, as `stream_chs_peers`.
+    """
+    subscriptions = chs.get_ch_subs(shared=shared == "shared",
+                                    server=server)
+
+    in_channels = [[sub["uri"], number] for sub in subscriptions]
+
+    yield from stream_chs_peers(in_channels, threads=threads,
+                                valid_only=show == "show_valid",
+                                invalid_only=show == "show_invalid",
+                                record=record, sample=sample,
                                 server=server)
-        fp.seek(0)
-        content = fp.read()
 
-    return content
+
+def i_peer_trends(days=7, top=50):
+    """Show the trends of the peers recorded in the last days."""
+    try:
+        import lbseed.peer_trends as ptr
+    except ImportError:
+        return "The trends of the peers require the 'numpy' library"
+
+    return ptr.trends_text(days=days, top=top)
+
+
+def i_start_monitor(server="http://localhost:5279"):
+    """Start following the log of the daemon to count live activity.
+
+    It returns the running `LogMonitor`, or `False`
+    if the data directory of the daemon is not found.
+    """
+    data_dir = sdg.daemon_data_dir(server=server)
+
+    if not data_dir:
+        print("The data directory of the daemon could not be found")
+        return False
+
+    monitor = mon.LogMonitor(data_dir)
+    monitor.start()
+    return monitor
+
+
+def i_seeding_ratio(plot_hst_var=True,
+                    bucket="day", number=30, claims=False, points=200,
+                    server="http://localhost:5279"):
+    """List seeding ratio estimate.
+
+    Only the lines added to the logs since the last time are parsed,
+    and the ratio is computed from the stored events.
+    With `numpy` the totals of the last `number` buckets
+    (hours or days) are shown, and the data to plot them
+    is computed with at most `points` bars.
+    If `claims` is `True` the uploads are also added up
+    by claim and by channel, with the blob index.
+
+    It doesn't use the interface, so it can run in a thread;
+    it returns a dictionary with the 'content' to show,
+    and the 'plot' data, or `None`.
+    """
+    data_dir = sdg.daemon_data_dir(server=server)
+
+    if not data_dir:
+        return {"content": ("The data directory of the daemon "
+                            "could not be found"),
+                "plot": None}
+
+    stats = sdg.update_events(data_dir)
+    plot = None
+
+    try:
+        import lbseed.seed_stats as sst
+    except ImportError:
+        sst = None
+        print("Statistics by hour or day require the 'numpy' library")
+
+    if sst:
+        events = sst.load_array(data_dir)
+        text = sst.stats_text(events, bucket=bucket, number=number)
+
+        if plot_hst_var:
+            plot = sst.plot_data(events, bucket=bucket, number=number,
+                                 points=points)
+    else:
+        events = sdg.load_events(data_dir)
+        text = sdg.ratio_text(events)
+
+    if claims:
+        index, added = bix.update_index(data_dir, server=server)
+        totals = sst.blob_totals(events) if sst else sdg.blob_totals(events)
+        by_claim, by_channel = bix.attribute(index, totals)
+
+        text += ("\n" + 80 * "-" + "\n"
+                 + f"Streams in the blob index: {len(index['streams'])}; "
+                 f"new: {added}\n"
+                 + bix.uploads_text(index, by_claim, by_channel))
+
+    content = (f"Logs: {os.path.join(data_dir, sdg.LOG_NAME)}; "
+               f"files: {stats['files']}\n"
+               f"New data read: {stats['bytes'] / 1024**2:.2f} MiB; "
+               f"new events: {stats['events']}; "
+               f"total events: {len(events)}; "
+               f"time: {stats['time']:.3f} s\n"
+               + 80 * "-" + "\n"
+               + text)
+
+    return {"content": content,
+            "plot": plot}
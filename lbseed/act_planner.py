@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to plan what to seed, and download it, with the interface."""
+import lbrytools as lbryt
+
+import lbseed.act_peers as actp
+import lbseed.channels as chs
+import lbseed.planner as pln
+
+
+def plan_line(num, n_items, item, sep=";"):
+    """Build the line of a ranked stream."""
+    claim = item["claim"]
+    mark = "[x]" if item["chosen"] else "[ ]"
+    channel = claim.get("signing_channel", {}).get("name", "(anonymous)")
+    name = lbryt.sanitize_text(claim["name"])
+
+    return (f"{num:4d}/{n_items:4d}{sep} {mark} "
+            f"value/GB: {item['density']:9.3f}{sep} "
+            f"peers: {item['n_peers']:3d}{sep} "
+            f"{item['size'] / 1024**3:7.3f} GB{sep} "
+            f"{claim['claim_id']}{sep} {channel}{sep} \"{name}\"")
+
+
+def i_plan_seeding(source="subs", text="", number=5,
+                   budget=10, shared=True, threads=32,
+                   server="http://localhost:5279"):
+    """Rank candidate streams by seeding value, and choose some of them.
+
+    The candidates come from the `source`: 'subs', the `number`
+    newest streams of each subscribed channel; 'channels',
+    the channels in `text` separated by commas; or 'search',
+    the first `number` results of searching `text`.
+    The `budget` is in gigabytes.
+
+    It returns a dictionary with the 'content' to show,
+    and the chosen 'claims' to download.
+    """
+    if source == "subs":
+        subscriptions = chs.get_ch_subs(shared=shared, server=server)
+        channels = [[sub["uri"], number] for sub in subscriptions]
+        claims = pln.candidates_chs(channels, threads=threads, server=server)
+    elif source == "channels":
+        channels = [[channel.strip(), number]
+                    for channel in text.split(",") if channel.strip()]
+        claims = pln.candidates_chs(channels, threads=threads, server=server)
+    else:
+        claims = pln.candidates_search(text, number=number, server=server)
+
+    unique = {}
+
+    for claim in claims:
+        unique.setdefault(claim["claim_id"], claim)
+
+    claims = list(unique.values())
+
+    if not claims:
+        return {"content": "No candidate streams found",
+                "claims": []}
+
+    infos = [info for num, info in actp.search_claims(claims,
+                                                      threads=threads,
+                                                      server=server)]
+
+    ranked = pln.rank_candidates(infos)
+    used = pln.choose(ranked, budget * 1024**3)
+    chosen = [item["claim"] for item in ranked if item["chosen"]]
+
+    stats = {"local": sum(1 for info in infos if info.get("local")),
+             "failed": sum(1 for info in infos if info.get("failed"))}
+
+    n_items = len(ranked)
+    lines = [plan_line(num, n_items, item)
+             for num, item in enumerate(ranked, start=1)]
+
+    content = (f"Candidates: {len(claims)}; "
+               f"already downloaded: {stats['local']}; "
+               f"failed searches: {stats['failed']}\n"
+               f"Budget: {budget:.2f} GB; "
+               f"chosen: {len(chosen)} streams, "
+               f"{used / 1024**3:.3f} GB\n"
+               + 80 * "-" + "\n"
+               + ("\n".join(lines) or "No streams left to seed"))
+
+    return {"content": content,
+            "claims": chosen}
+
+
+def i_download_plan(claims,
+                    ddir=None, own_dir=False, save_file=True,
+                    server="http://localhost:5279"):
+    """Download the streams chosen by `i_plan_seeding`."""
+    n_claims = len(claims)
+
+    for num, claim in enumerate(claims, start=1):
+        print(f"Claim {num}/{n_claims}, {claim['canonical_url']}")
+        lbryt.download_single(cid=claim["claim_id"],
+                              ddir=ddir, own_dir=own_dir,
+                              save_file=save_file,
+                              server=server)
+
+        if num < n_claims:
+            print()
@@ -31,22 +31,41 @@ from lbseed.act_download import i_download_chs
 from lbseed.act_download import i_download_claims
 
 from lbseed.act_list import i_list_d_claims
+from lbseed.act_list import i_list_d_invalid
 from lbseed.act_list import i_list_ch_claims
+from lbseed.act_list import i_list_chs_claims
+from lbseed.act_list import i_local_chs
 from lbseed.act_list import i_list_ch_subs
+from lbseed.act_list import i_get_pub_chs
 from lbseed.act_list import i_list_pub_chs
 from lbseed.act_list import i_list_pub_claims
 from lbseed.act_list import i_ctrl_claims
+from lbseed.act_list import i_ctrl_changes
 
 from lbseed.act_comments import i_list_comments
 from lbseed.act_comments import i_show_comment
 from lbseed.act_comments import i_show_no_comment
 from lbseed.act_comments import i_act_comment
+from lbseed.act_comments import i_act_comments
+from lbseed.act_comments import i_comment_cache
+from lbseed.act_comments import i_list_replies
+from lbseed.act_comments import i_get_comment
+from lbseed.act_comments import i_local_comments
+from lbseed.act_comments import i_search_comments
+from lbseed.act_comments import i_channel_comments
+from lbseed.act_comments import comments_summary
 
 from lbseed.act_peers import i_list_m_peers
 from lbseed.act_peers import i_list_ch_peers
 from lbseed.act_peers import i_list_chs_peers
 from lbseed.act_peers import i_list_subs_peers
 from lbseed.act_peers import i_seeding_ratio
+from lbseed.act_peers import set_peer_cache
+from lbseed.act_peers import i_peer_trends
+from lbseed.act_peers import i_start_monitor
+
+from lbseed.act_planner import i_plan_seeding
+from lbseed.act_planner import i_download_plan
 
 from lbseed.act_delete import i_delete_claims
 from lbseed.act_delete import i_delete_chs
@@ -57,6 +76,10 @@ from lbseed.act_supports import i_update_supports
 from lbseed.act_search import i_list_trending
 from lbseed.act_search import i_list_search
 
+from lbseed.act_export import PEER_KINDS
+from lbseed.act_export import i_export
+from lbseed.act_export import i_snapshot_diff
+
 True if i_list_lbrynet_settings else False
 True if i_list_lbrynet_status else False
 
@@ -64,22 +87,41 @@ True if i_download_chs else False
 True if i_download_claims else False
 
 True if i_list_d_claims else False
+True if i_list_d_invalid else False
 True if i_list_ch_claims else False
+True if i_list_chs_claims else False
+True if i_local_chs else False
 True if i_list_ch_subs else False
+True if i_get_pub_chs else False
 True if i_list_pub_chs else False
 True if i_list_pub_claims else False
 True if i_ctrl_claims else False
+True if i_ctrl_changes else False
 
 True if i_list_comments else False
 True if i_show_comment else False
 True if i_show_no_comment else False
 True if i_act_comment else False
+True if i_act_comments else False
+True if i_comment_cache else False
+True if i_list_replies else False
+True if i_get_comment else False
+True if i_local_comments else False
+True if i_search_comments else False
+True if i_channel_comments else False
+True if comments_summary else False
 
 True if i_list_m_peers else False
 True if i_list_ch_peers else False
 True if i_list_chs_peers else False
 True if i_list_subs_peers else False
 True if i_seeding_ratio else False
+True if set_peer_cache else False
+True if i_peer_trends else False
+True if i_start_monitor else False
+
+True if i_plan_seeding else False
+True if i_download_plan else False
 
 True if i_delete_claims else False
 True if i_delete_chs else False
@@ -89,3 +131,7 @@ True if i_update_supports else False
 
 True if i_list_trending else False
 True if i_list_search else False
+
+True if PEER_KINDS else False
+True if i_export else False
+True if i_snapshot_diff else False
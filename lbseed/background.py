@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to run long operations without blocking the interface.
+
+Tk widgets can only be touched from the main thread, so the work runs
+in a separate thread and its results are passed through a queue
+that is checked periodically with `after`.
+"""
+import queue
+import threading
+
+
+class Stream:
+    """Handle to a running stream, so that it can be cancelled."""
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def active(self):
+        return not self.cancelled.is_set()
+
+
+def run_stream(widget, generator,
+               on_items=None, on_done=None,
+               interval=100, batch=500):
+    """Consume a generator in a thread, and process its items in Tk.
+
+    Every `interval` milliseconds up to `batch` items are passed
+    as a list to `on_items(items)`, in the main thread.
+    When the generator is exhausted `on_done()` is called.
+    It returns a `Stream` that can be cancelled; after cancelling
+    neither callback is called again.
+    """
+    stream = Stream()
+    items = queue.Queue()
+    end = object()
+
+    def work():
+        try:
+            for item in generator:
+                if not stream.active():
+                    break
+                items.put(item)
+        except Exception as err:
+            print(f"Error: {type(err).__name__}: {err}")
+        finally:
+            items.put(end)
+
+    def poll():
+        if not stream.active():
+            return
+
+        out = []
+        finished = False
+
+        while len(out) < batch:
+            try:
+                item = items.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is end:
+                finished = True
+                break
+
+            out.append(item)
+
+        if out and on_items:
+            on_items(out)
+
+        if finished:
+            stream.cancel()
+            if on_done:
+                on_done()
+            return
+
+        widget.after(interval, poll)
+
+    threading.Thread(target=work, daemon=True).start()
+    widget.after(interval, poll)
+
+    return stream
+
+
+def run_task(widget, function, on_done=None, on_error=None, interval=100):
+    """Run a function in a thread, and pass its result to `on_done` in Tk.
+
+    If the function raises an exception, it is printed,
+    and passed to `on_error(err)` instead, also in Tk.
+    """
+    errors = []
+
+    def single():
+        try:
+            yield function()
+        except Exception as err:
+            print(f"Error: {type(err).__name__}: {err}")
+            errors.append(err)
+
+    def done_items(items):
+        if on_done:
+            on_done(items[0])
+
+    def finished():
+        if errors and on_error:
+            on_error(errors[0])
+
+    return run_stream(widget, single(), on_items=done_items,
+                      on_done=finished, interval=interval)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to know which claim each blob of the logs belongs to.
+
+The logs of the daemon only name the blobs that were uploaded,
+so an index from blob to claim is built from the downloaded streams:
+'file_list' gives the claim and the sd_hash of each stream,
+and 'blob_list' gives the hashes of all its blobs.
+The blobs of a stream never change, so only new streams
+are added to the index in later runs.
+
+Blobs are identified by the first 8 characters of their hash,
+as the logs of downloaded blobs only show those.
+"""
+import time
+
+import lbseed.daemon as dmn
+import lbseed.seeding as sdg
+import lbseed.storage as stg
+import lbseed.throttle as thr
+
+UNKNOWN = "(unknown)"
+
+
+def index_path(data_dir):
+    """Path of the blob index of the daemon."""
+    return sdg.store_path(data_dir, "blobs.json.gz")
+
+
+def load_index(data_dir):
+    """Load the blob index, or an empty index."""
+    return stg.load_json(index_path(data_dir),
+                         default={"streams": {}, "blobs": {}, "time": 0})
+
+
+def stream_blobs(sd_hash, server="http://localhost:5279"):
+    """Hashes of all blobs of a stream, including the sd blob.
+
+    It returns `False` if the blobs can't be listed,
+    so the stream is tried again in the next run.
+    """
+    blobs = [sd_hash]
+    state = {}
+
+    for blob, total in dmn.iter_pages("blob_list", {"sd_hash": sd_hash},
+                                      page_size=1000, state=state,
+                                      server=server):
+        blobs.append(blob)
+
+    if not state.get("complete"):
+        return False
+
+    return blobs
+
+
+def update_index(data_dir, threads=32,
+                 server="http://localhost:5279"):
+    """Add the downloaded streams that are not yet in the blob index.
+
+    The streams that are no longer downloaded are kept,
+    so the uploads of the past are still attributed to them.
+    It returns the index and the number of streams added.
+    """
+    index = load_index(data_dir)
+    streams = index["streams"]
+
+    new = {}
+
+    for item, total in dmn.iter_pages("file_list", {}, page_size=100,
+                                      server=server):
+        sd_hash = item.get("sd_hash")
+
+        if sd_hash and sd_hash not in streams:
+            new[sd_hash] = {"claim_id": item.get("claim_id") or "",
+                            "name": item.get("claim_name") or "",
+                            "channel": item.get("channel_name") or ""}
+
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+
+    def blobs(sd_hash):
+        return stream_blobs(sd_hash, server=server)
+
+    added = 0
+
+    for num, sd_hash, hashes in thr.fan_out(blobs, new, limiter=limiter):
+        if hashes is False:
+            continue
+
+        streams[sd_hash] = dict(new[sd_hash], blobs=len(hashes))
+
+        for blob in hashes:
+            index["blobs"][blob[:8]] = sd_hash
+
+        added += 1
+
+    if added:
+        index["time"] = time.time()
+        stg.save_json(index_path(data_dir), index)
+
+    return index, added
+
+
+def attribute(index, blob_totals):
+    """Add up the uploads of the blobs by claim and by channel.
+
+    `blob_totals` is a sequence of `(blob, uploads, bytes)`.
+    It returns two dictionaries, by claim ID and by channel name,
+    with `[uploads, bytes]`; the blobs not in the index
+    are added under `UNKNOWN`.
+    """
+    streams = index["streams"]
+    blobs = index["blobs"]
+
+    claims = {}
+    channels = {}
+
+    for blob, uploads, size in blob_totals:
+        sd_hash = blobs.get(blob)
+
+        if sd_hash:
+            stream = streams[sd_hash]
+            claim = stream["claim_id"]
+            channel = stream["channel"] or UNKNOWN
+        else:
+            claim = channel = UNKNOWN
+
+        for totals, key in ((claims, claim), (channels, channel)):
+            if key not in totals:
+                totals[key] = [0, 0]
+
+            totals[key][0] += uploads
+            totals[key][1] += size
+
+    return claims, channels
+
+
+def claim_names(index):
+    """Names of the claims in the index, by claim ID."""
+    return {stream["claim_id"]: stream["name"]
+            for stream in index["streams"].values()}
+
+
+def uploads_text(index, claims, channels, top=20, sep=";"):
+    """Lists of the claims and channels with the most uploads."""
+    names = claim_names(index)
+    out = []
+
+    for label, totals, show in (("claims", claims, names),
+                                ("channels", channels, None)):
+        ranked = sorted(totals.items(), key=lambda kv: -kv[1][0])[:top]
+        n_items = len(ranked)
+
+        if out:
+            out.append(80 * "-")
+
+        out.append(f"Top {n_items} {label} by uploads "
+                   f"(of {len(totals)})")
+
+        for num, (key, (uploads, size)) in enumerate(ranked, start=1):
+            name = key
+
+            if show is not None and key != UNKNOWN:
+                name = f'{key}{sep} "{show.get(key, "")}"'
+
+            out.append(f"{num:4d}/{n_items:4d}{sep} "
+                       f"uploads: {uploads:7d}{sep} "
+                       f"{size / 1024**2:10.1f} MiB{sep} {name}")
+
+    return "\n".join(out)
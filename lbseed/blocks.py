@@ -66,6 +66,8 @@ from lbseed.blocks_search import setup_radio_trend_claims
 from lbseed.blocks_search import setup_check_trend_typ
 from lbseed.blocks_search import info_search
 
+from lbseed.blocks_export import setup_export_gen
+
 # Use the methods to prevent warnings by code checkers (flake8)
 True if focus_next_widget else False
 True if f_with_event else False
@@ -103,3 +105,5 @@ True if setup_check_trend_fields else False
 True if setup_radio_trend_claims else False
 True if setup_check_trend_typ else False
 True if info_search else False
+
+True if setup_export_gen else False
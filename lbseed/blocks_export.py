@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Basic building blocks to export the listings to files."""
+import tkinter as tk
+import tkinter.ttk as ttk
+
+from lbseed.blocks_base import setup_button_gen
+
+
+def setup_export_gen(parent,
+                     width=26,
+                     fmt_var=None,
+                     b_command=None,
+                     d_command=None,
+                     start=0):
+    """Set up the buttons to export a listing, and to compare snapshots."""
+    button, label = \
+        setup_button_gen(parent,
+                         width=width,
+                         b_text="Export listing",
+                         b_command=b_command,
+                         l_text="",
+                         start=start)
+    label.grid_forget()
+
+    frame = ttk.Frame(parent)
+    frame.grid(row=start, column=1, sticky=tk.W, padx=2)
+
+    lab = ttk.Label(frame, text="Save the listing to a file:")
+    lab.grid(row=0, column=0, sticky=tk.W)
+
+    for num, (fmt, text) in enumerate((("csv", "CSV"),
+                                       ("jsonl", "JSON Lines"),
+                                       ("parquet", "Parquet"))):
+        rad = ttk.Radiobutton(frame,
+                              text=text,
+                              variable=fmt_var, value=fmt)
+        rad.grid(row=0, column=num+1, sticky=tk.W, padx=2)
+
+    if d_command:
+        setup_button_gen(parent,
+                         width=width,
+                         b_text="Show changes",
+                         b_command=d_command,
+                         l_text=("Save a snapshot of the listing, "
+                                 "and show what was added, removed, "
+                                 "or changed since the previous one"),
+                         start=start+1)
+
+    return button, frame
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to keep a local index of the claims of each channel.
+
+The first time a channel is listed all its claims are searched,
+going down in block height, 1000 claims at a time.
+The claims are stored locally with the highest block height seen,
+so later listings only search the claims created or updated
+above that height.
+Claims removed from the channel are found by comparing
+the number of claims in ranges of heights with the index,
+and searching by ID only the claims of the ranges that differ.
+
+Any window of claims (`number`, `start`, `end`, `reverse`)
+is then taken from the index without searching online.
+"""
+import os
+import time
+
+import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+import lbseed.daemon as dmn
+import lbseed.records as rec
+import lbseed.storage as stg
+import lbseed.throttle as thr
+
+# Results that `claim_search` can return for a single query
+MAX_RESULTS = 1000
+
+
+def index_path(channel):
+    """Path of the local index of a channel."""
+    return stg.data_path("channels", stg.safe_name(channel) + ".json.gz")
+
+
+def load_index(channel):
+    """Load the index of a channel, or an empty index."""
+    return stg.load_json(index_path(channel),
+                         default={"channel": channel,
+                                  "height": 0,
+                                  "time": 0,
+                                  "claims": {}})
+
+
+def find_channel(channel):
+    """Find the name of a channel among the saved indices, without requests.
+
+    The channel is '@name' or '@name#id', where the ID may be partial.
+    If several indices match, the one updated last is used.
+    It returns the name that the index was saved with, or `None`.
+    """
+    if not channel.startswith("@"):
+        channel = "@" + channel
+
+    name, _, cid = channel.replace(":", "#").partition("#")
+    prefix = stg.safe_name(name + "#")
+    cdir = os.path.dirname(index_path(channel))
+    found = None
+    newest = -1
+
+    for fname in os.listdir(cdir):
+        if not (fname.startswith(prefix) and fname.endswith(".json.gz")):
+            continue
+
+        index = stg.load_json(os.path.join(cdir, fname))
+
+        if not index:
+            continue
+
+        i_name, _, i_cid = index.get("channel", "").partition("#")
+
+        if i_name != name or not (i_cid.startswith(cid)
+                                  or cid.startswith(i_cid)):
+            continue
+
+        if index.get("time", 0) > newest:
+            found = index["channel"]
+            newest = index.get("time", 0)
+
+    return found
+
+
+def index_claim(claim):
+    """Compact description of a claim to keep in the index."""
+    item = rec.claim_record(claim)
+    meta = claim.get("meta", {})
+
+    item["creation_time"] = int(meta.get("creation_timestamp", 0))
+    item["timestamp"] = int(claim.get("timestamp", 0))
+
+    return item
+
+
+def _search_height(channel, height, prefix="", state=None, limiter=None,
+                   server="http://localhost:5279"):
+    """Search the claims of a channel at a single block height.
+
+    If there are more claims than a single search can return,
+    they are split by the first characters of their claim IDs.
+    The 'complete' key of `state` is set to `False` if a search fails.
+    """
+    params = {"channel": channel,
+              "height": height,
+              "no_totals": True}
+
+    if prefix:
+        params["claim_id"] = prefix
+
+    page_state = {}
+    n_items = 0
+
+    for claim, total in dmn.iter_pages("claim_search", params,
+                                       limit=MAX_RESULTS,
+                                       state=page_state,
+                                       limiter=limiter,
+                                       server=server):
+        yield claim
+        n_items += 1
+
+    if not page_state.get("complete"):
+        state["complete"] = False
+        return
+
+    if n_items < MAX_RESULTS:
+        return
+
+    for char in "0123456789abcdef":
+        yield from _search_height(channel, height, prefix=prefix + char,
+                                  state=state, limiter=limiter,
+                                  server=server)
+
+
+def search_down(channel, stop_height=0, state=None, limiter=None,
+                server="http://localhost:5279"):
+    """Search the claims of a channel above a block height, newest first.
+
+    The search goes down in block height in windows of 1000 claims,
+    which is the maximum that a single search can return;
+    a height with more claims than that is searched on its own.
+    If a `state` dictionary is given, its 'complete' key is set
+    to `True` once every claim above `stop_height` was searched.
+    The pages are requested within the limit of `limiter`, if given.
+    """
+    state = state if state is not None else {}
+    state["complete"] = False
+    last_height = None
+
+    while True:
+        params = {"channel": channel,
+                  "order_by": ["height"],
+                  "no_totals": True}
+
+        if last_height is not None:
+            params["height"] = f"<={last_height}"
+
+        page_state = {}
+        highest = None
+        lowest = None
+        n_items = 0
+
+        for claim, total in dmn.iter_pages("claim_search", params,
+                                           limit=MAX_RESULTS,
+                                           state=page_state,
+                                           limiter=limiter,
+                                           server=server):
+            height = int(claim.get("height", 0))
+
+            if height <= stop_height:
+                state["complete"] = True
+                return
+
+            yield claim
+            highest = height if highest is None else highest
+            lowest = height
+            n_items += 1
+
+        if not page_state.get("complete"):
+            return
+
+        if n_items < MAX_RESULTS:
+            state["complete"] = True
+            return
+
+        if lowest != highest:
+            # Claims at the lowest height may be repeated in the next
+            # window, but the index keeps them only once
+            last_height = lowest
+            continue
+
+        # The whole window is a single height
+        height_state = {"complete": True}
+
+        yield from _search_height(channel, lowest, state=height_state,
+                                  limiter=limiter, server=server)
+
+        if not height_state["complete"]:
+            return
+
+        if lowest - 1 <= stop_height:
+            state["complete"] = True
+            return
+
+        last_height = lowest - 1
+
+
+def count_claims(channel, low, high, limiter=None,
+                 server="http://localhost:5279"):
+    """Number of claims of a channel between two block heights, inclusive.
+
+    It returns `None` if the search fails.
+    """
+    params = {"channel": channel,
+              "height": [f">={low}", f"<={high}"],
+              "page": 1, "page_size": 1}
+
+    if limiter:
+        result = limiter.call(dmn.daemon_call, "claim_search", params,
+                              server=server)
+    else:
+        result = dmn.daemon_call("claim_search", params, server=server)
+
+    if not result:
+        return None
+
+    return result.get("total_items")
+
+
+def changed_ranges(channel, claims, low, high, limiter=None,
+                   server="http://localhost:5279"):
+    """Find the claims of the index that may have been removed.
+
+    The number of claims of the channel between two heights
+    is compared with the claims of the index in that range;
+    the ranges that differ are split in two until they are small,
+    so only a few searches are needed when few claims were removed.
+    It returns the claim IDs to search by ID.
+    """
+    ids = [cid for cid, claim in claims.items()
+           if low <= claim["height"] <= high]
+
+    if not ids:
+        return []
+
+    total = count_claims(channel, low, high, limiter=limiter,
+                         server=server)
+
+    if total is None or total == len(ids):
+        return []
+
+    if len(ids) <= 50 or low >= high:
+        return ids
+
+    middle = (low + high) // 2
+
+    return (changed_ranges(channel, claims, low, middle,
+                           limiter=limiter, server=server)
+            + changed_ranges(channel, claims, middle + 1, high,
+                             limiter=limiter, server=server))
+
+
+def removed_claims(claim_ids, threads=32, limiter=None,
+                   server="http://localhost:5279"):
+    """Find the claims that can't be found any more, in parallel batches.
+
+    A `limiter` shared by several channels keeps all their searches
+    within a single limit; otherwise one is created with `threads`.
+    """
+    if not limiter:
+        limiter = thr.AdaptiveLimiter(initial=min(4, threads),
+                                      maximum=threads)
+
+    def search(batch):
+        return dmn.claims_by_id(batch, server=server)
+
+    removed = []
+
+    for num, batch, found in thr.fan_out(search, dmn.chunks(claim_ids),
+                                         limiter=limiter):
+        if found is not False:
+            removed.extend(cid for cid in batch if cid not in found)
+
+    return removed
+
+
+def update_index(channel, threads=32, limiter=None,
+                 server="http://localhost:5279"):
+    """Bring the index of a channel up to date, and save it.
+
+    It returns the index, and the number of claims that were
+    added, updated, and removed.
+    If the search fails midway, the claims found are returned
+    but the index is not saved, and its height is kept,
+    so the next refresh searches those claims again.
+    The `limiter`, if given, is used for every search
+    instead of `threads`, so several channels share its limit.
+    """
+    index = load_index(channel)
+    claims = index["claims"]
+    stats = {"added": 0, "updated": 0, "removed": 0, "complete": False}
+    state = {}
+    height = index["height"]
+    seen = set()
+
+    for claim in search_down(channel, stop_height=index["height"],
+                             state=state, limiter=limiter,
+                             server=server):
+        cid = claim["claim_id"]
+
+        if cid not in seen:
+            seen.add(cid)
+            if cid in claims:
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+
+        claims[cid] = index_claim(claim)
+        height = max(height, claims[cid]["height"])
+
+    if not state["complete"]:
+        return index, stats
+
+    index["height"] = height
+    stats["complete"] = True
+
+    # The claims counted in each range of heights are compared
+    # with the index, and only where they differ are searched by ID
+    if claims:
+        low = min(claim["height"] for claim in claims.values())
+        suspect = changed_ranges(channel, claims, low, height,
+                                 limiter=limiter, server=server)
+    else:
+        suspect = []
+
+    if suspect:
+        removed = removed_claims(suspect, threads=threads,
+                                 limiter=limiter,
+                                 server=server)
+        for cid in removed:
+            del claims[cid]
+        stats["removed"] = len(removed)
+
+    index["time"] = int(time.time())
+    stg.save_json(index_path(channel), index)
+
+    return index, stats
+
+
+def index_window(index, number=0, start=1, end=0,
+                 reverse=False, last_height=99_000_900):
+    """Take a window of claims from the index, sorted by release time.
+
+    If `number` is given only the newest claims are considered;
+    `start` and `end` are the first and last claims to take, from 1.
+    """
+    claims = [claim for claim in index["claims"].values()
+              if claim["height"] <= last_height]
+    claims.sort(key=lambda claim: claim["release_time"])
+
+    if number > 0:
+        claims = claims[-number:]
+
+    n_claims = len(claims)
+    window = list(enumerate(claims, start=1))
+    window = window[max(start - 1, 0):end if end > 0 else None]
+
+    if reverse:
+        window.reverse()
+
+    return n_claims, window
+
+
+def _duration(seconds):
+    """Duration as minutes and seconds."""
+    mi, sec = divmod(seconds, 60)
+    return f"{mi:3d}:{sec:02d}"
+
+
+def index_line(num, n_claims, claim,
+               create=False, height=False, release=True,
+               claim_id=False, typ=True, ch_name=False,
+               sizes=True, supports=False, fees=True,
+               title=False, sanitize=True, sep=";"):
+    """Build a single line of information for a claim in the index."""
+    out = f"{num:4d}/{n_claims:4d}{sep} "
+
+    if create:
+        ctime = time.strftime(funcs.TFMT, time.gmtime(claim["creation_time"]))
+        out += f"{claim['creation_height']:8d}{sep} {ctime}{sep} "
+
+    if height:
+        htime = time.strftime(funcs.TFMT, time.gmtime(claim["timestamp"]))
+        out += f"{claim['height']:8d}{sep} {htime}{sep} "
+
+    if release:
+        rtime = time.strftime(funcs.TFMT, time.gmtime(claim["release_time"]))
+        out += f"{rtime}{sep} "
+
+    if claim_id:
+        out += f"{claim['claim_id']}{sep} "
+
+    if typ:
+        out += f"{claim['type']:20s}{sep} "
+
+    if ch_name:
+        channel = claim["channel"]
+        if sanitize:
+            channel = lbryt.sanitize_text(channel)
+        out += f"{channel}{sep} "
+
+    if sizes:
+        size = claim["size"] / (1024**2)
+        out += f"{_duration(claim['duration'])}{sep} {size:9.4f} MB{sep} "
+
+    if supports:
+        out += f"{claim['support_amount']:14.8f}{sep} "
+
+    if fees:
+        fee = f"{claim['fee']} {claim['fee_currency']}".strip()
+        out += f"f: {fee or 0}{sep} "
+
+    name = claim["title"] if title and claim["title"] else claim["name"]
+
+    if sanitize:
+        name = lbryt.sanitize_text(name)
+
+    return out + f'"{name}"'
+
+
+def index_summary(index, n_shown, stats=None, sep=";"):
+    """Summary of the index of a channel."""
+    claims = index["claims"].values()
+    size = sum(claim["size"] for claim in claims)
+    duration = sum(claim["duration"] for claim in claims)
+    hrs, sec = divmod(duration, 3600)
+    mi, sec = divmod(sec, 60)
+    updated = time.strftime(funcs.TFMT, time.gmtime(index["time"]))
+
+    out = (f"Claims in index: {len(index['claims'])}{sep} "
+           f"shown: {n_shown}{sep} "
+           f"total size: {size / (1024**3):.4f} GB{sep} "
+           f"total duration: {hrs} h {mi} min {sec} s\n"
+           f"Index updated: {updated}")
+
+    if stats:
+        out += (f"{sep} new: {stats['added']}{sep} "
+                f"updated: {stats['updated']}{sep} "
+                f"removed: {stats['removed']}")
+
+    if stats and not stats["complete"]:
+        out += ("\nThe search of the channel failed; "
+                "the index was not saved")
+
+    return out
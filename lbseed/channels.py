@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to get channels and their claims directly from the daemon."""
+import time
+
+import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+from lbseed.daemon import daemon_call
+
+
+def get_ch_subs(shared=True,
+                server="http://localhost:5279"):
+    """Get the subscribed channels from the wallet preferences."""
+    key = "shared" if shared else "local"
+
+    result = daemon_call("preference_get", {"key": key},
+                         server=server)
+
+    if not result or key not in result:
+        return []
+
+    value = result[key].get("value", {})
+    following = {}
+
+    for item in value.get("following", []):
+        following[item["uri"]] = not item.get("notificationsDisabled", True)
+
+    subscriptions = []
+
+    for uri in value.get("subscriptions", []):
+        subscriptions.append({"uri": uri,
+                              "notifications": following.get(uri, False)})
+
+    return subscriptions
+
+
+def claim_time(claim):
+    """Get the release time of the claim, or its creation time."""
+    if "release_time" in claim.get("value", {}):
+        return int(claim["value"]["release_time"])
+
+    return int(claim.get("meta", {}).get("creation_timestamp", 0))
+
+
+def claim_type(claim):
+    """Get the type of claim, and the type of media for streams."""
+    typ = claim.get("value_type", "")
+    stream_type = claim.get("value", {}).get("stream_type")
+
+    if stream_type:
+        typ = f"{typ}/{stream_type}"
+
+    return typ
+
+
+def ch_latest_claims(channel, number=4,
+                     timeout=30,
+                     server="http://localhost:5279"):
+    """Get the newest claims of a channel with a single search."""
+    result = daemon_call("claim_search",
+                         {"channel": channel,
+                          "order_by": ["release_time"],
+                          "page": 1, "page_size": number,
+                          "no_totals": True},
+                         timeout=timeout,
+                         print_error=False,
+                         server=server)
+
+    if not result:
+        return {"channel": channel,
+                "valid": False,
+                "claims": []}
+
+    return {"channel": channel,
+            "valid": True,
+            "claims": result.get("items", [])}
+
+
+def claim_line(num, n_claims, claim,
+               claim_id=False, typ=True, title=False,
+               sanitize=True, sep=";"):
+    """Build a single line of information for a claim."""
+    rels_time = time.strftime(funcs.TFMT, time.gmtime(claim_time(claim)))
+
+    out = f"{num:4d}/{n_claims:4d}{sep} {rels_time}{sep} "
+
+    if claim_id:
+        out += f"{claim['claim_id']}{sep} "
+
+    if typ:
+        out += f"{claim_type(claim):20s}{sep} "
+
+    if title:
+        name = claim.get("value", {}).get("title", claim["name"])
+    else:
+        name = claim["name"]
+
+    if sanitize:
+        name = lbryt.sanitize_text(name)
+
+    return out + f'"{name}"'
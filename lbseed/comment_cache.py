@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to keep the comments of each claim between runs.
+
+The thread of a claim is saved in the data directory as it is listed,
+one level at a time. Once every level is in the cache, together with
+the time of the newest comment that was requested,
+later refreshes only request the comments that are newer,
+newest first, and stop as soon as they reach the known ones.
+"""
+import json
+import threading
+
+import lbseed.comments as cmt
+import lbseed.storage as stg
+
+# Seconds subtracted from the local time of the oldest requested level,
+# in case the clock of the comment server is ahead of ours
+MARGIN = 600
+
+
+def cache_path(claim_id):
+    """Get the file that keeps the comments of a claim."""
+    return stg.data_path("comments", stg.safe_name(claim_id) + ".json.gz")
+
+
+class CommentCache(cmt.CommentStore):
+    """The comments of one claim, with the replies of each comment.
+
+    `newest` is the time of the newest comment received in a refresh,
+    and `complete` is `True` once the whole thread was requested.
+    Until then, `loaded` has the local time at which each level
+    was requested in full, by parent ID ("" for the top level),
+    and `pending` the comments with replies that were not requested yet.
+    Comments added locally, like our own new comments,
+    don't change `newest`, so the next refresh still requests
+    the comments of others that were written before them.
+    """
+    def __init__(self, claim_id=None, name=None):
+        super().__init__()
+        self.claim_id = claim_id
+        self.name = name
+        self.newest = 0
+        self.complete = False
+        self.children = {}
+        self.times = {}
+        self.loaded = {}
+        self.pending = set()
+        self.lock = threading.RLock()
+
+    def add(self, comment):
+        comment_id = comment["comment_id"]
+
+        with self.lock:
+            if comment_id not in self.items:
+                parent = comment.get("parent_id") or ""
+                self.children.setdefault(parent, []).append(comment_id)
+
+            if (not self.complete and comment.get("replies")
+                    and comment_id not in self.loaded):
+                self.pending.add(comment_id)
+
+            self.times[comment_id] = comment.get("timestamp", 0)
+            super().add(comment)
+
+    def fetched(self, parent_id, stamp):
+        """Record that a level was requested in full at the local `stamp`.
+
+        When the top level and the replies of every comment
+        are in the cache, the cache becomes complete, and later refreshes
+        request the comments newer than the oldest of those requests.
+        """
+        parent = parent_id or ""
+
+        with self.lock:
+            if self.complete:
+                return
+
+            self.loaded[parent] = min(stamp, self.loaded.get(parent, stamp))
+            self.pending.discard(parent)
+
+            if "" in self.loaded and not self.pending:
+                self.newest = min(self.loaded.values()) - MARGIN
+                self.complete = True
+                self.loaded = {}
+
+    def remove(self, comment_id):
+        """Remove a comment, and the replies below it."""
+        with self.lock:
+            comment = self.get(comment_id)
+
+            if not comment:
+                return False
+
+            siblings = self.children.get(comment.get("parent_id") or "", [])
+
+            if comment_id in siblings:
+                siblings.remove(comment_id)
+
+            pending = [comment_id]
+
+            while pending:
+                current = pending.pop()
+                self.items.pop(current, None)
+                self.times.pop(current, None)
+                pending.extend(self.children.pop(current, []))
+
+        return True
+
+    def comments(self):
+        """Get all the comments, decoded."""
+        with self.lock:
+            return [self.get(comment_id) for comment_id in list(self.items)]
+
+    def level(self, parent_id=None):
+        """Get the comments at the top level, or the replies to a comment.
+
+        It returns a list of `(comment, total)`, newest first,
+        where the number of 'replies' of each comment
+        is the number of replies in the cache.
+        """
+        with self.lock:
+            ids = sorted(self.children.get(parent_id or "", []),
+                         key=lambda cid: self.times.get(cid, 0),
+                         reverse=True)
+            out = []
+
+            for comment_id in ids:
+                comment = self.get(comment_id)
+
+                if self.complete or comment_id in self.loaded:
+                    replies = self.children.get(comment_id, [])
+                    comment["replies"] = len(replies)
+
+                out.append((comment, len(ids)))
+
+        return out
+
+    def load(self):
+        """Read the comments of the claim saved in a previous run."""
+        data = stg.load_json(cache_path(self.claim_id), default={})
+
+        with self.lock:
+            self.newest = data.get("newest", 0)
+            self.complete = data.get("complete", False)
+            self.loaded = data.get("loaded", {})
+
+            for values in data.get("comments", []):
+                self.add(dict(zip(cmt.FIELDS, values)))
+
+            self.name = self.name or data.get("name")
+
+        return len(self.items)
+
+    def save(self):
+        with self.lock:
+            data = {"claim_id": self.claim_id,
+                    "name": self.name,
+                    "newest": self.newest,
+                    "complete": self.complete,
+                    "loaded": self.loaded,
+                    "comments": [json.loads(text)
+                                 for text in self.items.values()]}
+
+        return stg.save_json(cache_path(self.claim_id), data)
+
+    def refresh(self, page_size=50,
+                comm_server=cmt.COMM_SERVER):
+        """Request the comments newer than the newest one, and add them.
+
+        If the cache is not complete, the whole thread is requested.
+        Edits of old comments made by others are not noticed,
+        as they keep their original time.
+        It returns the number of new comments.
+        """
+        since = self.newest if self.complete else 0
+        state = {}
+        comments = cmt.iter_comments(self.claim_id, all_levels=True,
+                                     sort_by=cmt.SORT_NEWEST,
+                                     page_size=page_size,
+                                     state=state,
+                                     comm_server=comm_server)
+        n_new = 0
+        reached = False
+        newest = self.newest
+
+        for comment, _ in comments:
+            stamp = comment.get("timestamp", 0)
+
+            if stamp < since:
+                reached = True
+                break
+
+            with self.lock:
+                if comment["comment_id"] not in self.items:
+                    n_new += 1
+
+                self.add(comment)
+
+            newest = max(newest, stamp)
+
+        if reached or state.get("complete"):
+            with self.lock:
+                self.newest = newest
+                self.complete = True
+                self.loaded = {}
+                self.pending = set()
+
+        return n_new
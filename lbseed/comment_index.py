@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to search the comments of every claim that was loaded.
+
+The comments kept by `lbseed.comment_cache` are also added
+to a small SQLite database, with a full-text index of their text,
+so they can be searched by words, author, or date
+without requests to the comment server.
+If SQLite doesn't have the FTS5 extension, the text
+is searched without an index, which is slower but still works.
+"""
+import contextlib
+import sqlite3
+import threading
+
+import lbseed.storage as stg
+
+LOCK = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    claim_id TEXT PRIMARY KEY,
+    name TEXT);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    comment_id TEXT UNIQUE,
+    claim_id TEXT,
+    channel_name TEXT,
+    timestamp INTEGER,
+    comment TEXT);
+CREATE INDEX IF NOT EXISTS comments_claim ON comments (claim_id);
+CREATE INDEX IF NOT EXISTS comments_time ON comments (timestamp);
+CREATE INDEX IF NOT EXISTS comments_channel
+    ON comments (channel_name COLLATE NOCASE);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts
+    USING fts5 (comment, content='comments', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS comments_ai AFTER INSERT ON comments BEGIN
+    INSERT INTO comments_fts (rowid, comment)
+        VALUES (new.id, new.comment);
+END;
+CREATE TRIGGER IF NOT EXISTS comments_ad AFTER DELETE ON comments BEGIN
+    INSERT INTO comments_fts (comments_fts, rowid, comment)
+        VALUES ('delete', old.id, old.comment);
+END;
+CREATE TRIGGER IF NOT EXISTS comments_au AFTER UPDATE ON comments BEGIN
+    INSERT INTO comments_fts (comments_fts, rowid, comment)
+        VALUES ('delete', old.id, old.comment);
+    INSERT INTO comments_fts (rowid, comment)
+        VALUES (new.id, new.comment);
+END;
+"""
+
+
+def index_path():
+    return stg.data_path("comments", "index.sqlite3")
+
+
+def connect():
+    """Open the database, creating its tables the first time.
+
+    It returns the connection, and whether the full-text index
+    is available.
+    """
+    conn = sqlite3.connect(index_path())
+    conn.executescript(SCHEMA)
+
+    try:
+        conn.executescript(FTS_SCHEMA)
+        fts = True
+    except sqlite3.OperationalError:
+        fts = False
+
+    return conn, fts
+
+
+def index_claim(claim_id, comments, name=None):
+    """Make the index of a claim match its comments.
+
+    Only the comments that are new or changed are written,
+    and those that are no longer in `comments` are removed.
+    It returns the number of comments written or removed.
+    """
+    new = {comment["comment_id"]: comment for comment in comments}
+
+    with LOCK, contextlib.closing(connect()[0]) as conn, conn:
+        if name:
+            conn.execute("INSERT OR REPLACE INTO claims VALUES (?, ?)",
+                         (claim_id, name))
+
+        old = dict(conn.execute("SELECT comment_id, comment FROM comments "
+                                "WHERE claim_id = ?", (claim_id,)))
+
+        gone = [(comment_id,) for comment_id in old if comment_id not in new]
+        conn.executemany("DELETE FROM comments WHERE comment_id = ?", gone)
+
+        changed = [(comment_id, claim_id,
+                    comment.get("channel_name", ""),
+                    int(comment.get("timestamp", 0)),
+                    comment.get("comment", ""))
+                   for comment_id, comment in new.items()
+                   if old.get(comment_id) != comment.get("comment", "")]
+
+        conn.executemany("INSERT INTO comments "
+                         "(comment_id, claim_id, channel_name, "
+                         "timestamp, comment) "
+                         "VALUES (?, ?, ?, ?, ?) "
+                         "ON CONFLICT (comment_id) DO UPDATE SET "
+                         "comment = excluded.comment",
+                         changed)
+
+    return len(gone) + len(changed)
+
+
+def fts_query(text):
+    """Convert the text to search into a query of FTS5.
+
+    Every word must appear, in any order; text in double quotes
+    is searched as a phrase, and a word ending in '*' as a prefix.
+    """
+    parts = text.split('"')
+    terms = []
+
+    for num, part in enumerate(parts):
+        if num % 2:
+            if part.strip():
+                terms.append('"' + part.strip() + '"')
+            continue
+
+        for word in part.split():
+            prefix = word.endswith("*")
+            word = word.rstrip("*").replace('"', "")
+
+            if word:
+                terms.append('"' + word + '"' + ("*" if prefix else ""))
+
+    return " ".join(terms)
+
+
+def search(text="", author="", since=None, until=None,
+           claim_id=None, limit=200):
+    """Search the comments in the index, newest first.
+
+    `author` matches the start of the channel name of the author,
+    and `since` and `until` are Unix times.
+    It returns a list of dictionaries, and the total number of matches.
+    """
+    conditions = []
+    params = []
+
+    conn, fts = connect()
+
+    with contextlib.closing(conn):
+        if text.strip() and fts:
+            source = ("comments_fts JOIN comments "
+                      "ON comments.id = comments_fts.rowid")
+            conditions.append("comments_fts MATCH ?")
+            params.append(fts_query(text))
+        else:
+            source = "comments"
+
+            for word in text.split():
+                conditions.append("comments.comment LIKE ?")
+                params.append(f"%{word}%")
+
+        if author.strip():
+            author = author.strip()
+            author = author if author.startswith("@") else "@" + author
+            conditions.append("comments.channel_name LIKE ?")
+            params.append(author.replace("%", "") + "%")
+
+        if since:
+            conditions.append("comments.timestamp >= ?")
+            params.append(int(since))
+
+        if until:
+            conditions.append("comments.timestamp < ?")
+            params.append(int(until))
+
+        if claim_id:
+            conditions.append("comments.claim_id = ?")
+            params.append(claim_id)
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+        total = conn.execute(f"SELECT count(*) FROM {source}{where}",
+                             params).fetchone()[0]
+
+        rows = conn.execute("SELECT comments.comment_id, comments.claim_id, "
+                            "claims.name, comments.channel_name, "
+                            "comments.timestamp, comments.comment "
+                            f"FROM {source} "
+                            "LEFT JOIN claims "
+                            "ON claims.claim_id = comments.claim_id"
+                            f"{where} "
+                            "ORDER BY comments.timestamp DESC LIMIT ?",
+                            params + [limit]).fetchall()
+
+    keys = ("comment_id", "claim_id", "claim_name",
+            "channel_name", "timestamp", "comment")
+
+    return [dict(zip(keys, row)) for row in rows], total
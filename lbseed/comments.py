@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to communicate directly with the comment server.
+
+The comments are requested one page at a time, so that long threads
+can be shown while they are still arriving, and the replies
+of a comment are only requested when they are needed.
+"""
+import json
+
+import requests
+
+COMM_SERVER = "https://comments.odysee.com/api/v2"
+SORT_NEWEST = 0
+
+FIELDS = ("comment_id", "claim_id", "parent_id", "comment",
+          "channel_id", "channel_name", "channel_url",
+          "timestamp", "signing_ts", "replies",
+          "support_amount", "currency", "is_fiat",
+          "is_hidden", "is_pinned", "abandoned")
+
+
+class CommentStore:
+    """Comments kept as compact JSON text, by comment ID.
+
+    Only the `FIELDS` of each comment are kept, as a JSON array,
+    and they are decoded again only when a comment is shown.
+    """
+    def __init__(self):
+        self.items = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, comment):
+        values = [comment.get(field) for field in FIELDS]
+        self.items[comment["comment_id"]] = json.dumps(values,
+                                                       separators=(",", ":"))
+
+    def get(self, comment_id):
+        """Return the comment as a dictionary, or `None`."""
+        text = self.items.get(comment_id)
+
+        if text is None:
+            return None
+
+        return {field: value
+                for field, value in zip(FIELDS, json.loads(text))
+                if value is not None}
+
+    def clear(self):
+        self.items.clear()
+
+
+def comment_call(method, params=None,
+                 timeout=None,
+                 print_error=True,
+                 comm_server=COMM_SERVER):
+    """Call a method of the comment server and return the result.
+
+    If the server answers with an error it returns `False`.
+    Connection problems and timeouts raise the exceptions
+    of the `requests` library, like `daemon.daemon_call`.
+    """
+    msg = {"jsonrpc": "2.0",
+           "id": 1,
+           "method": method,
+           "params": params or {}}
+
+    output = requests.post(comm_server, json=msg, timeout=timeout).json()
+
+    if "error" in output:
+        error = output["error"]
+
+        if isinstance(error, dict):
+            error = error.get("message", error)
+
+        if print_error:
+            print(f"{method}: {error}")
+
+        return False
+
+    return output["result"]
+
+
+def iter_comments(claim_id, parent_id=None,
+                  all_levels=False, sort_by=None,
+                  page_size=50, limit=0,
+                  timeout=None, state=None,
+                  comm_server=COMM_SERVER):
+    """Walk the pages of comments of a claim.
+
+    Without `parent_id` only the comments at the top level are listed;
+    with it, only the direct replies to that comment.
+    If `all_levels` is `True` the comments of every level are listed.
+    It is a generator that yields `(comment, total_items)`,
+    requesting a new page only when the previous one is exhausted.
+    If a `state` dictionary is given, its 'complete' key is set
+    to `True` once the last page arrived, so a failed request
+    can be told apart from a claim without comments.
+    """
+    params = {"claim_id": claim_id,
+              "visible": False,
+              "hidden": False}
+
+    if parent_id:
+        params["parent_id"] = parent_id
+    elif not all_levels:
+        params["top_level"] = True
+
+    if sort_by is not None:
+        params["sort_by"] = sort_by
+
+    page = 1
+    n_items = 0
+
+    while True:
+        params["page"] = page
+        params["page_size"] = page_size
+
+        result = comment_call("comment.List", params, timeout=timeout,
+                              comm_server=comm_server)
+
+        if not result:
+            return
+
+        items = result.get("items") or []
+        total = result.get("total_items")
+
+        for item in items:
+            yield item, total
+            n_items += 1
+
+            if 0 < limit <= n_items:
+                return
+
+        total_pages = result.get("total_pages")
+
+        if not items or (total_pages is not None and page >= total_pages):
+            if state is not None:
+                state["complete"] = True
+            return
+
+        page += 1
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to find whether our claims are the controlling claims.
+
+The competition for each name (all claims that share the name,
+and their bids) is kept locally together with the last height
+at which any of those claims changed.
+In later runs the stored claims are checked in batches, and only
+the names whose claims or supports moved, or that have new claims,
+are searched again in full.
+"""
+import time
+
+import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+import lbseed.daemon as dmn
+import lbseed.storage as stg
+import lbseed.throttle as thr
+
+
+def claim_state(claim):
+    """Values of a claim that change when its bid changes."""
+    meta = claim.get("meta", {})
+
+    return [claim.get("height", 0),
+            claim.get("amount", "0"),
+            meta.get("support_amount", "0"),
+            meta.get("effective_amount", "0")]
+
+
+def name_competition(name, server="http://localhost:5279"):
+    """Search all claims that share a name, and summarize the competition.
+
+    It returns `False` if the search failed, so the name isn't cached.
+    """
+    claims = {}
+    controlling = None
+    height = 0
+    state = {}
+
+    for claim, total in dmn.iter_pages("claim_search",
+                                       {"name": name,
+                                        "order_by": ["effective_amount"],
+                                        "no_totals": True},
+                                       timeout=60,
+                                       state=state,
+                                       server=server):
+        meta = claim.get("meta", {})
+
+        claims[claim["claim_id"]] = {"state": claim_state(claim),
+                                     "effective": float(
+                                         meta.get("effective_amount", 0)),
+                                     "reposted": int(meta.get("reposted", 0))}
+
+        if meta.get("is_controlling"):
+            controlling = claim["claim_id"]
+
+        height = max(height,
+                     claim.get("height", 0),
+                     meta.get("activation_height", 0))
+
+    if not state.get("complete"):
+        return False
+
+    return {"claims": claims,
+            "controlling": controlling,
+            "height": height}
+
+
+def changed_names(names, cache, threads=32,
+                  server="http://localhost:5279"):
+    """Find the names whose competition changed since the cached run."""
+    changed = {name for name in names if name not in cache}
+    known = [name for name in names if name in cache]
+
+    claim_ids = set()
+    for name in known:
+        claim_ids.update(cache[name]["claims"])
+        claim_ids.update(names[name])
+
+    current = {}
+
+    def fetch(batch):
+        return dmn.claims_by_id(batch, timeout=60, server=server)
+
+    limiter = thr.AdaptiveLimiter(maximum=threads)
+
+    for index, batch, result in thr.fan_out(fetch, dmn.chunks(claim_ids),
+                                            limiter=limiter):
+        if result is False:
+            # We can't tell, so all names with these claims are searched
+            result = {}
+        current.update(result)
+
+    for name in known:
+        entry = cache[name]
+
+        if not set(names[name]) <= set(entry["claims"]):
+            changed.add(name)
+            continue
+
+        for cid, info in entry["claims"].items():
+            claim = current.get(cid)
+
+            if not claim or claim_state(claim) != info["state"]:
+                changed.add(name)
+                break
+
+    # New claims with the same name only appear above the stored height
+    def new_claims(name):
+        result = dmn.daemon_call("claim_search",
+                                 {"name": name,
+                                  "height": f">{cache[name]['height']}",
+                                  "page": 1, "page_size": 1,
+                                  "no_totals": True},
+                                 timeout=60,
+                                 server=server)
+        if result is False:
+            return -1
+        return len(result.get("items", []))
+
+    unchanged = [name for name in known if name not in changed]
+
+    for index, name, result in thr.fan_out(new_claims, unchanged,
+                                           limiter=limiter):
+        # A failed search (False or -1) counts as a change
+        if result is False or result != 0:
+            changed.add(name)
+
+    return changed
+
+
+def compare(name, old, new):
+    """Describe what changed in the competition of a name."""
+    out = []
+
+    if not old:
+        return [f"{name}: new name"]
+
+    if old["controlling"] != new["controlling"]:
+        out.append(f"{name}: controlling claim "
+                   f"{old['controlling']} -> {new['controlling']}")
+
+    for cid in new["claims"].keys() - old["claims"].keys():
+        out.append(f"{name}: new claim {cid}, "
+                   f"bid {new['claims'][cid]['effective']:.8f}")
+
+    for cid in old["claims"].keys() - new["claims"].keys():
+        out.append(f"{name}: claim {cid} removed")
+
+    for cid in new["claims"].keys() & old["claims"].keys():
+        before = old["claims"][cid]["effective"]
+        after = new["claims"][cid]["effective"]
+
+        if before != after:
+            out.append(f"{name}: claim {cid}, "
+                       f"bid {before:.8f} -> {after:.8f}")
+
+    return out
+
+
+def update_competition(wallet_id="default_wallet",
+                       full=False,
+                       threads=32,
+                       server="http://localhost:5279"):
+    """Get our claims and update the stored competition for their names."""
+    path = stg.data_path("controlling",
+                         stg.safe_name(wallet_id) + ".json")
+    stored = stg.load_json(path, default={})
+    cache = stored.get("names", {})
+
+    ours = []
+    names = {}
+
+    for claim, total in dmn.iter_pages("claim_list",
+                                       {"wallet_id": wallet_id,
+                                        "resolve": False},
+                                       server=server):
+        ours.append(claim)
+        names.setdefault(claim["name"], []).append(claim["claim_id"])
+
+    if full:
+        changed = set(names)
+    else:
+        changed = changed_names(names, cache, threads=threads,
+                                server=server)
+
+    print(f"Names: {len(names)}; searched again: {len(changed)}")
+
+    def search(name):
+        return name_competition(name, server=server)
+
+    changes = []
+    limiter = thr.AdaptiveLimiter(maximum=threads)
+
+    for index, name, result in thr.fan_out(search, sorted(changed),
+                                           limiter=limiter):
+        if result is False:
+            continue
+
+        changes += compare(name, cache.get(name), result)
+        cache[name] = result
+
+    for name in set(cache) - set(names):
+        del cache[name]
+
+    now = int(time.time())
+
+    stored["changes"] = {"time": now, "lines": sorted(changes)}
+
+    stored["names"] = cache
+    stored["time"] = now
+    stg.save_json(path, stored)
+
+    return {"claims": ours,
+            "names": cache,
+            "n_searched": len(changed),
+            "changes": stored["changes"]}
+
+
+def stored_changes(wallet_id="default_wallet"):
+    """Get the changes found in the last run, without searching online."""
+    path = stg.data_path("controlling",
+                         stg.safe_name(wallet_id) + ".json")
+    stored = stg.load_json(path, default={})
+
+    return stored.get("changes", {"time": 0, "lines": []})
+
+
+def claim_bid_lines(claims, names,
+                    show_controlling=False,
+                    show_non_controlling=True,
+                    skip_repost=False,
+                    channels_only=False,
+                    show_claim_id=False,
+                    show_repost_status=True,
+                    show_competing=True,
+                    show_reposts=True,
+                    compact=False,
+                    sep=";"):
+    """Build the lines of information for our claims and their bids."""
+    out = []
+    selected = []
+
+    for claim in claims:
+        entry = names.get(claim["name"])
+
+        if not entry:
+            continue
+
+        is_repost = claim.get("value_type") == "repost"
+        is_controlling = entry["controlling"] == claim["claim_id"]
+
+        if skip_repost and is_repost:
+            continue
+        if channels_only and claim.get("value_type") != "channel":
+            continue
+        if is_controlling and not show_controlling:
+            continue
+        if not is_controlling and not show_non_controlling:
+            continue
+
+        selected.append((claim, entry, is_repost, is_controlling))
+
+    n_claims = len(selected)
+
+    for num, (claim, entry, is_repost, is_controlling) in enumerate(selected,
+                                                                    start=1):
+        cid = claim["claim_id"]
+        own = entry["claims"].get(cid, {})
+        staked = own.get("effective", float(claim.get("amount", 0)))
+        others = [info["effective"]
+                  for oid, info in entry["claims"].items() if oid != cid]
+        highest = max(others) if others else 0.0
+        n_compete = len(others)
+        n_reposts = own.get("reposted", 0)
+        name = lbryt.sanitize_text(claim["name"])
+
+        if compact:
+            line = f"{num:3d}/{n_claims:3d}{sep} "
+
+            if show_claim_id:
+                line += f"{cid}{sep} "
+            if show_repost_status:
+                line += f"is repost: {str(is_repost):5s}{sep} "
+
+            line += (f"controlling: {str(is_controlling):5s}{sep} "
+                     f"staked: {staked:8.2f}{sep} "
+                     f"highest bid: {highest:8.2f}{sep} ")
+
+            if show_competing:
+                line += f"competing: {n_compete:2d}{sep} "
+            if show_reposts:
+                line += f"reposts: {n_reposts:2d}{sep} "
+
+            out.append(line + name)
+        else:
+            out += [f"Claim {num}/{n_claims}, {name}",
+                    f"claim_id: {cid}",
+                    f"is repost: {is_repost}",
+                    f"controlling: {is_controlling}",
+                    f"staked: {staked:.8f}",
+                    f"highest bid: {highest:.8f} (competing claims: "
+                    f"{n_compete})",
+                    f"reposts: {n_reposts}",
+                    ""]
+
+    return out
+
+
+def changes_text(changes):
+    """Format the stored changes of the competition."""
+    if not changes["time"]:
+        return "No previous run"
+
+    stamp = time.strftime(funcs.TFMT, time.gmtime(changes["time"]))
+    lines = changes["lines"] or ["No changes"]
+
+    return "\n".join([f"Changes found on {stamp}", 80 * "-"] + lines)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to communicate directly with the lbrynet daemon.
+
+Most operations go through `lbrytools`, which writes its results to a file
+that we then read. The methods here return the raw JSON-RPC results
+so that the interface can process them in parallel or in pieces.
+
+The `requests` library is imported when the first call is made,
+so the modules that only read local data can be imported without it.
+"""
+
+
+def daemon_call(method, params=None,
+                timeout=None,
+                print_error=True,
+                server="http://localhost:5279"):
+    """Call a method of the daemon and return the result.
+
+    If the daemon answers with an error it returns `False`.
+    Connection problems and timeouts raise the exceptions
+    of the `requests` library, so that the caller can tell
+    a busy or unreachable server apart from a failed request.
+    """
+    import requests
+
+    msg = {"method": method,
+           "params": params or {}}
+
+    output = requests.post(server, json=msg, timeout=timeout).json()
+
+    if "error" in output:
+        error = output["error"]
+
+        if isinstance(error, dict):
+            error = error.get("message", error)
+
+        if print_error:
+            print(f"{method}: {error}")
+
+        return False
+
+    return output["result"]
+
+
+def iter_pages(method, params=None,
+               page_size=50, limit=0,
+               timeout=None, state=None, limiter=None,
+               server="http://localhost:5279"):
+    """Walk the pages of a paginated method of the daemon.
+
+    It is a generator that yields `(item, total_items)` one item at a time,
+    requesting a new page only when the previous one is exhausted.
+    If `limit` is larger than 0 it stops after that many items.
+    If a `state` dictionary is given, its 'complete' key is set
+    to `True` once the walk ends without an error of the daemon.
+    If a `limiter` is given, each page is requested within its limit.
+    """
+    params = dict(params or {})
+    page = 1
+    n_items = 0
+
+    while True:
+        params["page"] = page
+        params["page_size"] = page_size
+
+        if limiter:
+            result = limiter.call(daemon_call, method, params,
+                                  timeout=timeout, server=server)
+        else:
+            result = daemon_call(method, params, timeout=timeout,
+                                 server=server)
+
+        if not result:
+            return
+
+        items = result.get("items", [])
+        total = result.get("total_items")
+
+        for item in items:
+            yield item, total
+            n_items += 1
+
+            if 0 < limit <= n_items:
+                if state is not None:
+                    state["complete"] = True
+                return
+
+        total_pages = result.get("total_pages")
+
+        if not items or (total_pages is not None and page >= total_pages):
+            if state is not None:
+                state["complete"] = True
+            return
+
+        page += 1
+
+
+def iter_pages_reversed(method, params=None,
+                        page_size=50,
+                        timeout=None,
+                        server="http://localhost:5279"):
+    """Walk the pages of a paginated method of the daemon from the end.
+
+    The first page is requested to know the number of pages,
+    and then the pages are requested from the last one to the first,
+    so the items are yielded as `(item, total_items)` in reverse order,
+    one page in memory at a time.
+    """
+    params = dict(params or {})
+    params["page"] = 1
+    params["page_size"] = page_size
+
+    first = daemon_call(method, params, timeout=timeout, server=server)
+
+    if not first:
+        return
+
+    total_pages = first.get("total_pages") or 1
+
+    for page in range(total_pages, 0, -1):
+        if page == 1:
+            result = first
+        else:
+            params["page"] = page
+            result = daemon_call(method, params, timeout=timeout,
+                                 server=server)
+
+        if not result:
+            return
+
+        total = result.get("total_items")
+
+        for item in reversed(result.get("items", [])):
+            yield item, total
+
+
+def chunks(items, size=50):
+    """Split a list into pieces of at most `size` elements."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def claims_by_id(claim_ids,
+                 timeout=None,
+                 server="http://localhost:5279"):
+    """Search up to 50 claims by claim ID in a single request.
+
+    It returns a dictionary with the claim ID as key;
+    claims that don't exist any more are not included.
+    """
+    result = daemon_call("claim_search",
+                         {"claim_ids": list(claim_ids),
+                          "page": 1, "page_size": len(claim_ids),
+                          "no_totals": True},
+                         timeout=timeout,
+                         server=server)
+
+    if result is False:
+        return False
+
+    return {claim["claim_id"]: claim for claim in result.get("items", [])}
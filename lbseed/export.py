@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to export listings to files for other programs.
+
+The records are written as they are produced, so the whole table
+is never kept in memory. Each column has a type, see `records`;
+times are written as ISO 8601 dates in UTC.
+
+The Parquet format requires the `pyarrow` library.
+"""
+import csv
+import json
+import time
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def iso_time(value):
+    """Convert a UNIX timestamp into an ISO 8601 date, or empty if 0."""
+    if not value:
+        return ""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(value))
+
+
+def typed_record(record, columns):
+    """Make sure the values have the type of their columns."""
+    out = {}
+
+    for name, typ in columns:
+        value = record.get(name)
+
+        if typ in ("int", "time"):
+            value = int(value or 0)
+        elif typ == "float":
+            value = float(value or 0)
+        elif typ == "bool":
+            value = bool(value)
+        else:
+            value = "" if value is None else str(value)
+
+        out[name] = value
+
+    return out
+
+
+def write_csv(records, columns, path):
+    """Write the records into a CSV file, one by one."""
+    n_rows = 0
+
+    with open(path, "w", newline="", encoding="utf-8") as fd:
+        writer = csv.writer(fd)
+        writer.writerow([name for name, typ in columns])
+
+        for record in records:
+            record = typed_record(record, columns)
+
+            writer.writerow([iso_time(record[name]) if typ == "time"
+                             else record[name]
+                             for name, typ in columns])
+            n_rows += 1
+
+    return n_rows
+
+
+def write_jsonl(records, columns, path):
+    """Write the records into a JSON Lines file, one object per line."""
+    n_rows = 0
+
+    with open(path, "w", encoding="utf-8") as fd:
+        for record in records:
+            record = typed_record(record, columns)
+
+            for name, typ in columns:
+                if typ == "time":
+                    record[name] = iso_time(record[name]) or None
+
+            fd.write(json.dumps(record, ensure_ascii=False) + "\n")
+            n_rows += 1
+
+    return n_rows
+
+
+def write_parquet(records, columns, path, batch=10000):
+    """Write the records into a Parquet file, in batches of rows."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ModuleNotFoundError:
+        print("Exporting to Parquet requires the 'pyarrow' library")
+        return False
+
+    types = {"str": pa.string(),
+             "int": pa.int64(),
+             "float": pa.float64(),
+             "bool": pa.bool_(),
+             "time": pa.timestamp("s", tz="UTC")}
+
+    schema = pa.schema([(name, types[typ]) for name, typ in columns])
+    n_rows = 0
+
+    def flush(writer, rows):
+        arrays = {}
+
+        for name, typ in columns:
+            values = [row[name] for row in rows]
+
+            if typ == "time":
+                values = [v if v else None for v in values]
+
+            arrays[name] = values
+
+        writer.write_table(pa.Table.from_pydict(arrays, schema=schema))
+
+    with pq.ParquetWriter(path, schema) as writer:
+        rows = []
+
+        for record in records:
+            rows.append(typed_record(record, columns))
+            n_rows += 1
+
+            if len(rows) >= batch:
+                flush(writer, rows)
+                rows = []
+
+        if rows:
+            flush(writer, rows)
+
+    return n_rows
+
+
+def export_records(records, columns, path, fmt="csv"):
+    """Write the records into a file in the given format.
+
+    It returns the number of rows written, or `False` on error.
+    """
+    if fmt not in FORMATS:
+        print(f"Unknown format: {fmt}; use one of {FORMATS}")
+        return False
+
+    if fmt == "csv":
+        return write_csv(records, columns, path)
+    elif fmt == "jsonl":
+        return write_jsonl(records, columns, path)
+    elif fmt == "parquet":
+        return write_parquet(records, columns, path)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to find the downloaded claims that are no longer online.
+
+Each downloaded claim is verified by searching it by claim ID,
+50 claims per request and several requests in parallel.
+The result of every verification is kept locally with its time,
+so in later runs only the claims not verified in the last hours
+are searched again, and the last result can be shown without
+asking the network at all.
+"""
+import time
+
+import lbrytools as lbryt
+import lbrytools.funcs as funcs
+
+import lbseed.daemon as dmn
+import lbseed.storage as stg
+import lbseed.throttle as thr
+
+
+def record_path():
+    """Path of the local record of verified claims."""
+    return stg.data_path("invalid", "claims.json")
+
+
+def load_record():
+    """Load the last record of verified claims."""
+    return stg.load_json(record_path(),
+                         default={"claims": {}, "items": {}, "time": 0})
+
+
+def file_item(item):
+    """Compact description of a downloaded file, to show it later."""
+    metadata = item.get("metadata") or {}
+
+    return {"claim_id": item["claim_id"],
+            "name": item.get("claim_name", ""),
+            "title": metadata.get("title", ""),
+            "channel": item.get("channel_name") or "",
+            "channel_id": item.get("channel_claim_id") or "",
+            "path": item.get("download_path") or "",
+            "release_time": int(metadata.get("release_time")
+                                or item.get("added_on") or 0),
+            "height": int(item.get("height") or 0),
+            "blobs": int(item.get("blobs_completed") or 0),
+            "blobs_in_stream": int(item.get("blobs_in_stream") or 0),
+            "size": int(item.get("total_bytes")
+                        or item.get("total_bytes_lower_bound") or 0)}
+
+
+def channel_filter(channel):
+    """Split a channel into its name and the start of its claim ID.
+
+    The channel may be written as '@name', '@name#id', or '@name:id',
+    with or without 'lbry://', and the ID may be partial.
+    It returns a function that tells if an item is in that channel;
+    without `channel` every item is.
+    """
+    if not channel:
+        return lambda item: True
+
+    channel = channel.strip()
+
+    if channel.startswith("lbry://"):
+        channel = channel[len("lbry://"):]
+
+    if not channel.startswith("@"):
+        channel = "@" + channel
+
+    name, _, cid = channel.replace(":", "#").partition("#")
+
+    def in_channel(item):
+        return (item["channel"] == name
+                and item.get("channel_id", "").startswith(cid))
+
+    return in_channel
+
+
+def verify_claims(claim_ids, threads=32,
+                  server="http://localhost:5279"):
+    """Search the claims by claim ID in parallel batches.
+
+    It returns a dictionary with `True` for the claims that still exist,
+    and `False` for those that don't; claims in batches that failed
+    are not included.
+    """
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+
+    def search(batch):
+        return dmn.claims_by_id(batch, server=server)
+
+    verified = {}
+
+    for num, batch, found in thr.fan_out(search, dmn.chunks(claim_ids),
+                                         limiter=limiter):
+        if found is False:
+            continue
+
+        for claim_id in batch:
+            verified[claim_id] = claim_id in found
+
+    return verified
+
+
+def scan_invalid(channel=None, hours=24, threads=32,
+                 server="http://localhost:5279"):
+    """Find the downloaded claims that are invalid, updating the record.
+
+    Only the claims that were not verified in the last `hours`
+    are searched online; with 0 all claims are searched.
+    If `channel` is given, only the claims of that channel are verified;
+    it may include the claim ID of the channel, or part of it.
+    If the downloaded claims can't be listed, the previous record
+    is returned and kept as it is.
+    """
+    record = load_record()
+    now = int(time.time())
+    limit = now - hours * 3600
+
+    items = {}
+    state = {}
+
+    for item, total in dmn.iter_pages("file_list", {}, page_size=100,
+                                      state=state,
+                                      server=server):
+        if item.get("claim_id"):
+            items[item["claim_id"]] = file_item(item)
+
+    if not state.get("complete"):
+        print("The downloaded claims could not be listed; "
+              "the previous record is kept")
+        return record
+
+    in_channel = channel_filter(channel)
+    old = record["claims"]
+    claims = {cid: old[cid] for cid in items if cid in old}
+
+    pending = [cid for cid, item in items.items()
+               if in_channel(item)
+               and (cid not in claims or claims[cid]["checked"] <= limit)]
+
+    verified = verify_claims(pending, threads=threads, server=server)
+
+    for cid, valid in verified.items():
+        claims[cid] = {"valid": valid, "checked": now}
+
+    record = {"claims": claims,
+              "items": {cid: item for cid, item in items.items()
+                        if cid in claims and not claims[cid]["valid"]},
+              "n_files": len(items),
+              "verified": len(verified),
+              "failed": len(pending) - len(verified),
+              "time": now}
+
+    stg.save_json(record_path(), record)
+
+    return record
+
+
+def invalid_lines(record, channel=None,
+                  blocks=False, cid=False, blobs=True, size=True,
+                  show_channel=False, show_out="name",
+                  reverse=False, sanitize=True, sep=";"):
+    """Summary and lines of the invalid claims in a record."""
+    in_channel = channel_filter(channel)
+    items = [item for item in record["items"].values()
+             if in_channel(item)]
+    items.sort(key=lambda item: item["release_time"], reverse=reverse)
+
+    n_items = len(items)
+    total_size = 0
+    out = []
+
+    for num, item in enumerate(items, start=1):
+        total_size += item["size"]
+        rels_time = time.strftime(funcs.TFMT,
+                                  time.gmtime(item["release_time"]))
+
+        line = f"{num:4d}/{n_items:4d}{sep} {rels_time}{sep} "
+
+        if blocks:
+            line += f"{item['height']:8d}{sep} "
+
+        if cid:
+            line += f"{item['claim_id']}{sep} "
+
+        if blobs:
+            line += f"{item['blobs']:3d}/{item['blobs_in_stream']:3d}{sep} "
+
+        if size:
+            line += f"{item['size'] / (1024**2):9.4f} MB{sep} "
+
+        if show_channel:
+            channel_name = item["channel"] or "_Unknown_"
+            if sanitize:
+                channel_name = lbryt.sanitize_text(channel_name)
+            line += f"{channel_name}{sep} "
+
+        if show_out == "title":
+            text = item["title"]
+            if sanitize:
+                text = lbryt.sanitize_text(text)
+            line += f'"{text}"'
+        elif show_out == "path":
+            line += f'"{item["path"]}"'
+        else:
+            line += f'"{item["name"]}"'
+
+        out.append(line)
+
+    if record["time"]:
+        verified = time.strftime(funcs.TFMT, time.gmtime(record["time"]))
+    else:
+        verified = "never"
+
+    if record["claims"]:
+        oldest = min(claim["checked"] for claim in record["claims"].values())
+        oldest = time.strftime(funcs.TFMT, time.gmtime(oldest))
+    else:
+        oldest = "never"
+
+    summary = (f"Invalid claims: {n_items}{sep} "
+               f"size: {total_size / (1024**3):.4f} GB{sep} "
+               f"downloaded claims: {record.get('n_files', 0)}\n"
+               f"Last verified: {verified}{sep} "
+               f"searched online: {record.get('verified', 0)}{sep} "
+               f"failed: {record.get('failed', 0)}{sep} "
+               f"oldest result: {oldest}")
+
+    return {"summary": summary,
+            "lines": "\n".join(out)}
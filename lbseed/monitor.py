@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to watch the blobs that the daemon uploads and downloads now.
+
+A thread follows the end of the log of the daemon, like `tail -f`,
+also when the daemon rotates it, and adds every blob sent
+or received to counters of one second in ring buffers
+that cover the last hour, so the memory used is constant.
+The totals of the last minute, 15 minutes, and hour
+are sums over the newest slots of the rings.
+"""
+import array
+import collections
+import os
+import threading
+import time
+
+import lbseed.seeding as sdg
+
+WINDOWS = (("1 minute", 60),
+           ("15 minutes", 900),
+           ("1 hour", 3600))
+
+
+class RingCounter:
+    """Counters of the last `span` seconds, one slot per second.
+
+    Each slot keeps the blobs and bytes uploaded,
+    and the blobs downloaded, in that second.
+    """
+    def __init__(self, span=3600):
+        self.span = span
+        self.seconds = array.array("q", [-1] * span)
+        self.up = array.array("q", [0] * span)
+        self.sent = array.array("q", [0] * span)
+        self.down = array.array("q", [0] * span)
+
+    def add(self, stamp, kind, size):
+        """Count a blob sent or received at a time."""
+        second = int(stamp)
+        slot = second % self.span
+
+        if self.seconds[slot] != second:
+            # The slot holds an older second, which is now reused
+            self.seconds[slot] = second
+            self.up[slot] = self.sent[slot] = self.down[slot] = 0
+
+        if kind == sdg.UP:
+            self.up[slot] += 1
+            self.sent[slot] += size
+        else:
+            self.down[slot] += 1
+
+    def totals(self, seconds, now=None):
+        """Blobs uploaded, bytes sent, and blobs downloaded recently."""
+        now = int(now or time.time())
+        since = now - min(seconds, self.span)
+        up = sent = down = 0
+
+        for slot in range(self.span):
+            if since < self.seconds[slot] <= now:
+                up += self.up[slot]
+                sent += self.sent[slot]
+                down += self.down[slot]
+
+        return up, sent, down
+
+
+class LogMonitor:
+    """Follow the log of the daemon in a thread, and count the blobs.
+
+    The log is read from its end, so only new activity is counted.
+    The peers seen in the last hour are kept, up to `max_peers`.
+    """
+    def __init__(self, data_dir, interval=1.0, max_peers=10000):
+        self.path = os.path.join(data_dir, sdg.LOG_NAME)
+        self.interval = interval
+        self.max_peers = max_peers
+
+        self.counter = RingCounter()
+        self.peers = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.fd = None
+        self.inode = None
+        self.buffer = b""
+        self.started = time.time()
+
+    def start(self):
+        """Start following the log."""
+        self.open_log(from_end=True)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop following the log, and close it."""
+        self.stop_event.set()
+
+        if self.thread:
+            self.thread.join()
+
+        if self.fd:
+            self.fd.close()
+            self.fd = None
+
+    def running(self):
+        return bool(self.thread) and not self.stop_event.is_set()
+
+    def open_log(self, from_end=False):
+        try:
+            fd = open(self.path, "rb")
+        except OSError:
+            return False
+
+        if from_end:
+            fd.seek(0, os.SEEK_END)
+
+        if self.fd:
+            self.fd.close()
+
+        self.fd = fd
+        self.inode = os.fstat(fd.fileno()).st_ino
+        self.buffer = b""
+        return True
+
+    def rotated(self):
+        """Whether the path now points to a new log file."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+
+        position = self.fd.tell() if self.fd else 0
+        return st.st_ino != self.inode or st.st_size < position
+
+    def read_lines(self):
+        """Read the new complete lines of the log."""
+        if not self.fd:
+            self.open_log()
+            return []
+
+        data = self.buffer + self.fd.read()
+
+        if self.rotated():
+            # Finish the old file before following the new one
+            data += self.fd.read()
+            self.open_log()
+
+        end = data.rfind(b"\n") + 1
+        self.buffer = data[end:]
+        return data[:end].splitlines()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            for line in self.read_lines():
+                if b"blob_exchange" not in line:
+                    continue
+
+                event = sdg.parse_event(line.decode("utf-8",
+                                                    errors="replace"))
+
+                if event:
+                    self.count(event)
+
+    def count(self, event):
+        stamp, kind, blob, size, peer = event
+
+        with self.lock:
+            self.counter.add(stamp, kind, size)
+
+            if peer:
+                self.peers[peer] = stamp
+                self.peers.move_to_end(peer)
+
+                while len(self.peers) > self.max_peers:
+                    self.peers.popitem(last=False)
+
+    def active_peers(self, seconds, now):
+        with self.lock:
+            return sum(1 for stamp in self.peers.values()
+                       if stamp > now - seconds)
+
+    def text(self, now=None, sep=";"):
+        """Totals of the last minute, 15 minutes, and hour."""
+        now = now or time.time()
+        out = [f"Following: {self.path}{sep} "
+               f"for {int(now - self.started) // 60} minutes"]
+
+        for label, seconds in WINDOWS:
+            with self.lock:
+                up, sent, down = self.counter.totals(seconds, now)
+
+            peers = self.active_peers(seconds, now)
+            out.append(f"{'Last ' + label + ':':17s} "
+                       f"up: {up:6d} blobs "
+                       f"({sent / 1024**2 / seconds:7.3f} MiB/s){sep} "
+                       f"down: {down:6d} blobs{sep} "
+                       f"peers: {peers:4d}")
+
+        return "\n".join(out)
@@ -45,10 +45,12 @@ from lbseed.pages_lists import (ListDownPage, ListDownInvalidPage,
                                 ListChClaimsPage, SubscribedChsPage,
                                 ListPubChsPage, ListPubClaimsPage,
                                 ControllingClaimsPage)
-from lbseed.pages_comments import CommentsPage
+from lbseed.pages_comments import (CommentsPage, CommentSearchPage,
+                                   ChannelCommentsPage)
 from lbseed.pages_peers import (ListClsPeersPage,
                                 ListChPeersPage, ListChsPeersPage,
-                                ListSubsPeersPage, SeedPage)
+                                ListSubsPeersPage, SeedPage,
+                                SeedPlanPage)
 from lbseed.pages_del import DeleteClaimsPage, DeleteChsPage
 from lbseed.pages_support import SupportListPage, SupportUpdatePage
 from lbseed.pages_search import TrendPage, SearchPage
@@ -69,12 +71,15 @@ True if ListPubClaimsPage else False
 True if ControllingClaimsPage else False
 
 True if CommentsPage else False
+True if CommentSearchPage else False
+True if ChannelCommentsPage else False
 
 True if ListClsPeersPage else False
 True if ListChPeersPage else False
 True if ListChsPeersPage else False
 True if ListSubsPeersPage else False
 True if SeedPage else False
+True if SeedPlanPage else False
 
 True if DeleteClaimsPage else False
 True if DeleteChsPage else False
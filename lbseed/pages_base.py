@@ -55,7 +55,8 @@ class SettingsPage:
         frame = ttk.Frame(parent)
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_settings(frame, start=0)
-        self.setup_info_settings(frame, start=2)
+        self.setup_grid_peer_cache(frame, start=2)
+        self.setup_info_settings(frame, start=4)
 
     def setup_grid_top_settings(self, parent, start=0):
         entry, label = \
@@ -75,6 +76,26 @@ class SettingsPage:
                                         "for the running 'lbrynet' daemon"),
                                 start=start+1)
 
+    def setup_grid_peer_cache(self, parent, start=0):
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=10000, incr=1,
+                              default=30,
+                              s_text_var=self.spin_peer_cache_min,
+                              s_command=self.set_peer_cache,
+                              l_text=("Minutes to keep the results "
+                                      "of peer searches for all peer pages; "
+                                      "use 0 to always search again"),
+                              start=start)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=1E6, incr=100,
+                              default=5000,
+                              s_text_var=self.spin_peer_cache_size,
+                              s_command=self.set_peer_cache,
+                              l_text=("Maximum number of streams "
+                                      "whose peers are kept"),
+                              start=start+1)
+
     def setup_info_settings(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("The settings that aren't specified "
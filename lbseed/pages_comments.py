@@ -67,6 +67,8 @@ class CommentsReplyPage:
         frame2.pack(padx=4, pady=4, fill="x")
         frame3 = ttk.Frame(parent)
         frame3.pack(padx=4, pady=4, fill="x")
+        frame_batch = ttk.Frame(parent)
+        frame_batch.pack(padx=4, pady=4, fill="x")
         frame4 = ttk.Frame(parent)
         frame4.pack(padx=4, pady=4, fill="both", expand=True)
         frame5 = ttk.Frame(parent)
@@ -74,6 +76,7 @@ class CommentsReplyPage:
         self.setup_cmnt_claim(frame1)
         self.setup_rep_cmnt(frame2)
         self.setup_rep_chck(frame3)
+        self.setup_rep_batch(frame_batch)
         self.setup_textbox_rep_cmnt(frame4)
         self.setup_reply_status(frame5)
 
@@ -142,6 +145,44 @@ class CommentsReplyPage:
                                              value="standalone")
         self.rad_rep_alone.grid(row=0, column=2, columnspan=1, sticky=tk.W)
 
+    def setup_rep_batch(self, parent):
+        r_active = ttk.Radiobutton(parent,
+                                   text="Only the active comment",
+                                   variable=self.rad_rep_targets,
+                                   value="active")
+        r_selected = ttk.Radiobutton(parent,
+                                     text="All selected comments",
+                                     variable=self.rad_rep_targets,
+                                     value="selected")
+        r_search = ttk.Radiobutton(parent,
+                                   text="All comments of the last search",
+                                   variable=self.rad_rep_targets,
+                                   value="search")
+        r_active.grid(row=0, column=0, sticky=tk.W)
+        r_selected.grid(row=0, column=1, sticky=tk.W)
+        r_search.grid(row=0, column=2, sticky=tk.W)
+
+        frame = ttk.Frame(parent)
+        frame.grid(row=1, column=0, columnspan=3, sticky=tk.W)
+
+        blocks.setup_spin_gen(frame,
+                              frm=1, to=32, incr=1,
+                              default=4,
+                              s_text_var=self.spin_batch_threads,
+                              s_command=lambda: None,
+                              l_text=("Maximum number of comments "
+                                      "sent in parallel"),
+                              start=0)
+
+        blocks.setup_spin_gen(frame,
+                              frm=0, to=100, incr=0.5,
+                              default=2,
+                              s_text_var=self.spin_batch_rate,
+                              s_command=lambda: None,
+                              l_text=("Maximum number of comments "
+                                      "sent per second; use 0 for no limit"),
+                              start=1)
+
     def _state_textbox_reply(self, state="normal"):
         self.textbox_cmnt_rep["state"] = state
 
@@ -301,20 +342,26 @@ class CommentsPage(CommentsReplyPage):
                          command=self.reply_actions)
         btn.grid(row=0, column=0, sticky=tk.W)
 
+        btn_rep = ttk.Button(parent,
+                             text="Show or hide replies",
+                             width=self.b_width,
+                             command=self.toggle_replies)
+        btn_rep.grid(row=0, column=1, sticky=tk.W, padx=4)
+
         sep = ";"
         summary = (f"Total comments: 0{sep} "
                    f"root comments: 0{sep} "
                    "replies: 0")
 
         self.lab_cmnt_num = ttk.Label(parent, text=summary)
-        self.lab_cmnt_num.grid(row=1, column=0, sticky=tk.W)
+        self.lab_cmnt_num.grid(row=1, column=0, columnspan=2, sticky=tk.W)
 
     def setup_listbox_cmnt(self, parent):
         self.lstbox_cmnt = blocks.setup_listbox_gen(parent,
                                                     height=10,
                                                     font=self.txt_font,
                                                     list_var=self.cmnt_list)
-        self.lstbox_cmnt["selectmode"] = "browse"
+        self.lstbox_cmnt["selectmode"] = "extended"
         self.lstbox_cmnt.configure(exportselection=False)
 
         self.lstbox_cmnt.bind("<<ListboxSelect>>",
@@ -323,6 +370,10 @@ class CommentsPage(CommentsReplyPage):
                               lambda e: self.reply_actions())
         self.lstbox_cmnt.bind("<<Activate>>",
                               lambda e: self.reply_actions())
+        self.lstbox_cmnt.bind("<space>",
+                              lambda e: self.toggle_replies())
+        self.lstbox_cmnt.bind("<Shift-space>",
+                              lambda e: self.toggle_replies(nested=True))
 
     def setup_textbox_cmnt(self, parent):
         self.textbox_cmnt = blocks.setup_textbox(parent,
@@ -332,3 +383,135 @@ class CommentsPage(CommentsReplyPage):
         content = "(no claim loaded)"
         self.textbox_cmnt.replace("1.0", tk.END, content)
         self.textbox_cmnt["state"] = "disabled"
+
+
+class CommentSearchPage:
+    """Mixin class to provide the page to search the loaded comments."""
+    def setup_page_cmnt_search(self, parent):
+        self.setup_top_cmnt_search(parent)
+        self.setup_textbox_cmnt_search(parent)
+
+    def setup_top_cmnt_search(self, parent):
+        frame = ttk.Frame(parent)
+        frame.pack(padx=4, pady=4)
+        self.setup_grid_top_cmnt_search(frame, start=0)
+        self.setup_info_cmnt_search(frame, start=6)
+
+    def setup_grid_top_cmnt_search(self, parent, start=0):
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Search comments",
+                                b_command=self.search_comments,
+                                l_text=("Search the comments of the claims "
+                                        "that were displayed before"),
+                                start=start)
+
+        entries = ((self.entry_csearch_text,
+                    "Words to find; use double quotes for a phrase"),
+                   (self.entry_csearch_author,
+                    "Channel of the author, or the start of its name"),
+                   (self.entry_csearch_since,
+                    "From this date, YYYY-MM-DD"),
+                   (self.entry_csearch_until,
+                    "Until this date, YYYY-MM-DD"))
+
+        for num, (text_var, l_text) in enumerate(entries, start=1):
+            entry, label = \
+                blocks.setup_entry_gen(parent,
+                                       font=self.e_font,
+                                       text_var=text_var,
+                                       l_text=l_text,
+                                       start=start+num)
+            entry.bind("<<Activate>>",
+                       blocks.f_with_event(self.search_comments))
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=100000, incr=10,
+                              default=200,
+                              s_text_var=self.spin_csearch_num,
+                              s_command=self.search_comments,
+                              l_text="Maximum number of comments to show",
+                              start=start+5)
+
+    def setup_info_cmnt_search(self, parent, start=0):
+        info = ttk.Label(parent,
+                         text=("The search doesn't use the comment server; "
+                               "display the comments of a claim\n"
+                               "in the 'Claim comments' page "
+                               "to add them to the search."))
+        info.grid(row=start, column=0, columnspan=2, sticky=tk.W)
+
+    def setup_textbox_cmnt_search(self, parent):
+        self.textbox_cmnt_search = \
+            blocks.setup_textbox(parent, font=self.txt_lst_font)
+        self.textbox_cmnt_search["state"] = "disabled"
+
+
+class ChannelCommentsPage:
+    """Mixin class to provide the page with the comments of a channel."""
+    def setup_page_ch_cmnt(self, parent):
+        self.setup_top_ch_cmnt(parent)
+        self.setup_textbox_ch_cmnt(parent)
+
+    def setup_top_ch_cmnt(self, parent):
+        frame = ttk.Frame(parent)
+        frame.pack(padx=4, pady=4)
+        self.setup_grid_top_ch_cmnt(frame, start=0)
+        self.setup_info_ch_cmnt(frame, start=5)
+
+    def setup_grid_top_ch_cmnt(self, parent, start=0):
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Display channel comments",
+                                b_command=self.list_ch_comments,
+                                l_text=("Show the comments of the claims "
+                                        "of the channel, newest first"),
+                                start=start)
+
+        entry, label = \
+            blocks.setup_entry_gen(parent,
+                                   font=self.e_font,
+                                   text_var=self.entry_chcm_chan,
+                                   l_text="Channel",
+                                   start=start+1)
+        entry.bind("<<Activate>>",
+                   blocks.f_with_event(self.list_ch_comments))
+
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=10000, incr=1,
+                              default=50,
+                              s_text_var=self.spin_chcm_num,
+                              s_command=self.list_ch_comments,
+                              l_text=("Number of newest claims "
+                                      "of the channel; use 0 for all"),
+                              start=start+2)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=64, incr=1,
+                              default=8,
+                              s_text_var=self.spin_chcm_threads,
+                              s_command=self.list_ch_comments,
+                              l_text=("Maximum number of claims "
+                                      "whose comments are requested "
+                                      "in parallel"),
+                              start=start+3)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=100000, incr=10,
+                              default=200,
+                              s_text_var=self.spin_chcm_limit,
+                              s_command=self.list_ch_comments,
+                              l_text="Maximum number of comments to show",
+                              start=start+4)
+
+    def setup_info_ch_cmnt(self, parent, start=0):
+        info = ttk.Label(parent,
+                         text=("The first time all comments are requested; "
+                               "later only the newer comments "
+                               "of each claim."))
+        info.grid(row=start, column=0, columnspan=2, sticky=tk.W)
+
+    def setup_textbox_ch_cmnt(self, parent):
+        self.textbox_ch_cmnt = \
+            blocks.setup_textbox(parent, font=self.txt_lst_font)
+        self.textbox_ch_cmnt["state"] = "disabled"
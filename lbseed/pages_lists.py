@@ -59,7 +59,8 @@ class ListDownPage:
         self.setup_grid_check_list_d(frame, start=2)
         self.setup_grid_radio_list_d(frame, start=7)
         self.setup_grid_check_reverse(frame, start=8)
-        self.setup_info_list_d(frame, start=9)
+        self.setup_grid_export_list_d(frame, start=9)
+        self.setup_info_list_d(frame, start=11)
 
     def setup_grid_top_list_d(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -102,6 +103,15 @@ class ListDownPage:
                                   "(newer items first, older last)"))
         chk_reverse.grid(row=start, column=1, sticky=tk.W, pady=2)
 
+    def setup_grid_export_list_d(self, parent, start=0):
+        kind = "downloaded"
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_info_list_d(self, parent, start=0):
         desc = ttk.Label(parent,
                          text=("The 'size' corresponds to the size "
@@ -134,8 +144,9 @@ class ListDownInvalidPage:
         self.setup_grid_radio_list_d_inv(frame, start=7)
         self.setup_grid_check_inv_reverse(frame, start=8)
         self.setup_grid_threads_list_d(frame, start=9)
-        self.setup_grid_info_list_d_inv(frame, start=10)
-        self.setup_info_list_d_inv(frame, start=11)
+        self.setup_grid_hours_list_d(frame, start=10)
+        self.setup_grid_info_list_d_inv(frame, start=11)
+        self.setup_info_list_d_inv(frame, start=12)
 
     def setup_grid_top_list_d_inv(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -147,7 +158,8 @@ class ListDownInvalidPage:
                                         "This operation may take "
                                         "a long time as it needs to "
                                         "search all previously downloaded\n"
-                                        "claims online."),
+                                        "claims online; the result of "
+                                        "each search is remembered."),
                                 start=start)
 
         entry, label = \
@@ -194,6 +206,17 @@ class ListDownInvalidPage:
                                       "use 0 to avoid threads"),
                               start=start)
 
+    def setup_grid_hours_list_d(self, parent, start=0):
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=10000, incr=1,
+                              default=24,
+                              s_text_var=self.spin_lst_inv_hours,
+                              s_command=self.list_d_claims_inv,
+                              l_text=("Hours before a claim is searched "
+                                      "online again; "
+                                      "use 0 to search all claims"),
+                              start=start)
+
     def setup_grid_info_list_d_inv(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("'Invalid' claims are those which "
@@ -242,15 +265,21 @@ class ListChClaimsPage:
         frame = ttk.Frame(parent)
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_ch_list(frame, start=0)
-        self.setup_grid_check_ch_list(frame, start=4)
-        self.setup_info_ch_list(frame, start=10)
+        self.setup_grid_window_ch_list(frame, start=4)
+        self.setup_grid_check_ch_list(frame, start=6)
+        self.setup_grid_export_ch_list(frame, start=12)
+        self.setup_info_ch_list(frame, start=14)
 
     def setup_grid_top_ch_list(self, parent, start=0):
         entry, label = \
             blocks.setup_entry_gen(parent,
                                    font=self.e_font,
                                    text_var=self.entry_chl_chan,
-                                   l_text="Channel to inspect",
+                                   l_text=("Channel to inspect; "
+                                           "separate several channels "
+                                           "with commas\n"
+                                           "to list their claims together, "
+                                           "ordered by release time"),
                                    start=start)
         entry.bind("<<Activate>>", blocks.f_with_event(self.list_ch_claims))
 
@@ -289,6 +318,36 @@ class ListChClaimsPage:
         spin.grid_forget()
         spin.grid(row=start+3, column=0)
 
+    def setup_grid_window_ch_list(self, parent, start=0):
+        spin, lb = \
+            blocks.setup_spin_gen(parent,
+                                  frm=1, to=100E3, incr=1,
+                                  default=1,
+                                  s_text_var=self.spin_chl_start,
+                                  s_command=self.list_ch_claims_local,
+                                  l_text=("First claim to display, "
+                                          "counting from the oldest one"),
+                                  start=start)
+        spin["width"] = 25
+        spin.grid_forget()
+        spin.grid(row=start, column=0)
+
+        spin, lb = \
+            blocks.setup_spin_gen(parent,
+                                  frm=0, to=100E3, incr=1,
+                                  default=0,
+                                  s_text_var=self.spin_chl_end,
+                                  s_command=self.list_ch_claims_local,
+                                  l_text=("Last claim to display; "
+                                          "use 0 to display until the end.\n"
+                                          "Changing these values uses "
+                                          "the claims already stored, "
+                                          "without searching online"),
+                                  start=start+1)
+        spin["width"] = 25
+        spin.grid_forget()
+        spin.grid(row=start+1, column=0)
+
     def setup_grid_check_ch_list(self, parent, start=0):
         blocks.setup_check_ch_list(parent,
                                    create_var=self.chck_chl_create,
@@ -304,6 +363,15 @@ class ListChClaimsPage:
                                    reverse_var=self.chck_chl_reverse,
                                    start=start)
 
+    def setup_grid_export_ch_list(self, parent, start=0):
+        kind = "ch_claims"
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_info_ch_list(self, parent, start=0):
         desc = ttk.Label(parent,
                          text=("'Creation' time corresponds to the time "
@@ -350,7 +418,8 @@ class SubscribedChsPage:
         self.setup_grid_top_ch_subs(frame, start=0)
         self.setup_grid_rad_ch_subs(frame, start=3)
         self.setup_grid_spin_subs(frame, start=7)
-        self.setup_info_ch_subs(frame, start=8)
+        self.setup_grid_export_ch_subs(frame, start=9)
+        self.setup_info_ch_subs(frame, start=11)
 
     def setup_grid_top_ch_subs(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -421,9 +490,31 @@ class SubscribedChsPage:
                               s_command=self.list_subscr_chs,
                               l_text=("Number of threads to resolve "
                                       "the channels; "
-                                      "use 0 to avoid threads"),
+                                      "use 0 to avoid threads.\n"
+                                      "For (b) this is the maximum, "
+                                      "the number in use adapts "
+                                      "to the response of the daemon"),
                               start=start)
 
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=500, incr=1,
+                              default=20,
+                              s_text_var=self.spin_subs_rate,
+                              s_command=self.list_subscr_chs_claims,
+                              l_text=("(b) Maximum number of searches "
+                                      "started per second; "
+                                      "use 0 for no limit"),
+                              start=start+1)
+
+    def setup_grid_export_ch_subs(self, parent, start=0):
+        kind = "subscriptions"
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_info_ch_subs(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("Channel subscriptions reside "
@@ -450,6 +541,7 @@ class ListPubChsPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_cl_ch(frame, start=0)
         self.setup_grid_check_chs(frame, start=1)
+        self.setup_grid_spin_chs(frame, start=6)
 
     def setup_grid_top_cl_ch(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -470,6 +562,16 @@ class ListPubChsPage:
                                       reverse_var=self.chck_pub_rev,
                                       start=start)
 
+    def setup_grid_spin_chs(self, parent, start=0):
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=100E3, incr=1,
+                              default=0,
+                              s_text_var=self.spin_pub_num,
+                              s_command=self.list_pub_chs,
+                              l_text=("Number of newest channels to show; "
+                                      "use 0 to show all"),
+                              start=start)
+
     def setup_textbox_p_chs(self, parent):
         self.textbox_p_chs = blocks.setup_textbox(parent,
                                                   font=self.txt_lst_font)
@@ -487,6 +589,7 @@ class ListPubClaimsPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_clms(frame, start=0)
         self.setup_grid_check_clms(frame, start=3)
+        self.setup_grid_spin_clms(frame, start=9)
 
     def setup_grid_top_clms(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -528,6 +631,16 @@ class ListPubClaimsPage:
                                   reverse_var=self.chck_pub_rev,
                                   start=start)
 
+    def setup_grid_spin_clms(self, parent, start=0):
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=100E3, incr=1,
+                              default=0,
+                              s_text_var=self.spin_pub_num,
+                              s_command=self.list_pub_claims,
+                              l_text=("Number of newest claims to show; "
+                                      "use 0 to show all"),
+                              start=start)
+
     def setup_textbox_p_claims(self, parent):
         self.textbox_p_claims = blocks.setup_textbox(parent,
                                                      font=self.txt_lst_font)
@@ -544,9 +657,10 @@ class ControllingClaimsPage:
         frame = ttk.Frame(parent)
         frame.pack(padx=4, pady=4)
         self.setup_grid_button_contr(frame, start=0)
-        self.setup_grid_check_contr(frame, start=1)
-        self.setup_grid_check_contr_compact(frame, start=5)
-        self.setup_info_contr(frame, start=6)
+        self.setup_grid_check_contr(frame, start=2)
+        self.setup_grid_check_contr_compact(frame, start=6)
+        self.setup_grid_check_contr_full(frame, start=7)
+        self.setup_info_contr(frame, start=8)
 
     def setup_grid_button_contr(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -560,6 +674,15 @@ class ControllingClaimsPage:
                                         'of the same name)'),
                                 start=start)
 
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Show last changes",
+                                b_command=self.controlling_changes,
+                                l_text=("Show what changed in the bids "
+                                        "for our names in the last run,\n"
+                                        "without searching online"),
+                                start=start+1)
+
     def setup_grid_check_contr(self, parent, start=0):
         blocks.setup_check_contr(parent,
                                  contr_var=self.check_c_contr,
@@ -597,16 +720,21 @@ class ControllingClaimsPage:
             self.chck_competing["state"] = "disabled"
             self.chck_reposts["state"] = "disabled"
 
+    def setup_grid_check_contr_full(self, parent, start=0):
+        chck_full = ttk.Checkbutton(parent,
+                                    variable=self.check_c_full,
+                                    text=("Search all names again, "
+                                          "ignoring the stored results"))
+        chck_full.grid(row=start, column=1, sticky=tk.W, pady=2)
+
     def setup_info_contr(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("'Staked' is the support in our claim while "
                                "'highest bid' is in a competing claim.\n"
-                               "Note: at the moment the counters "
-                               "for competing claims and reposts "
-                               "goes to a maximum of 50.\n"
-                               "This normally indicates that the claim "
-                               "is very popular, and thus is reposted "
-                               "by many users."))
+                               "The bids for each name are stored, "
+                               "so the next time only the names "
+                               "whose claims or supports changed\n"
+                               "are searched again."))
         info.grid(row=start, column=0, columnspan=2, sticky=tk.W)
 
     def setup_textbox_controlling(self, parent):
@@ -71,7 +71,8 @@ class ListClsPeersPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_cls_peers(frame, start=0)
         self.setup_grid_top_cls_peers_opt(frame, start=5)
-        self.setup_info_cls_peers(frame, start=9)
+        self.setup_grid_export_peers(frame, "claim_peers", start=9)
+        self.setup_info_cls_peers(frame, start=11)
 
     def setup_grid_top_cls_peers(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -195,7 +196,8 @@ class ListChPeersPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_ch_peers(frame, start=0)
         self.setup_grid_top_ch_peers_opt(frame, start=5)
-        self.setup_info_ch_peers(frame, start=9)
+        self.setup_grid_export_peers(frame, "ch_peers", start=9)
+        self.setup_info_ch_peers(frame, start=11)
 
     def setup_grid_top_ch_peers(self, parent, start=0):
         entry, label = \
@@ -281,6 +283,14 @@ class ListChPeersPage:
             self.chck_prs_typ["state"] = "normal"
             self.chck_prs_title["state"] = "normal"
 
+    def setup_grid_export_peers(self, parent, kind, start=0):
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_info_ch_peers(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("Only downloadable claims (streams) "
@@ -335,7 +345,8 @@ class ListChsPeersPage:
         frame = ttk.Frame(parent)
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_chs_peers(frame, start=0)
-        self.setup_info_chs_peers(frame, start=5)
+        self.setup_grid_export_peers(frame, "chs_peers", start=4)
+        self.setup_info_chs_peers(frame, start=6)
 
     def setup_grid_top_chs_peers(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -363,26 +374,17 @@ class ListChsPeersPage:
                                         "and going back in time"),
                                 start=start+2)
 
-        blocks.setup_spin_gen(parent,
-                              frm=0, to=512, incr=1,
-                              default=16,
-                              s_text_var=self.spin_chs_ch_threads,
-                              s_command=self.list_chs_peers,
-                              l_text=("Number of threads to process "
-                                      "channels in parallel; "
-                                      "use 0 to avoid threads"),
-                              start=start+3)
-
         blocks.setup_spin_gen(parent,
                               frm=0, to=512, incr=1,
                               default=32,
-                              s_text_var=self.spin_chs_cl_threads,
+                              s_text_var=self.spin_chs_threads,
                               s_command=self.list_chs_peers,
-                              l_text=("Number of threads to process "
-                                      "claims in parallel "
-                                      "and find peers; "
+                              l_text=("Maximum number of searches "
+                                      "in parallel, for all channels;\n"
+                                      "fewer are used if the searches "
+                                      "become slow; "
                                       "use 0 to avoid threads"),
-                              start=start+4)
+                              start=start+3)
 
     def setup_info_chs_peers(self, parent, start=0):
         info = ttk.Label(parent,
@@ -438,7 +440,9 @@ class ListSubsPeersPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_top_subs_peers(frame, start=0)
         self.setup_grid_top_subs_peers_opt(frame, start=4)
-        self.setup_info_subs_peers(frame, start=6)
+        self.setup_grid_history_subs_peers(frame, start=6)
+        self.setup_grid_export_peers(frame, "subs_peers", start=10)
+        self.setup_info_subs_peers(frame, start=12)
 
     def setup_grid_top_subs_peers(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -464,22 +468,24 @@ class ListSubsPeersPage:
         blocks.setup_spin_gen(parent,
                               frm=0, to=512, incr=1,
                               default=32,
-                              s_text_var=self.spin_subs_ch_threads,
+                              s_text_var=self.spin_subs_pr_threads,
                               s_command=self.list_ch_subs_peers,
-                              l_text=("Number of threads to process "
-                                      "channels in parallel; "
+                              l_text=("Maximum number of searches "
+                                      "in parallel, for all channels;\n"
+                                      "fewer are used if the searches "
+                                      "become slow; "
                                       "use 0 to avoid threads"),
                               start=start+2)
 
         blocks.setup_spin_gen(parent,
-                              frm=0, to=512, incr=1,
-                              default=16,
-                              s_text_var=self.spin_subs_cl_threads,
+                              frm=0, to=100E3, incr=1,
+                              default=0,
+                              s_text_var=self.spin_subs_sample,
                               s_command=self.list_ch_subs_peers,
-                              l_text=("Number of threads to process "
-                                      "claims in parallel "
-                                      "and find peers; "
-                                      "use 0 to avoid threads"),
+                              l_text=("Number of those claims to search "
+                                      "at random in each channel, "
+                                      "to estimate the totals;\n"
+                                      "use 0 to search all of them"),
                               start=start+3)
 
     def setup_grid_top_subs_peers_opt(self, parent, start=0):
@@ -497,6 +503,40 @@ class ListSubsPeersPage:
                                           show_var=self.rad_subs_pr_show,
                                           start=0)
 
+    def setup_grid_history_subs_peers(self, parent, start=0):
+        chck_record = ttk.Checkbutton(parent,
+                                      variable=self.check_subs_record,
+                                      text=("Record the peers in the history, "
+                                            "and list them again "
+                                            "periodically"))
+        chck_record.grid(row=start, column=1, sticky=tk.W)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=10000, incr=1,
+                              default=60,
+                              s_text_var=self.spin_subs_interval,
+                              s_command=self.list_ch_subs_peers,
+                              l_text="Minutes between recordings",
+                              start=start+1)
+
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Show peer trends",
+                                b_command=self.show_peer_trends,
+                                l_text=("Show the channels and streams "
+                                        "that are losing peers, "
+                                        "from the history "
+                                        "(requires NumPy)"),
+                                start=start+2)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=10000, incr=1,
+                              default=7,
+                              s_text_var=self.spin_subs_trend_days,
+                              s_command=self.show_peer_trends,
+                              l_text="Days of history to use for the trends",
+                              start=start+3)
+
     def setup_info_subs_peers(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("Only downloadable claims (streams) "
@@ -533,7 +573,9 @@ class SeedPage:
         frame.pack(padx=4, pady=4)
         self.setup_grid_button_seed(frame, start=0)
         self.setup_grid_check_seed(frame, start=1)
-        self.setup_info_seed(frame, start=2)
+        self.setup_grid_bucket_seed(frame, start=3)
+        self.setup_grid_monitor_seed(frame, start=5)
+        self.setup_info_seed(frame, start=7)
 
     def setup_grid_button_seed(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -553,6 +595,51 @@ class SeedPage:
                                          "(requires Matplotlib)"))
         chk_plot.grid(row=start, column=1, sticky=tk.W)
 
+        chk_claims = ttk.Checkbutton(parent,
+                                     variable=self.check_seed_claims,
+                                     text=("Show the uploads "
+                                           "by claim and by channel"))
+        chk_claims.grid(row=start+1, column=1, sticky=tk.W)
+
+    def setup_grid_bucket_seed(self, parent, start=0):
+        frame = ttk.Frame(parent)
+        frame.grid(row=start, column=1, sticky=tk.W)
+
+        r_hour = ttk.Radiobutton(frame,
+                                 text="Show totals by hour",
+                                 variable=self.rad_seed_bucket,
+                                 value="hour")
+        r_day = ttk.Radiobutton(frame,
+                                text="Show totals by day",
+                                variable=self.rad_seed_bucket,
+                                value="day")
+        r_hour.grid(row=0, column=0, sticky=tk.W)
+        r_day.grid(row=0, column=1, sticky=tk.W)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=10000, incr=1,
+                              default=30,
+                              s_text_var=self.spin_seed_buckets,
+                              s_command=self.seeding_ratio,
+                              l_text=("Number of hours or days to show "
+                                      "(requires NumPy)"),
+                              start=start+1)
+
+    def setup_grid_monitor_seed(self, parent, start=0):
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Start/stop live monitor",
+                                b_command=self.toggle_monitor,
+                                l_text=("Follow the log of the daemon, "
+                                        "and count the blobs "
+                                        "sent and received now."),
+                                start=start)
+
+        label = ttk.Label(parent,
+                          textvariable=self.monitor_text,
+                          font=self.txt_lst_font)
+        label.grid(row=start+1, column=0, columnspan=2, sticky=tk.W)
+
     def setup_info_seed(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("If uploaded blobs is 0, "
@@ -570,12 +657,138 @@ class SeedPage:
         self.top_plot.withdraw()
         self.top_plot.title("Upload/download seeding ratio")
         self.top_plot.protocol("WM_DELETE_WINDOW", self.remove_plot)
+        self.plot_canvas = None
         return self.top_plot
 
     def remove_plot(self):
+        # The figure is kept, and reused the next time it is drawn
         self.top_plot.withdraw()
-
-        values = list(self.top_plot.children.values())
-        for v in values:
-            v.destroy()
         return self.top_plot
+
+    def plot_points(self):
+        """Maximum number of bars that fit in the width of the plot."""
+        width = self.top_plot.winfo_width()
+
+        if width <= 1:
+            width = self.winfo_screenwidth() // 2
+
+        return max(10, width // 4)
+
+    def draw_plot(self, data):
+        """Draw the plot data computed by `actions.i_seeding_ratio`."""
+        import lbseed.seed_stats as sst
+
+        if not self.plot_canvas:
+            self.plot_canvas = sst.setup_canvas(self.top_plot)
+
+            if not self.plot_canvas:
+                return False
+
+        sst.draw_buckets(self.plot_canvas.figure, data)
+        self.plot_canvas.draw_idle()
+        self.top_plot.deiconify()
+        return True
+
+
+class SeedPlanPage:
+    """Mixin class to provide the seed planner page to the application."""
+    def setup_page_seed_plan(self, parent):
+        self.setup_top_seed_plan(parent)
+        self.setup_textbox_seed_plan(parent)
+
+    def setup_top_seed_plan(self, parent):
+        frame = ttk.Frame(parent)
+        frame.pack(padx=4, pady=4)
+        self.setup_grid_top_seed_plan(frame, start=0)
+        self.setup_grid_source_seed_plan(frame, start=6)
+        self.setup_info_seed_plan(frame, start=7)
+
+    def setup_grid_top_seed_plan(self, parent, start=0):
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Plan seeding",
+                                b_command=self.plan_seeding,
+                                l_text=("Rank the candidate streams "
+                                        "by the value of seeding them,\n"
+                                        "and choose the best ones "
+                                        "that fit in the budget"),
+                                start=start)
+
+        entry, label = \
+            blocks.setup_entry_gen(parent,
+                                   font=self.e_font,
+                                   text_var=self.entry_plan_text,
+                                   l_text=("Channels separated by commas, "
+                                           "or text to search"),
+                                   start=start+1)
+        entry.bind("<<Activate>>", blocks.f_with_event(self.plan_seeding))
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=1000, incr=1,
+                              default=5,
+                              s_text_var=self.spin_plan_num,
+                              s_command=self.plan_seeding,
+                              l_text=("Number of newest streams "
+                                      "of each channel, "
+                                      "or number of search results"),
+                              start=start+2)
+
+        blocks.setup_spin_gen(parent,
+                              frm=1, to=100E3, incr=1,
+                              default=10,
+                              s_text_var=self.spin_plan_budget,
+                              s_command=self.plan_seeding,
+                              l_text="Budget of disk space in GB",
+                              start=start+3)
+
+        blocks.setup_spin_gen(parent,
+                              frm=0, to=512, incr=1,
+                              default=32,
+                              s_text_var=self.spin_plan_threads,
+                              s_command=self.plan_seeding,
+                              l_text=("Maximum number of searches "
+                                      "in parallel; "
+                                      "use 0 to avoid threads"),
+                              start=start+4)
+
+        blocks.setup_button_gen(parent,
+                                width=self.b_width,
+                                b_text="Download plan",
+                                b_command=self.download_plan,
+                                l_text=("Download the chosen streams "
+                                        "into the download directory"),
+                                start=start+5)
+
+    def setup_grid_source_seed_plan(self, parent, start=0):
+        frame = ttk.Frame(parent)
+        frame.grid(row=start, column=1, sticky=tk.W)
+
+        r_subs = ttk.Radiobutton(frame,
+                                 text="Subscribed channels",
+                                 variable=self.rad_plan_source,
+                                 value="subs")
+        r_chs = ttk.Radiobutton(frame,
+                                text="Channels in the entry",
+                                variable=self.rad_plan_source,
+                                value="channels")
+        r_search = ttk.Radiobutton(frame,
+                                   text="Search the text in the entry",
+                                   variable=self.rad_plan_source,
+                                   value="search")
+        r_subs.grid(row=0, column=0, sticky=tk.W)
+        r_chs.grid(row=0, column=1, sticky=tk.W)
+        r_search.grid(row=0, column=2, sticky=tk.W)
+
+    def setup_info_seed_plan(self, parent, start=0):
+        info = ttk.Label(parent,
+                         text=("The streams with few peers, recent, "
+                               "and with more support are worth more.\n"
+                               "Streams that we already have "
+                               "are not listed; "
+                               "the chosen streams are marked with [x]."))
+        info.grid(row=start, column=0, columnspan=2, sticky=tk.W)
+
+    def setup_textbox_seed_plan(self, parent):
+        self.textbox_seed_plan = blocks.setup_textbox(parent,
+                                                      font=self.txt_lst_font)
+        self.textbox_seed_plan["state"] = "disabled"
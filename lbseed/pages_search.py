@@ -219,7 +219,8 @@ class SearchPage(BaseSearch):
         self.setup_grid_chck_search_top(frame, start=5)
         self.setup_grid_radio_search_claims(frame, start=10, col=0)
         self.setup_grid_chck_search_stream(frame, start=10, col=1)
-        self.setup_info_search(frame, start=11)
+        self.setup_grid_export_search(frame, start=11)
+        self.setup_info_search(frame, start=13)
 
     def setup_grid_button_search(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -259,6 +260,15 @@ class SearchPage(BaseSearch):
         sp.grid_forget()
         sp.grid(row=start+2, column=0)
 
+    def setup_grid_export_search(self, parent, start=0):
+        kind = "search"
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_grid_entry_search(self, parent, start=0):
         frame1 = ttk.Frame(parent)
         frame1.grid(row=start, columnspan=2, sticky=tk.W, pady=6)
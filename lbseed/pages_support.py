@@ -58,7 +58,8 @@ class SupportListPage:
         self.setup_grid_button_support(frame, start=0)
         self.setup_grid_check_support(frame, start=1)
         self.setup_grid_threads_support(frame, start=6)
-        self.setup_info_support(frame, start=7)
+        self.setup_grid_export_support(frame, start=7)
+        self.setup_info_support(frame, start=9)
 
     def setup_grid_button_support(self, parent, start=0):
         blocks.setup_button_gen(parent,
@@ -89,6 +90,15 @@ class SupportListPage:
                                       "use 0 to avoid threads"),
                               start=start)
 
+    def setup_grid_export_support(self, parent, start=0):
+        kind = "supports"
+        blocks.setup_export_gen(parent,
+                                width=self.b_width,
+                                fmt_var=self.rad_export_fmt,
+                                b_command=lambda: self.export_listing(kind),
+                                d_command=lambda: self.snapshot_listing(kind),
+                                start=start)
+
     def setup_info_support(self, parent, start=0):
         info = ttk.Label(parent,
                          text=("List the claim, "
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to keep the number of peers of streams over time.
+
+Each sample is a record of fixed width, the time, the number
+of the stream, and its peers, appended to a binary file,
+so tens of thousands of streams sampled every hour use
+only a few megabytes per month.
+The claim ID, name, and channel of each stream are kept
+once in a separate table, where the number of the stream
+is its position.
+
+The samples are read by mapping the file into memory;
+the queries of trends require the `numpy` library.
+"""
+import os
+import struct
+import threading
+import time
+
+import lbseed.storage as stg
+
+# Time, number of the stream, and peers
+RECORD = struct.Struct("<IIH")
+
+LOCK = threading.Lock()
+
+
+def table_path():
+    """Path of the table of streams."""
+    return stg.data_path("peers", "streams.json")
+
+
+def samples_path():
+    """Path of the file of samples."""
+    return stg.data_path("peers", "samples.bin")
+
+
+def load_table():
+    """Load the table of streams, or an empty table."""
+    return stg.load_json(table_path(), default={"streams": []})
+
+
+def record_samples(samples, now=None):
+    """Append the peers of several streams, sampled at the same time.
+
+    Each sample is `(channel, info)`, where `info` is the result
+    of `peers.claim_peers`; failed searches are not recorded.
+    It returns the number of samples written.
+    """
+    now = int(now or time.time())
+
+    with LOCK:
+        table = load_table()
+        streams = table["streams"]
+        ids = {stream[0]: num for num, stream in enumerate(streams)}
+
+        data = []
+
+        for channel, info in samples:
+            if not info.get("stream") or info.get("failed"):
+                continue
+
+            claim = info["claim"]
+            claim_id = claim["claim_id"]
+
+            if claim_id not in ids:
+                ids[claim_id] = len(streams)
+                streams.append([claim_id, claim["name"], channel])
+
+            data.append(RECORD.pack(now, ids[claim_id],
+                                    min(info["n_peers"], 65535)))
+
+        if not data:
+            return 0
+
+        # The table is saved first, so that every sample
+        # refers to a stream that exists
+        stg.save_json(table_path(), table)
+
+        with open(samples_path(), "ab") as fd:
+            # A partial record left by an interrupted write is removed
+            extra = fd.tell() % RECORD.size
+
+            if extra:
+                fd.truncate(fd.tell() - extra)
+                fd.seek(0, os.SEEK_END)
+
+            fd.write(b"".join(data))
+
+    return len(data)
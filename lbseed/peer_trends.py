@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to find the trends of the peers of streams over time.
+
+The samples kept by `lbseed.peer_history` are mapped into memory
+as a NumPy array, and the first, last, minimum, and maximum peers,
+and the slope of a least squares line, are computed for every
+stream at once.
+
+These methods require the `numpy` library.
+"""
+import os
+import time
+
+import numpy as np
+
+import lbseed.peer_history as phs
+
+DTYPE = np.dtype([("time", "<u4"),
+                  ("stream", "<u4"),
+                  ("peers", "<u2")])
+
+
+def load_samples():
+    """Map the file of samples into memory, as a read-only array."""
+    path = phs.samples_path()
+
+    try:
+        n_samples = os.path.getsize(path) // DTYPE.itemsize
+    except OSError:
+        n_samples = 0
+
+    if not n_samples:
+        return np.zeros(0, dtype=DTYPE)
+
+    return np.memmap(path, dtype=DTYPE, mode="r", shape=(n_samples,))
+
+
+def stream_trends(samples, days=7, now=None):
+    """Trend of the peers of every stream sampled in the last days.
+
+    It returns a dictionary of arrays, one element per stream:
+    'stream', 'samples', 'first', 'last', 'low', 'high',
+    and 'slope' in peers per day.
+    """
+    now = now or time.time()
+    recent = samples[samples["time"] >= now - days * 86400]
+
+    if not len(recent):
+        return None
+
+    order = np.lexsort((recent["time"], recent["stream"]))
+    stream = recent["stream"][order]
+    peers = recent["peers"][order].astype(np.float64)
+    t = (recent["time"][order].astype(np.float64) - now) / 86400
+
+    ids, start, counts = np.unique(stream, return_index=True,
+                                   return_counts=True)
+    end = start + counts - 1
+
+    # Least squares slope from the sums of each stream
+    s_t = np.add.reduceat(t, start)
+    s_p = np.add.reduceat(peers, start)
+    s_tt = np.add.reduceat(t * t, start)
+    s_tp = np.add.reduceat(t * peers, start)
+
+    den = counts * s_tt - s_t * s_t
+    slope = np.divide(counts * s_tp - s_t * s_p, den,
+                      out=np.zeros(len(ids)),
+                      where=np.abs(den) > 1e-12)
+
+    return {"stream": ids,
+            "samples": counts,
+            "first": peers[start].astype(np.int64),
+            "last": peers[end].astype(np.int64),
+            "low": np.minimum.reduceat(peers, start).astype(np.int64),
+            "high": np.maximum.reduceat(peers, start).astype(np.int64),
+            "slope": slope}
+
+
+def channel_trends(trends, table):
+    """Add up the trends of the streams of each channel.
+
+    It returns a dictionary by channel with the number of streams,
+    the streams without peers in the last sample,
+    and the sum of the first and last peers of its streams.
+    """
+    streams = table["streams"]
+    channels = {}
+
+    for n, stream in enumerate(trends["stream"].tolist()):
+        channel = streams[stream][2]
+
+        if channel not in channels:
+            channels[channel] = {"streams": 0, "no_peers": 0,
+                                 "first": 0, "last": 0}
+
+        totals = channels[channel]
+        totals["streams"] += 1
+        totals["first"] += int(trends["first"][n])
+        totals["last"] += int(trends["last"][n])
+
+        if not trends["last"][n]:
+            totals["no_peers"] += 1
+
+    return channels
+
+
+def trends_text(days=7, top=50, now=None, sep=";"):
+    """Summary of the channels, and the streams losing most peers."""
+    samples = load_samples()
+    trends = stream_trends(samples, days=days, now=now)
+
+    if trends is None:
+        return (f"No peer samples in the last {days} days; "
+                "record some by listing the peers")
+
+    table = phs.load_table()
+    streams = table["streams"]
+    channels = channel_trends(trends, table)
+
+    out = [f"Samples: {len(samples)}; "
+           f"streams sampled in the last {days} days: "
+           f"{len(trends['stream'])}; channels: {len(channels)}",
+           80 * "-",
+           "Channels, with the peers of their streams "
+           "in the first and last samples"]
+
+    ranked = sorted(channels.items(),
+                    key=lambda kv: kv[1]["last"] - kv[1]["first"])
+
+    for num, (channel, totals) in enumerate(ranked, start=1):
+        change = totals["last"] - totals["first"]
+        out.append(f"{num:4d}/{len(ranked):4d}{sep} "
+                   f"streams: {totals['streams']:4d}{sep} "
+                   f"no peers: {totals['no_peers']:4d}{sep} "
+                   f"peers: {totals['first']:5d} -> "
+                   f"{totals['last']:5d} ({change:+d}){sep} {channel}")
+
+    # Slopes that round to zero are rounding errors of a flat line
+    falling = trends["slope"] < -0.005
+    losing = np.argsort(trends["slope"], kind="stable")[:top]
+    losing = [n for n in losing.tolist() if falling[n]]
+
+    out.append(80 * "-")
+    out.append(f"Streams losing peers: {len(losing)} "
+               f"(of {int(np.count_nonzero(falling))})")
+
+    for num, n in enumerate(losing, start=1):
+        claim_id, name, channel = streams[int(trends["stream"][n])]
+        out.append(f"{num:4d}/{len(losing):4d}{sep} "
+                   f"{trends['slope'][n]:+7.2f} peers/day{sep} "
+                   f"peers: {trends['first'][n]:3d} -> "
+                   f"{trends['last'][n]:3d} "
+                   f"(min {trends['low'][n]}, max {trends['high'][n]})"
+                   f"{sep} {claim_id}{sep} {channel}{sep} \"{name}\"")
+
+    return "\n".join(out)
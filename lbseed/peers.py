@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to search the peers that host the streams in the network.
+
+Searching peers in the distributed hash table is slow,
+so the results are kept in a cache shared by all peer pages,
+keyed by the hash of the first blob (sd_hash) of each stream.
+"""
+import collections
+import threading
+import time
+
+from lbseed.daemon import daemon_call
+
+# Seconds to wait for the daemon to answer a peer search;
+# a search that takes longer counts as failed
+TIMEOUT = 90
+
+
+class PeerCache:
+    """Peer search results kept for `ttl` seconds, at most `size` of them.
+
+    When the cache is full the least recently used result is removed.
+    A `ttl` of 0 disables the cache.
+    """
+    def __init__(self, ttl=1800, size=5000):
+        self.ttl = ttl
+        self.size = size
+        self.items = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, ttl=None, size=None):
+        """Change the time to keep the results, and the maximum number."""
+        with self.lock:
+            if ttl is not None:
+                self.ttl = max(0, ttl)
+            if size is not None:
+                self.size = max(0, size)
+
+            if not self.ttl:
+                self.items.clear()
+
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def get(self, sd_hash):
+        """Get a result that hasn't expired, or `None`."""
+        with self.lock:
+            item = self.items.get(sd_hash)
+
+            if item is None or time.monotonic() - item[0] > self.ttl:
+                if item is not None:
+                    del self.items[sd_hash]
+                self.misses += 1
+                return None
+
+            self.items.move_to_end(sd_hash)
+            self.hits += 1
+            return item[1]
+
+    def put(self, sd_hash, result):
+        """Keep a result, removing the oldest ones over the size."""
+        with self.lock:
+            if not self.ttl or not self.size:
+                return
+
+            self.items[sd_hash] = (time.monotonic(), result)
+            self.items.move_to_end(sd_hash)
+
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        """Remove all results."""
+        with self.lock:
+            self.items.clear()
+
+
+CACHE = PeerCache()
+
+
+def local_blobs(sd_hash, server="http://localhost:5279"):
+    """Check whether we have the stream, at least partially, in our system."""
+    result = daemon_call("file_list",
+                         {"sd_hash": sd_hash, "page": 1, "page_size": 1},
+                         print_error=False,
+                         server=server)
+
+    if not result or not result.get("items"):
+        return False
+
+    return int(result["items"][0].get("blobs_completed", 0)) > 0
+
+
+def search_peers(sd_hash, timeout=None, cache=CACHE,
+                 server="http://localhost:5279"):
+    """Search the peers that host the first blob (sd blob) of a stream.
+
+    A recent result from the `cache` is used if there is one;
+    failed searches are not kept in the cache.
+    """
+    if cache:
+        cached = cache.get(sd_hash)
+        if cached:
+            return dict(cached, cached=True)
+
+    t_start = time.monotonic()
+
+    result = daemon_call("peer_list",
+                         {"blob_hash": sd_hash,
+                          "page": 1, "page_size": 1000},
+                         timeout=timeout,
+                         server=server)
+
+    if isinstance(result, dict):
+        peers = result.get("items", [])
+    else:
+        peers = result or []
+
+    info = {"sd_hash": sd_hash,
+            "peers": peers,
+            "n_peers": len(peers),
+            "search_time": time.monotonic() - t_start,
+            "cached": False,
+            "failed": result is False}
+
+    if cache and result is not False:
+        cache.put(sd_hash, dict(info))
+
+    return info
+
+
+def claim_peers(claim, timeout=None, cache=CACHE,
+                server="http://localhost:5279"):
+    """Search the peers of a claim; only streams have peers."""
+    source = claim.get("value", {}).get("source", {})
+    sd_hash = source.get("sd_hash")
+
+    if not sd_hash:
+        return {"claim": claim,
+                "stream": False}
+
+    peers = search_peers(sd_hash, timeout=timeout, cache=cache,
+                         server=server)
+    peers["claim"] = claim
+    peers["stream"] = True
+    peers["local"] = local_blobs(sd_hash, server=server)
+
+    return peers
+
+
+def ch_streams(channel, number=2,
+               server="http://localhost:5279"):
+    """Get the newest streams of a channel, or `False` if it isn't found."""
+    params = {"channel": channel,
+              "claim_type": "stream",
+              "has_source": True,
+              "order_by": ["release_time"],
+              "no_totals": True}
+
+    claims = []
+    page = 1
+    page_size = max(1, min(number, 50))
+
+    while len(claims) < number:
+        params["page"] = page
+        params["page_size"] = page_size
+
+        result = daemon_call("claim_search", params,
+                             print_error=False,
+                             server=server)
+
+        if result is False:
+            return False if page == 1 else claims
+
+        items = result.get("items", [])
+        claims.extend(items[:number - len(claims)])
+
+        if len(items) < page_size:
+            break
+
+        page += 1
+
+    return claims
+
+
+def new_stats():
+    """Empty totals of peer searches."""
+    return {"streams": 0,
+            "with_peers": 0,
+            "no_peers": 0,
+            "peers": 0,
+            "local": 0,
+            "cached": 0,
+            "failed": 0,
+            "search_time": 0.0}
+
+
+def add_stats(stats, info):
+    """Add the peer search of a stream to the totals."""
+    if not info or not info.get("stream"):
+        return stats
+
+    if info.get("failed"):
+        stats["failed"] += 1
+        return stats
+
+    stats["streams"] += 1
+    stats["peers"] += info["n_peers"]
+
+    if info["n_peers"]:
+        stats["with_peers"] += 1
+    else:
+        stats["no_peers"] += 1
+
+    if info.get("local"):
+        stats["local"] += 1
+
+    if info.get("cached"):
+        stats["cached"] += 1
+    else:
+        stats["search_time"] += info["search_time"]
+
+    return stats
+
+
+def peers_stats(infos):
+    """Totals of the peer searches of several streams."""
+    stats = new_stats()
+
+    for info in infos:
+        add_stats(stats, info)
+
+    return stats
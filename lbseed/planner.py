@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to choose which streams to download to help the network most.
+
+Candidate streams come from the subscribed channels, from a list
+of channels, or from a search.
+The peers of each candidate are searched with `lbseed.peers`,
+so the results of other peer pages are reused.
+
+The value of seeding a stream is its expected demand divided by
+the number of peers that would host it, including us; the demand
+is larger for recent streams and for streams with more support.
+The candidates are ranked by value per gigabyte, and chosen
+in that order while they fit in the budget of bytes.
+"""
+import math
+import time
+
+import lbseed.channels as chs
+import lbseed.daemon as dmn
+import lbseed.peers as prs
+import lbseed.throttle as thr
+
+# Days after which the demand of a stream is assumed to be half
+HALF_LIFE = 30
+
+# Size assumed for streams that don't declare it
+DEFAULT_SIZE = 100 * 1024**2
+
+SOURCES = ("subs", "channels", "search")
+
+
+def stream_size(claim):
+    """Size of the stream in bytes, as declared in the claim."""
+    source = claim.get("value", {}).get("source", {})
+
+    try:
+        return int(source.get("size") or 0)
+    except ValueError:
+        return 0
+
+
+def demand(claim, now=None):
+    """Relative demand of a stream, from its age and its support."""
+    now = now or time.time()
+    age = max(0, now - chs.claim_time(claim)) / 86400
+
+    meta = claim.get("meta", {})
+
+    try:
+        support = float(meta.get("effective_amount") or 0)
+    except ValueError:
+        support = 0.0
+
+    return 0.5 ** (age / HALF_LIFE) * (1 + math.log10(1 + support))
+
+
+def candidates_chs(channels, threads=32,
+                   server="http://localhost:5279"):
+    """Newest streams of the channels, each a pair `[channel, number]`."""
+    limiter = thr.AdaptiveLimiter(initial=min(4, threads), maximum=threads)
+
+    def streams(item):
+        return prs.ch_streams(item[0], number=item[1], server=server)
+
+    claims = []
+
+    for num, item, found in thr.fan_out(streams, channels,
+                                        limiter=limiter):
+        if found is False:
+            print(f"Channel not found: {item[0]}")
+            continue
+
+        claims.extend(found)
+
+    return claims
+
+
+def candidates_search(text, number=50,
+                      server="http://localhost:5279"):
+    """Streams that match a text search."""
+    claims = []
+
+    for claim, total in dmn.iter_pages("claim_search",
+                                       {"text": text,
+                                        "claim_type": "stream",
+                                        "has_source": True,
+                                        "no_totals": True},
+                                       page_size=50, limit=number,
+                                       server=server):
+        claims.append(claim)
+
+    return claims
+
+
+def rank_candidates(infos, now=None):
+    """Rank the searched streams by their seeding value per gigabyte.
+
+    `infos` are the results of `peers.claim_peers`.
+    Streams that we already have, and searches that failed,
+    are not ranked.
+    """
+    now = now or time.time()
+    ranked = []
+
+    for info in infos:
+        if not info.get("stream") or info.get("failed"):
+            continue
+
+        if info.get("local"):
+            continue
+
+        claim = info["claim"]
+        size = stream_size(claim) or DEFAULT_SIZE
+        value = demand(claim, now) / (info["n_peers"] + 1)
+
+        ranked.append({"claim": claim,
+                       "n_peers": info["n_peers"],
+                       "size": size,
+                       "value": value,
+                       "density": value / (size / 1024**3)})
+
+    ranked.sort(key=lambda item: -item["density"])
+
+    return ranked
+
+
+def choose(ranked, budget):
+    """Choose the ranked streams in order while they fit in the budget.
+
+    A stream that doesn't fit is skipped, and smaller ones
+    further down can still be chosen.
+    It marks each item with 'chosen', and returns the total bytes.
+    """
+    used = 0
+
+    for item in ranked:
+        item["chosen"] = used + item["size"] <= budget
+
+        if item["chosen"]:
+            used += item["size"]
+
+    return used
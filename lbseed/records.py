@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to describe claims, files and supports as flat records.
+
+The listings in the text boxes are meant to be read by people;
+these records have fixed columns with a type for each value,
+so that they can be exported and processed by other programs.
+
+The column types are 'str', 'int', 'float', 'bool' and 'time';
+'time' values are integer UNIX timestamps.
+"""
+import lbseed.channels as chs
+
+CLAIM_COLUMNS = [("claim_id", "str"),
+                 ("name", "str"),
+                 ("title", "str"),
+                 ("channel", "str"),
+                 ("type", "str"),
+                 ("release_time", "time"),
+                 ("creation_height", "int"),
+                 ("height", "int"),
+                 ("size", "int"),
+                 ("duration", "int"),
+                 ("fee", "float"),
+                 ("fee_currency", "str"),
+                 ("support_amount", "float"),
+                 ("effective_amount", "float"),
+                 ("reposted", "int")]
+
+SUB_COLUMNS = [("subscription", "str")] + CLAIM_COLUMNS
+
+FILE_COLUMNS = [("claim_id", "str"),
+                ("name", "str"),
+                ("channel", "str"),
+                ("added_on", "time"),
+                ("blobs_completed", "int"),
+                ("blobs_in_stream", "int"),
+                ("size", "int"),
+                ("written_bytes", "int"),
+                ("sd_hash", "str"),
+                ("download_path", "str")]
+
+SUPPORT_COLUMNS = [("claim_id", "str"),
+                   ("name", "str"),
+                   ("amount", "float"),
+                   ("height", "int"),
+                   ("txid", "str"),
+                   ("nout", "int")]
+
+PEER_COLUMNS = [("claim_id", "str"),
+                ("name", "str"),
+                ("channel", "str"),
+                ("sd_hash", "str"),
+                ("size", "int"),
+                ("peers", "int"),
+                ("local", "bool"),
+                ("search_time", "float")]
+
+
+def claim_record(claim):
+    """Flat record of a claim as returned by 'resolve' or 'claim_search'."""
+    value = claim.get("value", {})
+    meta = claim.get("meta", {})
+    fee = value.get("fee", {})
+    signing = claim.get("signing_channel", {})
+
+    duration = (value.get("video", {}).get("duration")
+                or value.get("audio", {}).get("duration")
+                or 0)
+
+    return {"claim_id": claim["claim_id"],
+            "name": claim["name"],
+            "title": value.get("title", ""),
+            "channel": signing.get("name", ""),
+            "type": chs.claim_type(claim),
+            "release_time": chs.claim_time(claim),
+            "creation_height": int(meta.get("creation_height", 0)),
+            "height": int(claim.get("height", 0)),
+            "size": int(value.get("source", {}).get("size", 0)),
+            "duration": int(duration),
+            "fee": float(fee.get("amount", 0)),
+            "fee_currency": fee.get("currency", ""),
+            "support_amount": float(meta.get("support_amount", 0)),
+            "effective_amount": float(meta.get("effective_amount", 0)),
+            "reposted": int(meta.get("reposted", 0))}
+
+
+def file_record(item):
+    """Flat record of a downloaded file as returned by 'file_list'."""
+    return {"claim_id": item.get("claim_id", ""),
+            "name": item.get("claim_name", ""),
+            "channel": item.get("channel_name") or "",
+            "added_on": int(item.get("added_on") or 0),
+            "blobs_completed": int(item.get("blobs_completed", 0)),
+            "blobs_in_stream": int(item.get("blobs_in_stream", 0)),
+            "size": int(item.get("total_bytes") or 0),
+            "written_bytes": int(item.get("written_bytes") or 0),
+            "sd_hash": item.get("sd_hash", ""),
+            "download_path": item.get("download_path") or ""}
+
+
+def support_record(item):
+    """Flat record of a support as returned by 'support_list'."""
+    return {"claim_id": item.get("claim_id", ""),
+            "name": item.get("name", ""),
+            "amount": float(item.get("amount", 0)),
+            "height": int(item.get("height", 0)),
+            "txid": item.get("txid", ""),
+            "nout": int(item.get("nout", 0))}
+
+
+def peer_record(info):
+    """Flat record of the peer search for a claim, see `peers.claim_peers`."""
+    claim = info["claim"]
+    source = claim.get("value", {}).get("source", {})
+
+    return {"claim_id": claim["claim_id"],
+            "name": claim["name"],
+            "channel": claim.get("signing_channel", {}).get("name", ""),
+            "sd_hash": source.get("sd_hash", ""),
+            "size": int(source.get("size", 0)),
+            "peers": info.get("n_peers", 0),
+            "local": bool(info.get("local", False)),
+            "search_time": round(info.get("search_time", 0.0), 3)}
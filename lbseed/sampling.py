@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to estimate totals from a stratified random sample.
+
+Each channel is a stratum: a few of its streams are chosen
+at random, and the values measured in them, for example
+the number of peers, are used to estimate the mean
+of all the streams, with a confidence interval that accounts
+for the size of each channel and for the part of it that was measured.
+"""
+import math
+import random
+
+# Normal quantile of a two-sided 95% confidence interval
+Z_95 = 1.96
+
+
+def stratified_sample(groups, size, seed=None):
+    """Choose at most `size` elements at random from each group.
+
+    It returns the lists of chosen elements, in the same order
+    as the groups; a `size` of 0 chooses all elements.
+    """
+    rng = random.Random(seed)
+    chosen = []
+
+    for group in groups:
+        group = list(group)
+
+        if 0 < size < len(group):
+            group = rng.sample(group, size)
+
+        chosen.append(group)
+
+    return chosen
+
+
+def _variance(values, mean):
+    """Sample variance of the values, with `n - 1` degrees of freedom."""
+    return sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+
+
+def stratified_estimate(strata, z=Z_95):
+    """Estimate the mean of all elements from the values of a sample.
+
+    Each stratum is a pair `(size, values)`, with the number
+    of elements of the group and the values of those measured.
+    Groups without values are left out of the estimate.
+
+    The variance of a group with a single value can't be measured,
+    so the variance pooled from the groups with several values is used;
+    if no group has several values, the variance of all the values is used.
+    It returns the estimated mean and the half width
+    of its confidence interval, or `None` if nothing was measured.
+    The half width is `None` if a single value was measured
+    in a group with more elements.
+    """
+    strata = [(size, values) for size, values in strata if values]
+    total = sum(size for size, values in strata)
+
+    if not total:
+        return None
+
+    means = [sum(values) / len(values) for size, values in strata]
+
+    dof = 0
+    pooled = 0.0
+
+    for (size, values), m in zip(strata, means):
+        if len(values) > 1:
+            dof += len(values) - 1
+            pooled += (len(values) - 1) * _variance(values, m)
+
+    single = any(len(values) == 1 < size for size, values in strata)
+
+    if dof:
+        pooled /= dof
+    elif single:
+        every = [v for size, values in strata for v in values]
+
+        if len(every) < 2:
+            return means[0], None
+
+        pooled = _variance(every, sum(every) / len(every))
+
+    mean = 0.0
+    variance = 0.0
+
+    for (size, values), m in zip(strata, means):
+        n = len(values)
+        weight = size / total
+        mean += weight * m
+
+        if n < size:
+            s2 = _variance(values, m) if n > 1 else pooled
+            variance += weight ** 2 * (1 - n / size) * s2 / n
+
+    return mean, z * math.sqrt(variance)
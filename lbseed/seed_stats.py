@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to compute statistics of the blobs uploaded and downloaded.
+
+The events stored by `lbseed.seeding` are loaded directly
+into NumPy arrays, one column per field, and the totals
+are computed with vectorized operations, so a year of events
+is summarized at once.
+
+These methods require the `numpy` library.
+"""
+import time
+
+import numpy as np
+
+import lbseed.seeding as sdg
+import lbseed.storage as stg
+
+DTYPE = np.dtype([("time", "<f8"),
+                  ("kind", "u1"),
+                  ("blob", "S8"),
+                  ("size", "<u4")])
+
+BUCKETS = {"hour": 3600,
+           "day": 86400}
+
+
+def load_array(data_dir):
+    """Read the stored events of the daemon into a structured array."""
+    events_path, state_path = sdg.store_paths(data_dir)
+
+    with sdg.LOCK:
+        size = stg.load_json(state_path, default={"size": 0})["size"]
+
+        try:
+            return np.fromfile(events_path, dtype=DTYPE,
+                               count=size // DTYPE.itemsize)
+        except (OSError, ValueError):
+            return np.zeros(0, dtype=DTYPE)
+
+
+def window_totals(events, since=0):
+    """Blobs uploaded, bytes sent, and blobs downloaded since a time."""
+    recent = events[events["time"] >= since]
+    up = recent["kind"] == sdg.UP
+
+    return (int(np.count_nonzero(up)),
+            int(recent["size"][up].sum(dtype=np.int64)),
+            int(np.count_nonzero(~up)))
+
+
+def bucket_totals(events, width=86400, number=30, now=None):
+    """Totals of the last buckets of time, of `width` seconds each.
+
+    The buckets are aligned to the local time, so days start at midnight.
+    It returns the start of each bucket, the blobs uploaded,
+    the bytes sent, the blobs downloaded, and the cumulative ratio
+    at the end of each bucket, counting all events before it.
+    """
+    now = now or time.time()
+    offset = time.localtime(now).tm_gmtoff
+
+    last = (now + offset) // width
+    first = last - number + 1
+    index = ((events["time"] + offset) // width - first).astype(np.int64)
+
+    up = events["kind"] == sdg.UP
+    before = index < 0
+    valid = (index >= 0) & (index < number)
+
+    n_up = np.bincount(index[valid & up], minlength=number)
+    n_down = np.bincount(index[valid & ~up], minlength=number)
+    sent = np.bincount(index[valid & up],
+                       weights=events["size"][valid & up],
+                       minlength=number)
+
+    cum_up = np.cumsum(n_up) + np.count_nonzero(before & up)
+    cum_down = np.cumsum(n_down) + np.count_nonzero(before & ~up)
+    ratio = np.divide(cum_up, cum_down,
+                      out=np.full(number, np.nan),
+                      where=cum_down > 0)
+
+    starts = (first + np.arange(number)) * width - offset
+
+    return starts, n_up, sent, n_down, ratio
+
+
+def blob_totals(events):
+    """Uploads and bytes sent of each blob, as `(blob, uploads, bytes)`.
+
+    Blobs are identified by the first 8 characters of their hash.
+    """
+    sent = events[events["kind"] == sdg.UP]
+
+    if not len(sent):
+        return []
+
+    # Sorting 8-byte integers is much faster than sorting strings
+    keys = np.ascontiguousarray(sent["blob"]).view("<u8")
+    blobs, inverse, counts = np.unique(keys,
+                                       return_inverse=True,
+                                       return_counts=True)
+    size = np.bincount(inverse, weights=sent["size"])
+    names = blobs.view("S8")
+
+    return list(zip((name.decode() for name in names),
+                    counts.tolist(), size.astype(np.int64).tolist()))
+
+
+def top_blobs(events, number=10):
+    """The blobs uploaded most often, with their uploads and bytes sent."""
+    totals = blob_totals(events)
+    totals.sort(key=lambda blob: -blob[1])
+
+    return totals[:number]
+
+
+def stats_text(events, bucket="day", number=30, top=10, now=None,
+               sep=";"):
+    """Summary of the events, by windows, by buckets, and by blob."""
+    if not len(events):
+        return "No blobs uploaded or downloaded in the logs"
+
+    now = now or time.time()
+    fmt = "%Y-%m-%d_%H:%M:%S%z"
+    width = BUCKETS[bucket]
+
+    out = [f"Events from "
+           f"{time.strftime(fmt, time.localtime(events['time'].min()))} "
+           f"to {time.strftime(fmt, time.localtime(events['time'].max()))}"]
+
+    for label, days in (("Last day", 1), ("Last week", 7),
+                        ("Last 30 days", 30), ("All logs", None)):
+        since = now - days * 86400 if days else 0
+        up, sent, down = window_totals(events, since)
+        ratio = f"{up / down:.4f}" if down else "-"
+
+        out.append(f"{label + ':':13s} up: {up:8d} blobs "
+                   f"({sent / 1024**3:8.3f} GiB){sep} "
+                   f"down: {down:8d} blobs{sep} ratio: {ratio}")
+
+    starts, n_up, sent, n_down, ratio = \
+        bucket_totals(events, width=width, number=number, now=now)
+
+    bfmt = "%Y-%m-%d_%H:%M" if bucket == "hour" else "%Y-%m-%d"
+    out.append(80 * "-")
+    out.append(f"Last {number} {bucket}s, and ratio of all events "
+               "up to each one")
+
+    for n in range(number - 1, -1, -1):
+        total = "-" if np.isnan(ratio[n]) else f"{ratio[n]:.4f}"
+        out.append(f"{time.strftime(bfmt, time.localtime(starts[n]))}"
+                   f"{sep} up: {n_up[n]:7d} "
+                   f"({sent[n] / 1024**2:10.1f} MiB){sep} "
+                   f"down: {n_down[n]:7d}{sep} ratio: {total}")
+
+    blobs = top_blobs(events, number=top)
+
+    if blobs:
+        out.append(80 * "-")
+        out.append(f"Top {len(blobs)} blobs by uploads")
+
+        for num, (blob, count, size) in enumerate(blobs, start=1):
+            out.append(f"{num:4d}/{len(blobs):4d}{sep} {blob}{sep} "
+                       f"uploads: {count:6d}{sep} "
+                       f"{size / 1024**2:10.1f} MiB")
+
+    return "\n".join(out)
+
+
+def plot_data(events, bucket="day", number=30, points=200, now=None):
+    """Data of the plot of the last buckets, reduced to `points` bars.
+
+    When there are more buckets than points, consecutive buckets
+    are added together, so the plot is never wider than the screen;
+    the ratio is the one at the end of each group.
+    """
+    width = BUCKETS[bucket]
+    starts, n_up, sent, n_down, ratio = \
+        bucket_totals(events, width=width, number=number, now=now)
+
+    group = max(1, -(-number // max(1, points)))
+
+    if group > 1:
+        # The oldest group is the incomplete one, so that the newest
+        # bar always ends now
+        pad = -number % group
+        n_up = np.concatenate([np.zeros(pad, np.int64), n_up])
+        n_down = np.concatenate([np.zeros(pad, np.int64), n_down])
+        ratio = np.concatenate([np.full(pad, np.nan), ratio])
+
+        n_up = n_up.reshape(-1, group).sum(axis=1)
+        n_down = n_down.reshape(-1, group).sum(axis=1)
+        ratio = ratio.reshape(-1, group)[:, -1]
+
+    x = (np.arange(len(n_up)) - len(n_up) + 1) * group
+
+    return {"bucket": bucket,
+            "group": group,
+            "x": x,
+            "up": n_up,
+            "down": n_down,
+            "ratio": ratio}
+
+
+def setup_canvas(frame):
+    """Create a Matplotlib figure inside the Tk frame, and its canvas.
+
+    It needs `matplotlib`; if it is not installed it returns `False`.
+    """
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    except ImportError:
+        print("Plotting the seeding ratio needs 'matplotlib'")
+        return False
+
+    canvas = FigureCanvasTkAgg(Figure(figsize=(8, 5)), master=frame)
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    return canvas
+
+
+def draw_buckets(figure, data):
+    """Draw the data of `plot_data` in the figure, replacing its content."""
+    figure.clear()
+
+    group = data["group"]
+    x = data["x"]
+
+    ax = figure.add_subplot()
+    ax.bar(x - 0.2 * group, data["up"], width=0.4 * group,
+           label="uploaded")
+    ax.bar(x + 0.2 * group, data["down"], width=0.4 * group,
+           label="downloaded")
+
+    label = f"{data['bucket'].capitalize()}s before now"
+
+    if group > 1:
+        label += f" (bars of {group} {data['bucket']}s)"
+
+    ax.set_xlabel(label)
+    ax.set_ylabel("Blobs")
+    ax.legend(loc="upper left")
+
+    ax2 = ax.twinx()
+    ax2.plot(x, data["ratio"], color="black", label="ratio")
+    ax2.set_ylabel("Ratio up/down of all events")
+
+    return figure
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to estimate the seeding ratio from the logs of the daemon.
+
+The logs are read incrementally: for each log file the position
+already read is kept, identified by its inode and its first line,
+so only the new lines are parsed, even after the daemon rotates
+its logs.
+The blobs sent and received are appended to a compact binary file
+of fixed-size records, which is what the ratio is computed from;
+see `lbseed.seed_stats` for the statistics computed with NumPy.
+"""
+import glob
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+
+import lbseed.daemon as dmn
+import lbseed.storage as stg
+
+LOG_NAME = "lbrynet.log"
+
+UP = 0
+DOWN = 1
+
+# Time, kind (UP or DOWN), first 8 characters of the blob hash,
+# and bytes sent (0 for downloaded blobs)
+RECORD = struct.Struct("<dB8sI")
+
+# The events file is truncated and appended by each update,
+# so only one update, or read, may use it at a time
+LOCK = threading.Lock()
+
+LINE = re.compile(r"^(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d),(\d+) "
+                  r"\w+\s+lbry\.blob_exchange\.(?:server|client):\d+: "
+                  r"(sent|downloaded) ([0-9a-f]+)(?: \((\d+) bytes\))?"
+                  r"(?: (?:to|from) (\S+):\d+)?")
+
+
+def store_path(data_dir, filename):
+    """Path of a file kept for the logs in the data directory of a daemon."""
+    name = stg.safe_name(os.path.abspath(data_dir))
+    return stg.data_path("seeding", name, filename)
+
+
+def store_paths(data_dir):
+    """Paths of the events file and of the state of the logs read."""
+    return (store_path(data_dir, "events.bin"),
+            store_path(data_dir, "state.json"))
+
+
+def log_files(data_dir):
+    """Log files of the daemon, from the oldest to the newest.
+
+    The daemon rotates its log by renaming it to 'lbrynet.log.1',
+    'lbrynet.log.2', and so on, so higher numbers are older.
+    """
+    base = os.path.join(data_dir, LOG_NAME)
+    logs = {}
+
+    for path in glob.glob(base + "*"):
+        suffix = path[len(base):]
+
+        if not suffix:
+            logs[path] = 0
+        elif suffix[0] == "." and suffix[1:].isdigit():
+            logs[path] = int(suffix[1:])
+
+    return sorted(logs, key=logs.get, reverse=True)
+
+
+def first_line(fd):
+    """Hash of the first complete line of the file, or an empty string."""
+    fd.seek(0)
+    line = fd.readline(4096)
+
+    if not line.endswith(b"\n"):
+        return ""
+
+    return hashlib.sha1(line).hexdigest()[:16]
+
+
+def parse_event(line):
+    """Return the blob sent or received in a line of the log, or `None`.
+
+    The event is `(time, kind, blob, size, peer)`.
+    """
+    match = LINE.match(line)
+
+    if not match:
+        return None
+
+    fields = match.groups()
+    stamp = time.mktime(tuple(int(n) for n in fields[:6]) + (0, 0, -1))
+
+    kind = UP if fields[7] == "sent" else DOWN
+    size = int(fields[9] or 0)
+
+    return (stamp + int(fields[6]) / 1000, kind, fields[8][:8], size,
+            fields[10])
+
+
+def parse_line(line):
+    """Return the record of a blob sent or received, or `None`."""
+    event = parse_event(line)
+
+    if not event:
+        return None
+
+    return RECORD.pack(event[0], event[1], event[2].encode(), event[3])
+
+
+def read_new(path, files):
+    """Parse the lines of a log file that were not read before.
+
+    `files` is the previous state of all log files, by inode.
+    It returns the key and the new state of the file,
+    the records found, and the number of bytes read.
+    """
+    st = os.stat(path)
+    key = f"{st.st_dev}:{st.st_ino}"
+    known = files.get(key)
+
+    with open(path, "rb") as fd:
+        head = first_line(fd)
+        start = 0
+
+        # The same inode with another first line is a new file
+        if (known and known["head"] == head
+                and known["offset"] <= st.st_size):
+            start = known["offset"]
+
+        fd.seek(start)
+        data = fd.read()
+
+    # Only complete lines; a partial line is read in the next run
+    end = data.rfind(b"\n") + 1
+    records = []
+
+    for line in data[:end].splitlines():
+        if b"blob_exchange" not in line:
+            continue
+
+        record = parse_line(line.decode("utf-8", errors="replace"))
+
+        if record:
+            records.append(record)
+
+    return key, {"head": head, "offset": start + end}, records, end
+
+
+def update_events(data_dir):
+    """Append the events of the new lines of the logs to the events file.
+
+    It returns a dictionary with the number of log files,
+    the bytes of new lines parsed, the new events, and the time it took.
+    """
+    t_start = time.monotonic()
+
+    with LOCK:
+        events_path, state_path = store_paths(data_dir)
+        state = stg.load_json(state_path, default={"files": {}, "size": 0})
+
+        files = {}
+        stats = {"files": 0, "bytes": 0, "events": 0}
+
+        mode = "r+b" if os.path.exists(events_path) else "w+b"
+
+        with open(events_path, mode) as fd:
+            # Records written after the last saved state belong to a run
+            # that was interrupted, and they will be read again
+            fd.truncate(state["size"])
+            fd.seek(state["size"])
+
+            for path in log_files(data_dir):
+                key, info, records, n_bytes = read_new(path, state["files"])
+                files[key] = info
+                fd.write(b"".join(records))
+
+                stats["files"] += 1
+                stats["bytes"] += n_bytes
+                stats["events"] += len(records)
+
+            size = fd.tell()
+
+        stg.save_json(state_path, {"files": files, "size": size,
+                                   "time": time.time()})
+
+    stats["time"] = time.monotonic() - t_start
+    return stats
+
+
+def load_events(data_dir):
+    """Read all events from the events file, as tuples.
+
+    Each event is `(time, kind, blob, size)`.
+    """
+    events_path, state_path = store_paths(data_dir)
+
+    with LOCK:
+        size = stg.load_json(state_path, default={"size": 0})["size"]
+
+        if not os.path.exists(events_path):
+            return []
+
+        with open(events_path, "rb") as fd:
+            data = fd.read(size)
+
+    return list(RECORD.iter_unpack(data[:len(data)
+                                        - len(data) % RECORD.size]))
+
+
+def ratio_text(events, now=None, sep=";"):
+    """Summary of the blobs uploaded and downloaded."""
+    if not events:
+        return "No blobs uploaded or downloaded in the logs"
+
+    now = now or time.time()
+    fmt = "%Y-%m-%d_%H:%M:%S%z"
+
+    out = [f"Events from {time.strftime(fmt, time.localtime(events[0][0]))} "
+           f"to {time.strftime(fmt, time.localtime(events[-1][0]))}"]
+
+    for label, days in (("Last day", 1), ("Last week", 7),
+                        ("Last 30 days", 30), ("All logs", None)):
+        since = now - days * 86400 if days else 0
+        up = down = sent = 0
+
+        for stamp, kind, blob, size in events:
+            if stamp < since:
+                continue
+
+            if kind == UP:
+                up += 1
+                sent += size
+            else:
+                down += 1
+
+        ratio = f"{up / down:.4f}" if down else "-"
+
+        out.append(f"{label + ':':13s} up: {up:8d} blobs "
+                   f"({sent / 1024**3:8.3f} GiB){sep} "
+                   f"down: {down:8d} blobs{sep} ratio: {ratio}")
+
+    return "\n".join(out)
+
+
+def blob_totals(events):
+    """Uploads and bytes sent of each blob, as `(blob, uploads, bytes)`."""
+    totals = {}
+
+    for stamp, kind, blob, size in events:
+        if kind != UP:
+            continue
+
+        if blob not in totals:
+            totals[blob] = [0, 0]
+
+        totals[blob][0] += 1
+        totals[blob][1] += size
+
+    return [(blob.rstrip(b"\0").decode(), uploads, size)
+            for blob, (uploads, size) in totals.items()]
+
+
+def daemon_data_dir(server="http://localhost:5279"):
+    """Get the data directory of the daemon, where its logs are."""
+    settings = dmn.daemon_call("settings_get", server=server)
+
+    if not settings:
+        return False
+
+    return settings.get("data_dir", False)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to save listings as snapshots and find what changed between them.
+
+A snapshot keeps the typed records of a listing, see `records`,
+as rows of values keyed by claim ID, with the column names stored
+only once. The snapshots are compressed JSON files in the data directory,
+one directory per listing, so two runs can be compared
+without asking the daemon again.
+"""
+import os
+import time
+
+import lbseed.export as exp
+import lbseed.storage as stg
+
+# Columns that change on every run and don't mean that the item changed
+VOLATILE = ("search_time",)
+
+# Columns that are added when several records have the same claim ID
+SUMMED = ("amount",)
+
+# Columns that choose the record that gives the other values
+# when several records have the same claim ID, the highest one
+LATEST = ("height", "txid", "nout")
+
+
+def snapshot_dir(kind, key="all"):
+    """Directory where the snapshots of a listing are kept."""
+    return os.path.dirname(stg.data_path("snapshots",
+                                         kind, stg.safe_name(key),
+                                         "snapshot"))
+
+
+def list_snapshots(kind, key="all"):
+    """Paths of the saved snapshots of a listing, oldest first."""
+    sdir = snapshot_dir(kind, key)
+
+    return sorted(os.path.join(sdir, name) for name in os.listdir(sdir)
+                  if name.endswith(".json.gz"))
+
+
+def build_snapshot(kind, records, columns):
+    """Build a snapshot from the records of a listing.
+
+    Records with the same claim ID are combined into one row;
+    for example, several supports to one claim add up their amounts,
+    and the other values are those of the newest support,
+    whatever the order in which they arrive.
+    """
+    names = [name for name, typ in columns]
+    added = [n for n, name in enumerate(names) if name in SUMMED]
+    order = [n for n, name in enumerate(names) if name in LATEST]
+    rows = {}
+
+    def latest(row):
+        return tuple(row[n] for n in order)
+
+    for record in records:
+        record = exp.typed_record(record, columns)
+        row = [record[name] for name in names]
+        cid = record["claim_id"]
+
+        if cid in rows:
+            old = rows[cid]
+
+            if latest(old) > latest(row):
+                row, old = old[:], row
+
+            for n in added:
+                row[n] = old[n] + row[n]
+
+        rows[cid] = row
+
+    return {"kind": kind,
+            "time": int(time.time()),
+            "columns": names,
+            "types": [typ for name, typ in columns],
+            "rows": rows}
+
+
+def save_snapshot(snapshot, key="all", keep=30):
+    """Save the snapshot, and remove the oldest ones over `keep`."""
+    tstamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(snapshot["time"]))
+    base = os.path.join(snapshot_dir(snapshot["kind"], key), tstamp)
+    path = base + ".json.gz"
+    counter = 1
+
+    # Several snapshots in the same second get a counter,
+    # which still sorts after the first one
+    while os.path.exists(path):
+        path = f"{base}_{counter:03d}.json.gz"
+        counter += 1
+
+    stg.save_json(path, snapshot)
+
+    paths = list_snapshots(snapshot["kind"], key)
+
+    for old in paths[:max(len(paths) - keep, 0)]:
+        os.remove(old)
+
+    return path
+
+
+def last_snapshot(kind, key="all"):
+    """Load the newest snapshot of a listing, or `None` if there is none."""
+    paths = list_snapshots(kind, key)
+
+    for path in reversed(paths):
+        snapshot = stg.load_json(path)
+
+        if snapshot and "rows" in snapshot:
+            return snapshot
+
+    return None
+
+
+def diff_snapshots(old, new):
+    """Compare two snapshots of the same listing by claim ID.
+
+    It returns the rows that were added, the rows that were removed,
+    and the rows that changed together with the columns that changed,
+    as `(claim_id, row, [(column, old_value, new_value), ...])`.
+    """
+    old_cols = {name: n for n, name in enumerate(old["columns"])}
+    old_rows = old["rows"]
+    new_rows = new["rows"]
+
+    compared = [(n, old_cols[name], name)
+                for n, name in enumerate(new["columns"])
+                if name in old_cols and name not in VOLATILE]
+
+    added = []
+    changed = []
+
+    for cid, row in new_rows.items():
+        old_row = old_rows.get(cid)
+
+        if old_row is None:
+            added.append(row)
+            continue
+
+        diffs = [(name, old_row[o], row[n])
+                 for n, o, name in compared
+                 if old_row[o] != row[n]]
+
+        if diffs:
+            changed.append((cid, row, diffs))
+
+    removed = [row for cid, row in old_rows.items()
+               if cid not in new_rows]
+
+    return {"added": added,
+            "removed": removed,
+            "changed": changed}
+
+
+def row_text(row, columns):
+    """Short description of a row, with its claim ID and name."""
+    values = dict(zip(columns, row))
+    text = values["claim_id"] + " " + values.get("name", "")
+
+    if values.get("title"):
+        text += f' "{values["title"]}"'
+
+    return text
+
+
+def diff_text(old, new, diff, sep=";"):
+    """Text with the changes between two snapshots."""
+    new_time = exp.iso_time(new["time"])
+    out = [f"Snapshot: {new_time}{sep} items: {len(new['rows'])}"]
+
+    if not old:
+        out.append("No previous snapshot to compare with")
+        return "\n".join(out)
+
+    old_time = exp.iso_time(old["time"])
+    out.append(f"Previous: {old_time}{sep} items: {len(old['rows'])}")
+    out.append(f"Added: {len(diff['added'])}{sep} "
+               f"removed: {len(diff['removed'])}{sep} "
+               f"changed: {len(diff['changed'])}")
+    out.append(80 * "-")
+
+    for row in diff["added"]:
+        out.append("+ " + row_text(row, new["columns"]))
+
+    for row in diff["removed"]:
+        out.append("- " + row_text(row, old["columns"]))
+
+    times = [name for name, typ in zip(new["columns"], new["types"])
+             if typ == "time"]
+
+    for cid, row, diffs in diff["changed"]:
+        changes = f"{sep} ".join(f"{name}: {exp.iso_time(a)} -> "
+                                 f"{exp.iso_time(b)}"
+                                 if name in times
+                                 else f"{name}: {a} -> {b}"
+                                 for name, a, b in diffs)
+        out.append("~ " + row_text(row, new["columns"])
+                   + f"{sep} " + changes)
+
+    if not (diff["added"] or diff["removed"] or diff["changed"]):
+        out.append("No changes")
+
+    return "\n".join(out)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to keep local data between runs of the program.
+
+Results that are expensive to obtain from the network are saved
+in a directory for the user, so that later runs only need
+to request what has changed.
+"""
+import gzip
+import json
+import os
+import tempfile
+
+
+def get_data_dir():
+    """Get the directory where the program keeps its local data."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA",
+                              os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_DATA_HOME",
+                              os.path.join(os.path.expanduser("~"),
+                                           ".local", "share"))
+
+    ddir = os.path.join(base, "lbrydseed")
+    os.makedirs(ddir, exist_ok=True)
+
+    return ddir
+
+
+def data_path(*parts):
+    """Get a path inside the data directory, creating its directories."""
+    path = os.path.join(get_data_dir(), *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    return path
+
+
+def safe_name(text):
+    """Convert a name so that it can be used as a file name."""
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in text)
+
+
+def _open(path, mode):
+    """Open a file, compressed with gzip if its name ends in '.gz'."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+
+    return open(path, mode, encoding="utf-8")
+
+
+def load_json(path, default=None):
+    """Read a JSON file, or return the default if it can't be read."""
+    try:
+        with _open(path, "r") as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """Write a JSON file atomically, so that it is never left half written.
+
+    If the name ends in '.gz' the file is compressed with gzip.
+    """
+    dirname = os.path.dirname(path)
+
+    suffix = ".tmp.gz" if path.endswith(".gz") else ".tmp"
+
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix=suffix)
+    os.close(fd)
+
+    try:
+        with _open(tmp, "w") as fp:
+            json.dump(data, fp, separators=(",", ":"))
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+    return path
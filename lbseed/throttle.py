@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Methods to distribute requests over threads without flooding the daemon.
+
+A fixed number of threads is either too many, and the daemon and its hub
+start failing, or too few, and the operation is slow.
+Here the number of requests in flight adapts to the measured latency
+and to the errors, and a token bucket limits the rate of new requests.
+"""
+import concurrent.futures as fts
+import queue
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow on average `rate` operations per second, in bursts of `burst`.
+
+    A rate of 0 disables the limit.
+    """
+    def __init__(self, rate=20.0, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst else max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, and take it."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """Limit the requests in flight, adapting the limit to the server.
+
+    The limit starts at `initial` and grows by one each time a full window
+    of requests (as many as the current limit) finishes with a latency
+    close to the best latency seen so far.
+    If the latency rises above `tolerance` times that baseline
+    the limit is reduced by one, and if a request fails or times out
+    the limit is halved.
+    The limit always stays between `minimum` and `maximum`;
+    a `maximum` of 0 means that the requests run one after the other
+    without threads.
+    """
+    def __init__(self, initial=4, minimum=1, maximum=32, tolerance=2.0):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(0, int(maximum))
+        self.limit = float(max(self.minimum,
+                               min(initial, self.maximum)))
+        self.tolerance = tolerance
+
+        self.cond = threading.Condition()
+        self.in_flight = 0
+        self.base_latency = None
+        self.successes = 0
+
+        self.peak = int(self.limit)
+        self.n_done = 0
+        self.n_errors = 0
+        self.t_start = time.monotonic()
+
+    def acquire(self):
+        """Block until a new request can start."""
+        with self.cond:
+            while self.in_flight >= int(self.limit):
+                self.cond.wait()
+
+            self.in_flight += 1
+
+    def cancel(self):
+        """Give back a slot that was acquired but not used."""
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def release(self, latency, ok=True):
+        """Register a finished request and adapt the limit."""
+        with self.cond:
+            self.in_flight -= 1
+            self.n_done += 1
+
+            if not ok:
+                self.n_errors += 1
+                self.successes = 0
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                if self.base_latency is None or latency < self.base_latency:
+                    self.base_latency = latency
+                else:
+                    # Let the baseline drift slowly so that it follows
+                    # a server that becomes slower over time
+                    self.base_latency += 0.01 * (latency - self.base_latency)
+
+                if latency <= self.tolerance * self.base_latency:
+                    self.successes += 1
+
+                    if self.successes >= int(self.limit):
+                        self.successes = 0
+                        self.limit = min(max(self.maximum, self.minimum),
+                                         self.limit + 1)
+                else:
+                    self.successes = 0
+                    self.limit = max(self.minimum, self.limit - 1)
+
+            self.peak = max(self.peak, int(self.limit))
+            self.cond.notify_all()
+
+    def call(self, function, *args, **kwargs):
+        """Run a single request within the limit, and register it.
+
+        A result of `False` counts as a failed request.
+        """
+        self.acquire()
+        t_start = time.monotonic()
+        result = False
+
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            self.release(time.monotonic() - t_start,
+                         ok=result is not False)
+
+        return result
+
+    def status(self):
+        """Return the current state and the throughput reached."""
+        with self.cond:
+            elapsed = time.monotonic() - self.t_start
+            rate = self.n_done / elapsed if elapsed > 0 else 0
+
+            return {"limit": int(self.limit),
+                    "peak": self.peak,
+                    "done": self.n_done,
+                    "errors": self.n_errors,
+                    "elapsed": elapsed,
+                    "rate": rate}
+
+    def summary(self, sep=";"):
+        """Return a line with the state of the limiter."""
+        st = self.status()
+
+        return (f"Concurrency: {st['limit']} (peak {st['peak']}, "
+                f"max {self.maximum}){sep} "
+                f"requests: {st['done']}{sep} "
+                f"errors: {st['errors']}{sep} "
+                f"throughput: {st['rate']:.2f} req/s")
+
+
+def fan_out(function, items, limiter=None, bucket=None):
+    """Apply the function to every item in parallel.
+
+    It is a generator that yields `(index, item, result)` as soon
+    as each call finishes, so the order is not the order of `items`.
+    If the function raises an exception, the result is `False`
+    and the failure makes the limiter back off.
+
+    If the limiter has a `maximum` of 0 no threads are used.
+    """
+    items = list(items)
+
+    if not limiter:
+        limiter = AdaptiveLimiter()
+
+    def call(item):
+        t_start = time.monotonic()
+        ok = True
+
+        try:
+            result = function(item)
+        except Exception as err:
+            print(f"Error: {type(err).__name__}: {err}")
+            result = False
+            ok = False
+
+        limiter.release(time.monotonic() - t_start, ok=ok)
+        return result
+
+    if limiter.maximum <= 0:
+        for index, item in enumerate(items):
+            limiter.acquire()
+
+            if bucket:
+                bucket.acquire()
+
+            yield index, item, call(item)
+        return
+
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def work(index, item):
+        results.put((index, item, call(item)))
+
+    def feed(executor):
+        for index, item in enumerate(items):
+            limiter.acquire()
+
+            if bucket:
+                bucket.acquire()
+
+            if stop.is_set():
+                limiter.cancel()
+                break
+
+            executor.submit(work, index, item)
+
+    with fts.ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+        feeder = threading.Thread(target=feed, args=(executor,), daemon=True)
+        feeder.start()
+
+        try:
+            for _ in range(len(items)):
+                yield results.get()
+        finally:
+            stop.set()
+            feeder.join()
@@ -47,12 +47,16 @@ class VarsWidgets:
         self.b_width = 26
         self.txt_font = tk.font.Font(family="monospace")
         self.txt_lst_font = tk.font.Font(family="monospace", size=9)
+        self.streams = {}
+        self.rad_export_fmt = tk.StringVar(value="csv")
 
 
 class VarsSettings:
     """Mixin class to provide variables for the settings page."""
     def setup_settings_vars(self):
         self.server_var = tk.StringVar(value="http://localhost:5279")
+        self.spin_peer_cache_min = tk.IntVar(value=30)
+        self.spin_peer_cache_size = tk.IntVar(value=5000)
 
 
 class VarsDownload:
@@ -78,6 +82,7 @@ class VarsListDownload:
         self.rad_lst_name = tk.StringVar(value="name")
         self.check_lst_reverse = tk.BooleanVar(value=True)
         self.spin_lst_threads = tk.IntVar(value=32)
+        self.spin_lst_inv_hours = tk.IntVar(value=24)
 
 
 class VarsListChClaims:
@@ -85,6 +90,8 @@ class VarsListChClaims:
     def setup_list_ch_vars(self):
         self.entry_chl_chan = tk.StringVar(value="@lbry:3f")
         self.spin_chl_num = tk.IntVar(value=0)
+        self.spin_chl_start = tk.IntVar(value=1)
+        self.spin_chl_end = tk.IntVar(value=0)
         self.chck_chl_create = tk.BooleanVar(value=False)
         self.chck_chl_height = tk.BooleanVar(value=False)
         self.chck_chl_rels = tk.BooleanVar(value=True)
@@ -109,6 +116,7 @@ class VarsSubscribedChs:
         self.check_subs_claim_id = tk.BooleanVar(value=False)
         self.check_subs_title = tk.BooleanVar(value=True)
         self.spin_subs_threads = tk.IntVar(value=32)
+        self.spin_subs_rate = tk.IntVar(value=20)
 
 
 class VarsPublished:
@@ -121,6 +129,7 @@ class VarsPublished:
         self.chck_ch_acc = tk.BooleanVar(value=False)
         self.chck_ch_amount = tk.BooleanVar(value=True)
         self.chck_pub_rev = tk.BooleanVar(value=True)
+        self.spin_pub_num = tk.IntVar(value=0)
 
         self.chck_pub_ch = tk.StringVar(value=None)
         self.chck_pub_types = tk.BooleanVar(value=True)
@@ -139,6 +148,7 @@ class VarsControlling:
         self.check_c_is_repost = tk.BooleanVar(value=True)
         self.check_c_compete = tk.BooleanVar(value=True)
         self.check_c_reposts = tk.BooleanVar(value=True)
+        self.check_c_full = tk.BooleanVar(value=False)
 
 
 class VarsComments:
@@ -148,7 +158,9 @@ class VarsComments:
         self.cmnt_server_def = tk.StringVar(value=srv)
         self.cmnt_server = tk.StringVar(value=srv)
         self.comment_claim = None
-        self.comments = []
+        self.cmnt_rows = []
+        self.cmnt_total = 0
+        self.cmnt_cache = None
         self.cmnt_list = tk.StringVar()
         self.cmnt_index = tk.IntVar(value=0)
         self.comment_id = None
@@ -162,6 +174,22 @@ class VarsComments:
         self.last_cmnt = tk.StringVar()
         self.lab_rep_status = tk.StringVar(value="Status: no claim lodaded")
 
+        self.entry_csearch_text = tk.StringVar()
+        self.entry_csearch_author = tk.StringVar()
+        self.entry_csearch_since = tk.StringVar()
+        self.entry_csearch_until = tk.StringVar()
+        self.spin_csearch_num = tk.IntVar(value=200)
+        self.cmnt_search_targets = []
+
+        self.rad_rep_targets = tk.StringVar(value="active")
+        self.spin_batch_threads = tk.IntVar(value=4)
+        self.spin_batch_rate = tk.DoubleVar(value=2)
+
+        self.entry_chcm_chan = tk.StringVar()
+        self.spin_chcm_num = tk.IntVar(value=50)
+        self.spin_chcm_threads = tk.IntVar(value=8)
+        self.spin_chcm_limit = tk.IntVar(value=200)
+
 
 class VarsPeers:
     """Mixin class to provide variables for the peer pages."""
@@ -176,19 +204,34 @@ class VarsPeers:
         self.spin_ch_peers_num = tk.IntVar(value=50)
         self.lab_ch_peers_status = tk.StringVar(value="No claim")
 
-        self.spin_chs_ch_threads = tk.IntVar(value=16)
-        self.spin_chs_cl_threads = tk.IntVar(value=32)
+        self.spin_chs_threads = tk.IntVar(value=32)
 
-        self.spin_subs_ch_threads = tk.IntVar(value=32)
-        self.spin_subs_cl_threads = tk.IntVar(value=16)
+        self.spin_subs_pr_threads = tk.IntVar(value=32)
+        self.spin_subs_sample = tk.IntVar(value=0)
+        self.check_subs_record = tk.BooleanVar(value=False)
+        self.spin_subs_interval = tk.IntVar(value=60)
+        self.spin_subs_trend_days = tk.IntVar(value=7)
         self.rad_subs_pr_shared = tk.StringVar(value="shared")
         self.rad_subs_pr_show = tk.StringVar(value="show_all")
 
+        # Searches shown in each peer listing, to export them
+        self.peer_listings = {}
+
 
 class VarsSeeding:
     """Mixin class to provide variables for the seeding page."""
     def setup_seeding_vars(self):
         self.check_seed_plot = tk.BooleanVar(value=False)
+        self.check_seed_claims = tk.BooleanVar(value=False)
+        self.rad_seed_bucket = tk.StringVar(value="day")
+        self.spin_seed_buckets = tk.IntVar(value=30)
+        self.monitor_text = tk.StringVar(value="Live monitor stopped")
+
+        self.rad_plan_source = tk.StringVar(value="subs")
+        self.entry_plan_text = tk.StringVar()
+        self.spin_plan_num = tk.IntVar(value=5)
+        self.spin_plan_budget = tk.IntVar(value=10)
+        self.spin_plan_threads = tk.IntVar(value=32)
 
 
 class VarsDelete:
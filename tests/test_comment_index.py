@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Tests of the search of the comments in the local index."""
+import pytest
+
+import lbseed.comment_index as cmi
+
+NOW = 1700000000
+DAY = 86400
+
+
+def comment(num, text, channel="@alice", days=0):
+    """Comment as returned by the comment server."""
+    return {"comment_id": f"c{num}", "comment": text,
+            "channel_name": channel, "timestamp": NOW - days * DAY}
+
+
+COMMENTS = [comment(1, "Great video about Linux kernels", days=3),
+            comment(2, "linux is great", channel="@bob", days=2),
+            comment(3, "I prefer the kernel of BSD", channel="@Alicia"),
+            comment(4, "Nothing to see here", channel="@bob", days=1)]
+
+
+@pytest.fixture(params=["fts", "like"])
+def index(request, monkeypatch):
+    """Index of the test comments, with and without FTS5."""
+    if request.param == "like":
+        monkeypatch.setattr(cmi, "FTS_SCHEMA", "CREATE VIRTUAL TABLE "
+                            "x USING no_such_module (y);")
+
+    cmi.index_claim("aa", COMMENTS, name="first-video")
+    cmi.index_claim("bb", [comment(5, "Linux again", channel="@carol")])
+    return request.param
+
+
+def ids(found):
+    """Comment IDs of a search."""
+    return [row["comment_id"] for row in found[0]]
+
+
+def test_fts_query():
+    assert cmi.fts_query("linux kernel") == '"linux" "kernel"'
+    assert cmi.fts_query('"great video" kern*') == \
+        '"great video" "kern"*'
+    # An unclosed quote runs to the end of the text
+    assert cmi.fts_query('a "b c') == '"a" "b c"'
+    assert cmi.fts_query("* \"\" ") == ""
+
+
+def test_search_words(index):
+    assert ids(cmi.search("linux")) == ["c5", "c2", "c1"]
+    assert ids(cmi.search("great linux")) == ["c2", "c1"]
+    assert cmi.search("linux", limit=1)[1] == 3
+
+
+def test_search_phrase_and_prefix(index):
+    if index == "fts":
+        assert ids(cmi.search('"great video"')) == ["c1"]
+        assert ids(cmi.search("kern*")) == ["c3", "c1"]
+
+
+def test_search_author(index):
+    assert ids(cmi.search(author="bob")) == ["c4", "c2"]
+    # The start of the name, in any case
+    assert ids(cmi.search(author="@ali")) == ["c3", "c1"]
+    assert ids(cmi.search("video", author="alice")) == ["c1"]
+    assert ids(cmi.search("linux", author="alice")) == ["c1"]
+
+
+def test_search_dates(index):
+    assert ids(cmi.search(since=NOW - DAY)) == ["c5", "c3", "c4"]
+    assert ids(cmi.search(until=NOW - DAY)) == ["c2", "c1"]
+    assert ids(cmi.search("linux", since=NOW - 2 * DAY,
+                          until=NOW)) == ["c2"]
+
+
+def test_search_claim(index):
+    found, total = cmi.search(claim_id="aa")
+
+    assert total == 4
+    assert found[0] == {"comment_id": "c3", "claim_id": "aa",
+                        "claim_name": "first-video",
+                        "channel_name": "@Alicia", "timestamp": NOW,
+                        "comment": "I prefer the kernel of BSD"}
+    assert cmi.search(claim_id="bb")[0][0]["claim_name"] is None
+
+
+def test_index_claim_updates(index):
+    changed = [comment(1, "Edited: a video about BSD", days=3),
+               COMMENTS[1], COMMENTS[2]]
+
+    # One edited, one removed
+    assert cmi.index_claim("aa", changed) == 2
+    assert cmi.index_claim("aa", changed) == 0
+
+    assert ids(cmi.search("linux", claim_id="aa")) == ["c2"]
+    assert ids(cmi.search("bsd")) == ["c3", "c1"]
+    assert ids(cmi.search("nothing")) == []
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Tests of the samples of the peers of streams."""
+import lbseed.peer_history as phs
+import lbseed.storage as stg
+
+NOW = 1700000000
+
+
+def info(claim_id, peers, name="video", stream=True, failed=False):
+    """Result of a search of the peers of a stream."""
+    return {"stream": stream, "failed": failed, "n_peers": peers,
+            "claim": {"claim_id": claim_id, "name": name}}
+
+
+def read_samples():
+    """Records of the file of samples."""
+    with open(phs.samples_path(), "rb") as fd:
+        data = fd.read()
+
+    return [phs.RECORD.unpack_from(data, pos)
+            for pos in range(0, len(data), phs.RECORD.size)]
+
+
+def test_record_round_trip():
+    record = phs.RECORD.pack(NOW, 7, 65535)
+
+    assert phs.RECORD.size == 10
+    assert phs.RECORD.unpack(record) == (NOW, 7, 65535)
+
+
+def test_record_samples():
+    written = phs.record_samples([("@a", info("aa", 3, name="one")),
+                                  ("@b", info("bb", 0, name="two"))],
+                                 now=NOW)
+
+    assert written == 2
+    assert read_samples() == [(NOW, 0, 3), (NOW, 1, 0)]
+    assert phs.load_table()["streams"] == [["aa", "one", "@a"],
+                                           ["bb", "two", "@b"]]
+
+
+def test_streams_keep_their_number():
+    phs.record_samples([("@a", info("aa", 3))], now=NOW)
+    phs.record_samples([("@b", info("bb", 5)),
+                        ("@a", info("aa", 70000))], now=NOW + 3600)
+
+    assert read_samples() == [(NOW, 0, 3),
+                              (NOW + 3600, 1, 5),
+                              (NOW + 3600, 0, 65535)]
+    assert len(phs.load_table()["streams"]) == 2
+
+
+def test_failed_searches_not_recorded():
+    written = phs.record_samples([("@a", info("aa", 3, failed=True)),
+                                  ("@a", info("bb", 3, stream=False))],
+                                 now=NOW)
+
+    assert written == 0
+    assert phs.load_table() == {"streams": []}
+
+
+def test_partial_record_removed():
+    phs.record_samples([("@a", info("aa", 3))], now=NOW)
+
+    with open(phs.samples_path(), "ab") as fd:
+        # Left by an interrupted write
+        fd.write(b"\1\2\3")
+
+    phs.record_samples([("@a", info("aa", 4))], now=NOW + 60)
+
+    assert read_samples() == [(NOW, 0, 3), (NOW + 60, 0, 4)]
+
+
+def test_table_path():
+    assert phs.table_path() == stg.data_path("peers", "streams.json")
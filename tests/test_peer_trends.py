@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Tests of the trends of the peers of streams, computed with NumPy."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import lbseed.peer_history as phs  # noqa: E402
+import lbseed.peer_trends as ptr  # noqa: E402
+
+NOW = 1700000000
+DAY = 86400
+
+
+def info(claim_id, peers, name="video"):
+    """Result of a search of the peers of a stream."""
+    return {"stream": True, "n_peers": peers,
+            "claim": {"claim_id": claim_id, "name": name}}
+
+
+def record_days(rows):
+    """Record `(days ago, [(channel, claim ID, peers), ...])` samples."""
+    for days, streams in rows:
+        phs.record_samples([(channel, info(claim_id, peers, claim_id))
+                            for channel, claim_id, peers in streams],
+                           now=NOW - days * DAY)
+
+
+def test_dtype_matches_record():
+    assert ptr.DTYPE.itemsize == phs.RECORD.size
+
+
+def test_load_samples():
+    assert len(ptr.load_samples()) == 0
+
+    record_days([(1, [("@a", "aa", 3)]),
+                 (0, [("@a", "aa", 5)])])
+
+    samples = ptr.load_samples()
+    assert samples.tolist() == [(NOW - DAY, 0, 3), (NOW, 0, 5)]
+
+
+def test_stream_trends():
+    record_days([(10, [("@a", "aa", 50)]),
+                 (2, [("@a", "aa", 10), ("@a", "bb", 4)]),
+                 (1, [("@a", "aa", 8), ("@a", "bb", 4)]),
+                 (0, [("@a", "aa", 6), ("@a", "bb", 4)])])
+
+    trends = ptr.stream_trends(ptr.load_samples(), days=7, now=NOW)
+
+    assert trends["stream"].tolist() == [0, 1]
+    assert trends["samples"].tolist() == [3, 3]
+    assert trends["first"].tolist() == [10, 4]
+    assert trends["last"].tolist() == [6, 4]
+    assert trends["low"].tolist() == [6, 4]
+    assert trends["high"].tolist() == [10, 4]
+    assert trends["slope"] == pytest.approx([-2, 0])
+
+
+def test_single_sample_has_no_slope():
+    record_days([(0, [("@a", "aa", 9)])])
+
+    trends = ptr.stream_trends(ptr.load_samples(), now=NOW)
+
+    assert trends["slope"].tolist() == [0]
+
+
+def test_no_recent_samples():
+    record_days([(30, [("@a", "aa", 9)])])
+
+    assert ptr.stream_trends(ptr.load_samples(), days=7, now=NOW) is None
+    assert ptr.trends_text(days=7, now=NOW).startswith("No peer samples")
+
+
+def test_channel_trends():
+    record_days([(1, [("@a", "aa", 5), ("@a", "bb", 2), ("@b", "cc", 1)]),
+                 (0, [("@a", "aa", 4), ("@a", "bb", 0), ("@b", "cc", 3)])])
+
+    trends = ptr.stream_trends(ptr.load_samples(), now=NOW)
+    channels = ptr.channel_trends(trends, phs.load_table())
+
+    assert channels == {"@a": {"streams": 2, "no_peers": 1,
+                               "first": 7, "last": 4},
+                        "@b": {"streams": 1, "no_peers": 0,
+                               "first": 1, "last": 3}}
+
+
+def test_trends_text():
+    record_days([(1, [("@a", "aa", 5), ("@b", "bb", 1), ("@b", "cc", 2)]),
+                 (0, [("@a", "aa", 1), ("@b", "bb", 3), ("@b", "cc", 2)])])
+
+    text = ptr.trends_text(days=7, top=1, now=NOW)
+    lines = text.splitlines()
+
+    assert "streams sampled in the last 7 days: 3; channels: 2" in lines[0]
+    # The channel losing most peers comes first
+    assert lines[3].endswith("@a")
+    assert "(-4)" in lines[3]
+    assert "Streams losing peers: 1 (of 1)" in text
+    assert lines[-1].endswith('aa; @a; "aa"')
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Tests of the statistics of the events, computed with NumPy."""
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import lbseed.seed_stats as sst  # noqa: E402
+import lbseed.seeding as sdg  # noqa: E402
+import lbseed.storage as stg  # noqa: E402
+
+NOW = time.mktime((2024, 3, 10, 12, 0, 0, 0, 0, -1))
+
+
+def events(rows):
+    """Structured array of `(time, kind, blob, size)` events."""
+    return np.array(rows, dtype=sst.DTYPE)
+
+
+def test_dtype_matches_record(tmp_path):
+    records = [sdg.RECORD.pack(NOW - n, n % 2, b"blob%04d" % n, 1000 * n)
+               for n in range(5)]
+    events_path, state_path = sdg.store_paths(str(tmp_path))
+
+    with open(events_path, "wb") as fd:
+        # A partial record at the end is not read
+        fd.write(b"".join(records) + b"\0" * 7)
+
+    stg.save_json(state_path, {"files": {},
+                               "size": len(records) * sdg.RECORD.size})
+
+    array = sst.load_array(str(tmp_path))
+
+    assert sst.DTYPE.itemsize == sdg.RECORD.size
+    assert [tuple(event) for event in array.tolist()] == \
+        sdg.load_events(str(tmp_path))
+
+
+def test_load_array_without_events(tmp_path):
+    assert len(sst.load_array(str(tmp_path))) == 0
+
+
+def test_window_totals():
+    data = events([(NOW - 10, sdg.UP, b"aaaaaaaa", 100),
+                   (NOW - 20, sdg.UP, b"bbbbbbbb", 50),
+                   (NOW - 2 * 86400, sdg.UP, b"aaaaaaaa", 100),
+                   (NOW - 30, sdg.DOWN, b"cccccccc", 0)])
+
+    assert sst.window_totals(data, since=NOW - 86400) == (2, 150, 1)
+    assert sst.window_totals(data) == (3, 250, 1)
+
+
+def test_bucket_totals():
+    data = events([(NOW - 3600, sdg.UP, b"aaaaaaaa", 10),
+                   (NOW - 86400, sdg.UP, b"aaaaaaaa", 20),
+                   (NOW - 86400, sdg.DOWN, b"bbbbbbbb", 0),
+                   (NOW - 10 * 86400, sdg.DOWN, b"bbbbbbbb", 0)])
+
+    starts, n_up, sent, n_down, ratio = \
+        sst.bucket_totals(data, width=86400, number=3, now=NOW)
+
+    assert n_up.tolist() == [0, 1, 1]
+    assert sent.tolist() == [0, 20, 10]
+    assert n_down.tolist() == [0, 1, 0]
+    # The event of ten days ago counts in the cumulative ratio
+    assert ratio.tolist() == [0.0, 0.5, 1.0]
+    assert time.localtime(starts[-1]).tm_hour == 0
+
+
+def test_blob_totals():
+    data = events([(NOW, sdg.UP, b"aaaaaaaa", 10),
+                   (NOW, sdg.UP, b"bbbbbbbb", 5),
+                   (NOW, sdg.UP, b"aaaaaaaa", 30),
+                   (NOW, sdg.DOWN, b"cccccccc", 0)])
+
+    assert sorted(sst.blob_totals(data)) == [("aaaaaaaa", 2, 40),
+                                             ("bbbbbbbb", 1, 5)]
+    assert sst.top_blobs(data, number=1) == [("aaaaaaaa", 2, 40)]
+    assert sst.blob_totals(data[data["kind"] == sdg.DOWN]) == []
+
+
+def test_plot_data_groups_buckets():
+    data = events([(NOW - n * 3600, sdg.UP, b"aaaaaaaa", 1)
+                   for n in range(10)])
+
+    plot = sst.plot_data(data, bucket="hour", number=10, points=4, now=NOW)
+
+    assert plot["group"] == 3
+    assert len(plot["up"]) == 4
+    assert plot["up"].sum() == 10
+    assert plot["x"][-1] == 0
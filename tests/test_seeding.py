@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# --------------------------------------------------------------------------- #
+# The MIT License (MIT)                                                       #
+#                                                                             #
+# Copyright (c) 2023 Eliud Cabrera Castillo <e.cabrera-castillo@tum.de>       #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining       #
+# a copy of this software and associated documentation files                  #
+# (the "Software"), to deal in the Software without restriction, including    #
+# without limitation the rights to use, copy, modify, merge, publish,         #
+# distribute, sublicense, and/or sell copies of the Software, and to permit   #
+# persons to whom the Software is furnished to do so, subject to the          #
+# following conditions:                                                       #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included     #
+# in all copies or substantial portions of the Software.                      #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL     #
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER  #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+# --------------------------------------------------------------------------- #
+"""Tests of the events read from the logs of the daemon."""
+import os
+import time
+
+import lbseed.seeding as sdg
+
+BLOB = "ab12cd34" + 88 * "0"
+
+
+def log_line(second, kind="sent", size=2097152, peer="10.0.0.1"):
+    """A line of the daemon log with a blob sent or downloaded."""
+    if kind == "sent":
+        return (f"2024-03-01 10:00:{second:02d},250 INFO     "
+                f"lbry.blob_exchange.server:97: sent {BLOB} "
+                f"({size} bytes) to {peer}:3333\n")
+
+    return (f"2024-03-01 10:00:{second:02d},250 INFO     "
+            f"lbry.blob_exchange.client:150: downloaded {BLOB[:8]}"
+            f"{'f' * 88} from {peer}:3333\n")
+
+
+def write(path, text, mode="a"):
+    with open(path, mode) as fd:
+        fd.write(text)
+
+
+def test_record_round_trip():
+    record = sdg.parse_line(log_line(5).rstrip("\n"))
+    stamp, kind, blob, size = sdg.RECORD.unpack(record)
+
+    expected = time.mktime((2024, 3, 1, 10, 0, 5, 0, 0, -1)) + 0.25
+
+    assert len(record) == sdg.RECORD.size == 21
+    assert stamp == expected
+    assert kind == sdg.UP
+    assert blob == b"ab12cd34"
+    assert size == 2097152
+
+
+def test_parse_download_and_other_lines():
+    event = sdg.parse_event(log_line(1, kind="downloaded"))
+
+    assert event[1] == sdg.DOWN
+    assert event[3] == 0
+    assert event[4] == "10.0.0.1"
+
+    assert sdg.parse_line("2024-03-01 10:00:00,000 INFO     "
+                          "lbry.extras.daemon:10: started") is None
+
+
+def test_update_reads_only_new_lines(tmp_path):
+    log = tmp_path / sdg.LOG_NAME
+    write(log, "".join(log_line(n) for n in range(3)))
+
+    stats = sdg.update_events(str(tmp_path))
+    assert stats["events"] == 3
+
+    write(log, log_line(10, kind="downloaded"))
+    stats = sdg.update_events(str(tmp_path))
+
+    events = sdg.load_events(str(tmp_path))
+    assert stats["events"] == 1
+    assert [kind for _, kind, _, _ in events] == [sdg.UP] * 3 + [sdg.DOWN]
+
+
+def test_partial_trailing_line(tmp_path):
+    log = tmp_path / sdg.LOG_NAME
+    line = log_line(7)
+    write(log, log_line(6) + line[:30])
+
+    assert sdg.update_events(str(tmp_path))["events"] == 1
+
+    write(log, line[30:])
+
+    assert sdg.update_events(str(tmp_path))["events"] == 1
+    assert len(sdg.load_events(str(tmp_path))) == 2
+
+
+def test_rotation(tmp_path):
+    log = tmp_path / sdg.LOG_NAME
+    write(log, log_line(1) + log_line(2))
+    sdg.update_events(str(tmp_path))
+
+    # The daemon writes one more line and rotates the log
+    write(log, log_line(3))
+    os.rename(log, str(log) + ".1")
+    write(log, log_line(4) + log_line(5), mode="w")
+
+    stats = sdg.update_events(str(tmp_path))
+    stamps = [stamp for stamp, _, _, _ in sdg.load_events(str(tmp_path))]
+
+    assert stats["files"] == 2
+    assert stats["events"] == 3
+    assert stamps == sorted(stamps)
+    assert len(stamps) == 5
+
+
+def test_truncation(tmp_path):
+    log = tmp_path / sdg.LOG_NAME
+    write(log, "".join(log_line(n) for n in range(4)))
+    sdg.update_events(str(tmp_path))
+
+    # Same file, truncated and written again from the start
+    write(log, log_line(30, kind="downloaded"), mode="w")
+
+    assert sdg.update_events(str(tmp_path))["events"] == 1
+    assert len(sdg.load_events(str(tmp_path))) == 5
+
+
+def test_interrupted_run_is_discarded(tmp_path):
+    log = tmp_path / sdg.LOG_NAME
+    write(log, log_line(1))
+    sdg.update_events(str(tmp_path))
+
+    # Records after the saved size come from a run that didn't finish
+    events_path, _ = sdg.store_paths(str(tmp_path))
+
+    with open(events_path, "ab") as fd:
+        fd.write(b"\0" * (sdg.RECORD.size + 3))
+
+    write(log, log_line(2))
+    sdg.update_events(str(tmp_path))
+
+    assert len(sdg.load_events(str(tmp_path))) == 2
+    assert os.path.getsize(events_path) == 2 * sdg.RECORD.size